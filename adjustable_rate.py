@@ -0,0 +1,120 @@
+"""
+Adjustable-rate (ARM) and stepped-rate amortization schedules.
+Builds per-month rate paths and amortizes them segment by segment, re-amortizing the payment
+at every rate reset and evaluating each constant-rate segment in closed form.
+"""
+from decimal import ROUND_HALF_UP
+
+import numpy as np
+
+from amortization import (CLOSED_FORM_TOLERANCE, MONTHS_IN_YEAR, InvalidInputError, _closed_form_error,
+                          _fixed_rate_balances, _monthly_rates, _sequential_balances, _settle_balances,
+                          calculate_monthly_payment, create_amortization_data)
+
+
+def step_rate_schedule(initial_rate, rate_changes, number_of_years):
+    """
+    Creates a per-month array of annual rates (%) from step changes.
+    rate_changes maps the 1-based month a new rate takes effect to that rate, e.g. {61: 6.5}.
+    """
+    number_of_months = number_of_years * MONTHS_IN_YEAR
+    interest_rates = np.full(number_of_months, float(initial_rate))
+    for month, rate in sorted(dict(rate_changes).items()):
+        if not 1 <= month <= number_of_months:
+            raise InvalidInputError(f"Rate change month {month} is outside the loan term.")
+        interest_rates[month - 1:] = float(rate)
+    return interest_rates
+
+
+def indexed_rate_schedule(initial_rate, index_rates, margin, number_of_years, fixed_months=60, reset_interval=12,
+                          initial_cap=None, periodic_cap=None, lifetime_cap=None, floor=None):
+    """
+    Creates a per-month array of annual rates (%) for an index-plus-margin ARM.
+
+    The initial rate applies for fixed_months, after which the rate resets every reset_interval
+    months to index + margin, where index_rates is a scalar or a per-month array of index values
+    (the last value is carried forward if it is shorter than the term). Each reset is limited to
+    initial_cap for the first adjustment and periodic_cap afterwards, and the rate always stays
+    between floor and initial_rate + lifetime_cap. Caps left as None are not applied.
+    """
+    number_of_months = number_of_years * MONTHS_IN_YEAR
+    if fixed_months < 0 or reset_interval <= 0:
+        raise InvalidInputError("Fixed period must be non-negative and the reset interval positive.")
+    index_rates = np.atleast_1d(np.asarray(index_rates, dtype=float))
+    if index_rates.size == 0:
+        raise InvalidInputError("At least one index rate is required.")
+    index_rates = np.concatenate((index_rates, np.full(max(0, number_of_months - len(index_rates)), index_rates[-1])))
+
+    ceiling = initial_rate + lifetime_cap if lifetime_cap is not None else np.inf
+    lowest = floor if floor is not None else 0.0
+    interest_rates = np.full(number_of_months, float(initial_rate))
+    current_rate = float(initial_rate)
+    for reset_number, month in enumerate(range(fixed_months, number_of_months, reset_interval)):
+        rate = index_rates[month] + margin
+        cap = initial_cap if reset_number == 0 else periodic_cap
+        if cap is not None:
+            rate = min(max(rate, current_rate - cap), current_rate + cap)
+        current_rate = min(max(rate, lowest), ceiling)
+        interest_rates[month:] = current_rate
+    return interest_rates
+
+
+def amortize_adjustable(loan_amount, interest_rates, rounding=ROUND_HALF_UP):
+    """
+    Amortizes a loan over a per-month array of annual rates (%), re-amortizing at each reset.
+    At the start of every constant-rate segment the payment is recalculated to pay off the
+    remaining balance over the remaining term; balances inside a segment use the closed-form
+    annuity formula, so the cost grows with the number of resets rather than months. Loans whose
+    closed form would lose cents are stepped month by month instead.
+    Returns a tuple of (monthly_payments, remaining_balance, interest, principal) NumPy arrays.
+    """
+    interest_rates = np.asarray(interest_rates, dtype=float)
+    monthly_rates = _monthly_rates(interest_rates)
+    total_months = len(monthly_rates)
+    monthly_payments = np.zeros(total_months)
+    balance = np.zeros(total_months)
+
+    # Closed-form errors carry into every later segment, so the whole rate path decides whether to step
+    stepped = _closed_form_error(loan_amount, np.zeros(1), monthly_rates) > CLOSED_FORM_TOLERANCE
+    segment_starts = np.concatenate(([0], np.flatnonzero(np.diff(monthly_rates)) + 1, [total_months]))
+    opening_balance = float(loan_amount)
+    for start, stop in zip(segment_starts[:-1], segment_starts[1:]):
+        rate = monthly_rates[start]
+        payment = 0.0
+        if opening_balance > 0:
+            payment = float(calculate_monthly_payment(opening_balance, rate, total_months - start, rounding))
+        months = np.arange(stop - start + 1, dtype=float)
+        if stepped:
+            segment_balances = _sequential_balances(opening_balance, np.full(len(months), payment),
+                                                    np.full(len(months), rate))
+        else:
+            segment_balances = _fixed_rate_balances(opening_balance, payment, rate, months)
+        monthly_payments[start:stop] = payment
+        balance[start:stop] = segment_balances[:-1]
+        opening_balance = segment_balances[-1]
+
+    if total_months == 0:
+        return monthly_payments, balance, np.zeros(0), np.zeros(0)
+    return (monthly_payments,) + _settle_balances(balance, monthly_payments, monthly_rates)
+
+
+def calculate_adjustable_amortization(loan_amount, interest_rates, rounding=ROUND_HALF_UP):
+    """
+    Calculates amortization data for a variable-rate loan in the same shape as calculate_amortization().
+    The reported monthly payment is the initial one and the total payment sums every payment made.
+    """
+    import pandas as pd  # Imported lazily so payment-only callers skip the pandas start-up cost
+
+    interest_rates = np.asarray(interest_rates, dtype=float)
+    monthly_payments, remaining_balance, interest, principal = amortize_adjustable(loan_amount, interest_rates,
+                                                                                   rounding)
+    schedule = pd.DataFrame({
+        "Month": np.arange(1, len(interest_rates) + 1),
+        "Interest Rate (%)": interest_rates,
+        "Current Payment": monthly_payments,
+        "Interest": interest,
+        "Principal": principal,
+        "Remaining Balance": remaining_balance
+    })
+    monthly_payment = monthly_payments[0] if len(monthly_payments) else 0.0
+    return create_amortization_data(monthly_payment, (interest + principal).sum(), interest_rates, schedule)
@@ -0,0 +1,227 @@
+"""
+Headless computation core for the loan calculator.
+Calculates payments and amortization schedules without importing PyQt5, matplotlib or fpdf;
+the balance, interest and principal columns of a schedule are built in one NumPy pass.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+
+# Constants
+MONTHS_IN_YEAR = 12
+CLOSED_FORM_TOLERANCE = 1e-4  # Largest estimated closed-form error, in currency units, before stepping instead
+PROGRESS_BLOCK_MONTHS = 120  # Months computed between progress callbacks
+
+# Custom Exception Classes
+class InvalidInputError(Exception):
+    """Custom exception raised for invalid user input."""
+    pass
+
+class CalculationError(Exception):
+    """Custom exception raised for errors during calculations."""
+    pass
+
+
+def _monthly_rates(interest_rates):
+    """Converts annual percentage rates into monthly decimal rates."""
+    return np.asarray(interest_rates, dtype=float) / (MONTHS_IN_YEAR * 100)
+
+
+def _month_blocks(total_months, progress=None):
+    """
+    Yields slices of up to PROGRESS_BLOCK_MONTHS consecutive months, calling
+    progress(months_done, total_months) after each block; progress may raise to abandon the work.
+    Without a progress callback all months form one block, so nothing pays for the split.
+    """
+    block_months = PROGRESS_BLOCK_MONTHS if progress is not None else max(total_months, 1)
+    for start in range(0, total_months, block_months):
+        end = min(start + block_months, total_months)
+        yield slice(start, end)
+        if progress is not None:
+            progress(end, total_months)
+
+
+def _accumulation_factors(monthly_interest_rate, months):
+    """
+    Returns ((1 + r)^k - 1) / r, the value of k unit payments compounded at rate r.
+    Broadcasts over array rates and months, falling back to k where the rate is zero.
+    """
+    monthly_interest_rate = np.asarray(monthly_interest_rate, dtype=float)
+    safe_rate = np.where(monthly_interest_rate == 0, 1.0, monthly_interest_rate)
+    with np.errstate(over="ignore"):  # Placeholder rates are discarded below
+        factors = np.expm1(months * np.log1p(safe_rate)) / safe_rate
+    return np.where(monthly_interest_rate == 0, months, factors)
+
+
+def _fixed_rate_balances(loan_amount, monthly_payment, monthly_interest_rate, months):
+    """
+    Returns the opening balance of each of the given months for a constant rate and payment.
+    Uses the closed-form annuity balance B_k = B_0 - (M - r * B_0) * ((1 + r)^k - 1) / r,
+    written around the first month's principal so long, high-rate terms do not cancel out.
+    """
+    first_principal = monthly_payment - loan_amount * monthly_interest_rate
+    return loan_amount - first_principal * _accumulation_factors(monthly_interest_rate, months)
+
+
+def _variable_rate_balances(loan_amount, monthly_payments, monthly_rates):
+    """
+    Returns the opening balance of every month for per-month rates and payments.
+    Solves B_{k+1} = B_k * (1 + r_k) - M_k with a cumulative product of growth factors,
+    tracking the drift from the loan amount to keep the sums well conditioned.
+    """
+    growth = np.cumprod(1 + monthly_rates)               # G_{k+1}
+    opening_growth = np.concatenate(([1.0], growth[:-1]))  # G_k
+    drift = (loan_amount * monthly_rates - monthly_payments) / growth
+    accumulated_drift = np.concatenate(([0.0], np.cumsum(drift)[:-1]))
+    return loan_amount + opening_growth * accumulated_drift
+
+
+def amortize(loan_amount, monthly_payments, interest_rates, progress=None):
+    """
+    Computes the amortization columns for a loan without a per-month Python loop.
+    Returns a tuple of (remaining_balance, interest, principal) NumPy arrays.
+
+    Matches the original month-by-month schedule: principal is capped at the
+    outstanding balance and the last payment clears whatever balance is left.
+    progress(months_done, total_months) is called after each block of months and may raise to stop.
+    """
+    monthly_payments = np.asarray(monthly_payments, dtype=float)
+    monthly_rates = _monthly_rates(interest_rates)
+    total_months = len(monthly_rates)
+    if total_months == 0:
+        return np.zeros(0), np.zeros(0), np.zeros(0)
+
+    fixed_rate = np.all(monthly_rates == monthly_rates[0]) and np.all(monthly_payments == monthly_payments[0])
+    if _closed_form_error(loan_amount, monthly_payments, monthly_rates) > CLOSED_FORM_TOLERANCE:
+        balance = _sequential_balances(loan_amount, monthly_payments, monthly_rates, progress)
+    elif fixed_rate:
+        # Every month's balance is independent of the others, so blocks give the same result as one pass
+        balance = np.empty(total_months)
+        for block in _month_blocks(total_months, progress):
+            months = np.arange(block.start, block.stop, dtype=float)
+            balance[block] = _fixed_rate_balances(loan_amount, monthly_payments[0], monthly_rates[0], months)
+    else:
+        balance = _variable_rate_balances(loan_amount, monthly_payments, monthly_rates)
+        if progress is not None:
+            progress(total_months, total_months)
+    return _settle_balances(balance, monthly_payments, monthly_rates)
+
+
+def _closed_form_error(loan_amount, monthly_payments, monthly_rates):
+    """
+    Estimates the rounding error of the closed-form balances in currency units.
+    They subtract terms that grow like (1 + r)^n, so the error grows with the loan's total growth.
+    """
+    with np.errstate(over="ignore"):
+        total_growth = np.exp(np.sum(np.log1p(monthly_rates)))
+    scale = max(abs(loan_amount), float(np.max(np.abs(monthly_payments))))
+    return np.finfo(float).eps * scale * total_growth
+
+
+def _sequential_balances(loan_amount, monthly_payments, monthly_rates, progress=None):
+    """
+    Returns the uncapped opening balance of every month by stepping B_{k+1} = B_k - (M_k - B_k * r_k).
+    Used when the closed form would lose cents; it rounds exactly like the month-by-month schedule.
+    """
+    balance = np.empty(len(monthly_rates))
+    payments = monthly_payments.tolist()
+    rates = monthly_rates.tolist()
+    current = float(loan_amount)
+    for block in _month_blocks(len(rates), progress):
+        for month in range(block.start, block.stop):
+            balance[month] = current
+            current = current - (payments[month] - current * rates[month])
+    return balance
+
+
+def _settle_balances(balance, monthly_payments, monthly_rates):
+    """
+    Derives the schedule columns from the uncapped opening balance of every month.
+    Returns a tuple of (remaining_balance, interest, principal) NumPy arrays.
+    """
+    # Once a payment would overshoot the balance the loan is paid off and stays at zero
+    overshoot = np.flatnonzero(balance[1:] < 0)
+    if overshoot.size:
+        balance[overshoot[0] + 1:] = 0
+
+    interest = balance * monthly_rates
+    principal = np.minimum(monthly_payments - interest, balance)
+    principal[-1] = balance[-1]  # Last payment ensures a zero remaining balance
+
+    remaining_balance = balance
+    remaining_balance[-1] = 0
+    return remaining_balance, interest, principal
+
+
+def calculate_monthly_payment(loan_amount, monthly_interest_rate, number_of_months, rounding=ROUND_HALF_UP):
+    """
+    Calculates the monthly loan payment as a Decimal, rounded to cents with the given rounding mode.
+    Interest-free loans are split evenly across the term without rounding.
+    """
+    if monthly_interest_rate == 0:
+        return Decimal(loan_amount) / number_of_months
+    factor = (1 + monthly_interest_rate) ** number_of_months
+    monthly_payment = (loan_amount * monthly_interest_rate * factor) / (factor - 1)
+    return Decimal(monthly_payment).quantize(Decimal("0.00"), rounding)
+
+
+def create_amortization_data(monthly_payment, total_payment, interest_rates, amortization_schedule):
+    """Creates a dictionary containing amortization data."""
+    return {
+        "monthly_payment": float(monthly_payment),
+        "total_payment": float(total_payment),
+        "interest_rates": interest_rates,
+        "amortization_schedule": amortization_schedule
+    }
+
+
+def create_amortization_columns(loan_amount, monthly_payments, interest_rates, progress=None):
+    """
+    Creates the amortization schedule columns as a dictionary of NumPy arrays.
+    The columns are computed in one vectorized pass by amortize(),
+    which handles the last payment to ensure a zero remaining balance.
+    """
+    total_months = len(interest_rates)
+    remaining_balance, interest, principal = amortize(loan_amount, monthly_payments, interest_rates, progress)
+    return {
+        "Month": np.arange(1, total_months + 1),
+        "Interest Rate (%)": interest_rates,
+        "Current Payment": monthly_payments,
+        "Interest": interest,
+        "Principal": principal,
+        "Remaining Balance": remaining_balance
+    }
+
+
+def create_amortization_schedule(loan_amount, monthly_payments, interest_rates):
+    """Creates a Pandas DataFrame representing the amortization schedule."""
+    import pandas as pd  # Imported lazily so payment-only callers skip the pandas start-up cost
+
+    return pd.DataFrame(create_amortization_columns(loan_amount, monthly_payments, interest_rates))
+
+
+def calculate_amortization_columns(loan_amount, annual_interest_rate, number_of_years, rounding=ROUND_HALF_UP,
+                                   progress=None):
+    """
+    Calculates the monthly payment and amortization schedule columns of a fixed-rate loan.
+    Returns a tuple of (monthly_payment, columns), where columns is a dictionary of NumPy arrays.
+    progress is passed on to amortize().
+    """
+    number_of_months = number_of_years * MONTHS_IN_YEAR
+    monthly_interest_rate = annual_interest_rate / (MONTHS_IN_YEAR * 100)  # Calculate this once
+
+    monthly_payment = calculate_monthly_payment(loan_amount, monthly_interest_rate, number_of_months, rounding)
+    interest_rates = np.full(number_of_months, float(annual_interest_rate))
+    monthly_payments = np.full(number_of_months, float(monthly_payment))
+    return monthly_payment, create_amortization_columns(loan_amount, monthly_payments, interest_rates, progress)
+
+
+def calculate_amortization(loan_amount, annual_interest_rate, number_of_years, rounding=ROUND_HALF_UP):
+    """Calculates the monthly payment, total payment and full amortization schedule."""
+    import pandas as pd
+
+    monthly_payment, columns = calculate_amortization_columns(loan_amount, annual_interest_rate,
+                                                              number_of_years, rounding)
+    number_of_months = number_of_years * MONTHS_IN_YEAR
+    return create_amortization_data(monthly_payment, monthly_payment * number_of_months,
+                                    columns["Interest Rate (%)"], pd.DataFrame(columns))
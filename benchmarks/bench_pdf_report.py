@@ -0,0 +1,67 @@
+"""
+Benchmark for the PDF report exporter.
+Times write_schedule_pdf against the previous cell-by-cell renderer for a 100-year
+schedule and a multi-loan batch. Run with: python benchmarks/bench_pdf_report.py
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amortization import calculate_amortization
+from exporters import write_schedule_pdf
+from portfolio import amortize_portfolio, to_long_format
+
+REPEATS = 3
+
+
+def legacy_schedule_pdf(filename, df):
+    """Reference copy of the original save_pdf rendering: two passes over every cell."""
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("helvetica", size=12)
+    pdf.cell(200, 10, text="Amortization Schedule", align="C")
+    pdf.ln(10)
+    line_height = pdf.font_size * 2.5
+    col_widths = []
+    for col in df.columns:
+        max_width = pdf.get_string_width(str(col))
+        for value in df[col]:
+            max_width = max(max_width, pdf.get_string_width(f"{value:.2f}"))
+        col_widths.append(max_width + 6)
+    for i, col in enumerate(df.columns):
+        pdf.cell(col_widths[i], line_height, text=col, border=1)
+    pdf.ln(line_height)
+    for row in df.itertuples(index=False):
+        for i, datum in enumerate(row):
+            pdf.cell(col_widths[i], line_height, text=f"{datum:.2f}", border=1)
+        pdf.ln(line_height)
+    pdf.output(filename)
+
+
+def time_export(export, filename, df):
+    """Returns the best wall time in seconds over REPEATS runs."""
+    return min(timeit.repeat(lambda: export(filename, df), number=1, repeat=REPEATS))
+
+
+def main():
+    """Prints legacy and current timings for each benchmark case."""
+    cases = {
+        "single loan, 1,200 rows": calculate_amortization(250000, 5.25, 100)["amortization_schedule"],
+        "batch of 50 loans, 18,000 rows": to_long_format(
+            amortize_portfolio([250000] * 50, [5.25] * 50, [30] * 50)),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "report.pdf")
+        for name, df in cases.items():
+            legacy = time_export(legacy_schedule_pdf, filename, df)
+            current = time_export(write_schedule_pdf, filename, df)
+            print(f"{name}: legacy {legacy:.3f}s, current {current:.3f}s ({legacy / current:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Load test for the HTTP calculation service.
+Drives one endpoint with concurrent keep-alive clients and reports throughput and p50/p99
+latency, plus the server's batching and cache statistics. Starts a local service on a free
+port unless --url is given.
+
+Run with: python benchmarks/load_test_service.py --endpoint payment --concurrency 64 --requests 20000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def http_request(reader, writer, host, method, path, body=b""):
+    """Sends one HTTP/1.1 request on an open connection and returns (status, body)."""
+    head = (f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n"
+            f"Content-Type: application/json\r\n\r\n")
+    writer.write(head.encode() + body)
+    await writer.drain()
+
+    status_line, *header_lines = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    headers = {}
+    for line in header_lines:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding") == "chunked":
+        parts = []
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).strip(), 16)
+            parts.append(await reader.readexactly(size + 2))
+            if size == 0:
+                break
+        payload = b"".join(part[:-2] for part in parts)
+    else:
+        payload = await reader.readexactly(int(headers.get("content-length", 0)))
+    return int(status_line.split()[1]), payload
+
+
+def make_request(endpoint, distinct, batch_size):
+    """Returns (method, path, body) for one request drawn from `distinct` loan scenarios."""
+    scenario = random.randrange(distinct)
+    loan = {
+        "loan_amount": 50_000 + (scenario % 1000) * 500,
+        "annual_interest_rate": round(2 + (scenario // 1000 % 40) * 0.25, 2),
+        "number_of_years": (10, 15, 20, 30)[scenario % 4],
+    }
+    if endpoint == "batch":
+        loans = [dict(loan, id=index, loan_amount=loan["loan_amount"] + index) for index in range(batch_size)]
+        return "POST", "/batch", "\n".join(json.dumps(row) for row in loans).encode()
+    return "GET", f"/{endpoint}?{urlencode(loan)}", b""
+
+
+async def client(host, port, endpoint, count, distinct, batch_size, latencies, failures):
+    """Issues `count` requests sequentially on one keep-alive connection."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            method, path, body = make_request(endpoint, distinct, batch_size)
+            started = time.perf_counter()
+            status, _ = await http_request(reader, writer, host, method, path, body)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                failures.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, endpoint, concurrency, requests, distinct, batch_size):
+    """Runs the load and returns (elapsed_seconds, latencies, failures, server_stats)."""
+    latencies, failures = [], []
+    per_client = [requests // concurrency + (index < requests % concurrency) for index in range(concurrency)]
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, endpoint, count, distinct, batch_size, latencies, failures)
+                           for count in per_client if count))
+    elapsed = time.perf_counter() - started
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, stats = await http_request(reader, writer, host, "GET", "/stats")
+    writer.close()
+    return elapsed, latencies, failures, json.loads(stats)
+
+
+def percentile(sorted_values, fraction):
+    """Returns the nearest-rank percentile of an ascending list."""
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def start_local_service(threads):
+    """Starts service.py on a free port and returns (process, host, port)."""
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "service.py"), "--port", "0",
+                                "--threads", str(threads)], stderr=subprocess.PIPE, text=True)
+    line = process.stderr.readline()  # "Serving on http://host:port"
+    address = urlsplit(line.split()[-1])
+    return process, address.hostname, address.port
+
+
+def main():
+    """Parses the command line, runs the load test and prints a report."""
+    parser = argparse.ArgumentParser(description="Load test the loan calculation service.")
+    parser.add_argument("--url", help="Base URL of a running service (default: start one locally).")
+    parser.add_argument("--endpoint", choices=("payment", "schedule", "batch"), default="payment")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent keep-alive clients.")
+    parser.add_argument("--requests", type=int, default=10_000, help="Total requests.")
+    parser.add_argument("--distinct", type=int, default=100_000,
+                        help="Distinct loan scenarios drawn from; lower values raise the cache hit rate.")
+    parser.add_argument("--batch-size", type=int, default=1_000, help="Loans per /batch request.")
+    parser.add_argument("--threads", type=int, default=4, help="Calculation threads of a locally started service.")
+    args = parser.parse_args()
+
+    process = None
+    if args.url:
+        address = urlsplit(args.url)
+        host, port = address.hostname, address.port or 80
+    else:
+        process, host, port = start_local_service(args.threads)
+    try:
+        elapsed, latencies, failures, stats = asyncio.run(run_load(
+            host, port, args.endpoint, args.concurrency, args.requests, args.distinct, args.batch_size))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    latencies.sort()
+    print(f"{args.endpoint}: {len(latencies):,} requests, {args.concurrency} clients, {len(failures)} failed")
+    print(f"  throughput  {len(latencies) / elapsed:,.0f} requests/s")
+    if args.endpoint == "batch":
+        print(f"              {len(latencies) * args.batch_size / elapsed:,.0f} loans/s")
+    print(f"  latency     p50 {percentile(latencies, 0.50) * 1000:.2f} ms   "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms   max {latencies[-1] * 1000:.2f} ms")
+    print(f"  server      mean payment batch {stats['mean_payment_batch']:.1f}, "
+          f"response cache {stats['response_cache']['hits']:,} hits / {stats['response_cache']['misses']:,} misses")
+
+
+if __name__ == "__main__":
+    main()
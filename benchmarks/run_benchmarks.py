@@ -0,0 +1,349 @@
+"""
+Benchmark suite for the loan calculator's hot paths.
+Times schedule generation, batch and path-dependent amortization, table rendering, exports and
+reopening, compares every case with the stored baseline and exits with status 1 when a case is
+slower than its baseline by more than the threshold and clearly beyond its timing noise; slowdowns
+within the noise are reported as warnings. A case that looks regressed is re-timed at the end of
+the run and only fails if it is still slow, since slow spells on shared machines often last a
+minute. With --passes, every case is timed once per pass over the suite and its median across
+passes is kept, with the spread between passes as its noise, so a baseline recorded that way
+absorbs the machine's slower and faster spells. Widget cases run on Qt's offscreen platform.
+
+Run with:
+    python benchmarks/run_benchmarks.py                     # compare with benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --save --passes 5   # record a new baseline
+    python benchmarks/run_benchmarks.py --filter export --threshold 0.5
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from amortization import calculate_amortization
+from exact_money import calculate_amortization_cents
+from adjustable_rate import indexed_rate_schedule
+from exporters import read_schedule_arrow, write_schedule_arrow, write_schedule_csv, write_schedule_pdf
+from path_dependent import ENGINE_NUMBA, ENGINE_NUMPY, amortize_path_dependent, numba_available
+from portfolio import amortize_portfolio, calculate_monthly_payments, to_long_format
+from prepayment import compare_prepayments
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# A case regresses when its median is slower than its baseline by more than this fraction...
+DEFAULT_THRESHOLD = 0.25
+# ...and by more than this many seconds and NOISE_MULTIPLE times the larger noise of the two runs;
+# slower cases that miss either floor are only warned about
+MIN_REGRESSION_SECONDS = 100e-6
+NOISE_MULTIPLE = 2
+CONFIRMATIONS = 2  # Re-timings, at the end of the run, before a slowdown counts as a regression
+
+# Each case is timed REPEATS times, each sample running enough calls to take at least 0.05 seconds
+REPEATS = 21
+SAMPLES_PER_AUTORANGE = 4  # timeit's autorange() sizes calls for 0.2 seconds
+
+TERMS_IN_YEARS = (1, 5, 10, 15, 30, 50, 100)
+BATCH_SIZES = (100, 1_000, 10_000)
+EXPORT_BATCH_SIZE = 20
+REOPEN_BATCH_SIZE = 1_000
+LOAN_AMOUNT = 250_000
+ANNUAL_INTEREST_RATE = 5.25
+
+# Registered cases: name -> setup function returning the callable to time
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Registers a setup function under a benchmark name."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _schedule(number_of_years):
+    """Returns the schedule DataFrame of the reference loan."""
+    return calculate_amortization(LOAN_AMOUNT, ANNUAL_INTEREST_RATE, number_of_years)["amortization_schedule"]
+
+
+def _portfolio(size):
+    """Returns reproducible per-loan inputs for a batch of the given size."""
+    generator = np.random.default_rng(size)
+    return (generator.uniform(50_000, 1_000_000, size).round(2),
+            generator.uniform(1, 12, size).round(2),
+            generator.choice((10, 15, 20, 30), size))
+
+
+def _register_cases():
+    """Registers the schedule, batch and export cases for every term and batch size."""
+    for years in TERMS_IN_YEARS:
+        benchmark(f"schedule/float/{years}y")(
+            lambda years=years: lambda: calculate_amortization(LOAN_AMOUNT, ANNUAL_INTEREST_RATE, years))
+        benchmark(f"schedule/cents/{years}y")(
+            lambda years=years: lambda: calculate_amortization_cents(LOAN_AMOUNT, ANNUAL_INTEREST_RATE, years))
+
+    for size in BATCH_SIZES:
+        benchmark(f"batch/schedules/{size}")(lambda size=size: _batch_case(amortize_portfolio, size))
+        benchmark(f"batch/payments/{size * 10}")(lambda size=size: _batch_case(calculate_monthly_payments, size * 10))
+
+    for size in BATCH_SIZES:
+        benchmark(f"prepayment/strategies/{size}")(lambda size=size: _prepayment_case(size))
+
+    engines = (ENGINE_NUMPY, ENGINE_NUMBA) if numba_available() else (ENGINE_NUMPY,)  # Numba is optional
+    for engine in engines:
+        for size in BATCH_SIZES[1:]:
+            benchmark(f"path-dependent/{engine}/{size}")(
+                lambda engine=engine, size=size: _path_dependent_case(engine, size))
+
+    exports = {
+        "csv": lambda directory, df: write_schedule_csv(os.path.join(directory, "schedule.csv"), df),
+        "csv.gz": lambda directory, df: write_schedule_csv(os.path.join(directory, "schedule.csv.gz"), df),
+        "pdf": lambda directory, df: write_schedule_pdf(os.path.join(directory, "schedule.pdf"), df),
+    }
+    if importlib.util.find_spec("pyarrow") is not None:  # Optional dependency
+        exports["parquet"] = lambda directory, df: write_schedule_arrow(os.path.join(directory, "schedule.parquet"), df)
+        exports["arrow"] = lambda directory, df: write_schedule_arrow(os.path.join(directory, "schedule.arrow"), df)
+        for file_format in ("parquet", "arrow"):
+            benchmark(f"reopen/{file_format}/batch-{REOPEN_BATCH_SIZE}")(
+                lambda file_format=file_format: _reopen_case(file_format, REOPEN_BATCH_SIZE))
+    for export_format, export in exports.items():
+        for years in (1, 30, 100):
+            benchmark(f"export/{export_format}/{years}y")(
+                lambda export=export, years=years: _export_case(export, _schedule(years)))
+        benchmark(f"export/{export_format}/batch-{EXPORT_BATCH_SIZE}")(lambda export=export: _export_case(
+            export, to_long_format(amortize_portfolio(*_portfolio(EXPORT_BATCH_SIZE)))))
+
+    for years in (1, 30, 100):
+        benchmark(f"widget/table/{years}y")(lambda years=years: _widget_case("show_amortization_table", years))
+        benchmark(f"widget/graph/{years}y")(lambda years=years: _widget_case("show_graph", years))
+    for method in ("save_csv", "save_pdf"):
+        benchmark(f"widget/{method}/30y")(lambda method=method: _widget_case(method, 30))
+
+
+def _batch_case(function, size):
+    """Returns a callable applying a batch function to a portfolio generated up front."""
+    inputs = _portfolio(size)
+    return lambda: function(*inputs)
+
+
+def _prepayment_case(size):
+    """Returns a callable comparing `size` recurring-plus-lump-sum prepayment strategies on a 30-year loan."""
+    generator = np.random.default_rng(size)
+    extra_payments = np.repeat(generator.uniform(0, 500, (size, 1)), 360, axis=1)
+    extra_payments[np.arange(size), generator.integers(0, 360, size)] += generator.uniform(0, 50_000, size)
+    return lambda: compare_prepayments(LOAN_AMOUNT, ANNUAL_INTEREST_RATE, 30, extra_payments)
+
+
+def _path_dependent_case(engine, size):
+    """Returns a callable amortizing `size` 5/1 ARMs with a 7.5% payment cap and a 110% negative amortization limit."""
+    loan_amounts, annual_interest_rates, _ = _portfolio(size)
+    generator = np.random.default_rng(size)
+    index_rates = generator.uniform(1, 9, (size, 30 * 12))
+    interest_rates = np.stack([indexed_rate_schedule(rate, index, 2.5, 30, initial_cap=2, periodic_cap=1)
+                               for rate, index in zip(annual_interest_rates, index_rates)])
+    amortize_path_dependent(loan_amounts[:1], interest_rates[:1], engine=engine)  # Compiles the kernel up front
+    return lambda: amortize_path_dependent(loan_amounts, interest_rates, payment_cap=0.075,
+                                           negative_amortization_limit=1.10, engine=engine)
+
+
+def _export_case(export, df):
+    """Returns a callable exporting df into a temporary directory kept for the process lifetime."""
+    directory = tempfile.mkdtemp(prefix="loan-benchmarks-")
+    return lambda: export(directory, df)
+
+
+def _reopen_case(file_format, size):
+    """Returns a callable reopening a saved portfolio schedule and summing its interest, as the graph does."""
+    filename = os.path.join(tempfile.mkdtemp(prefix="loan-benchmarks-"), f"portfolio.{file_format}")
+    write_schedule_arrow(filename, to_long_format(amortize_portfolio(*_portfolio(size))))
+    return lambda: read_schedule_arrow(filename)["Interest"].to_numpy().sum()
+
+
+_window = None
+
+
+def _widget_case(method, number_of_years):
+    """
+    Returns a callable running a LoanCalculator method offscreen. Modal dialogs are shown,
+    rendered once and closed instead of blocking, and file dialogs return a temporary file.
+    """
+    global _window
+    from PyQt5.QtCore import qInstallMessageHandler
+    from PyQt5.QtWidgets import QApplication, QDialog, QFileDialog, QMessageBox
+
+    if _window is None:
+        from main import LoanCalculator
+
+        app = QApplication.instance() or QApplication(sys.argv)
+        qInstallMessageHandler(lambda *args: None)  # Offscreen-platform and stylesheet warnings drown the report
+
+        def render_and_close(dialog):
+            dialog.show()
+            app.processEvents()
+            dialog.grab()  # Paints the visible rows
+            dialog.close()
+            return QDialog.Accepted
+
+        def fail(parent, title, message, *args):
+            raise RuntimeError(f"{title}: {message}")
+
+        directory = tempfile.mkdtemp(prefix="loan-benchmarks-")
+        QDialog.exec_ = render_and_close
+        QFileDialog.getSaveFileName = staticmethod(
+            lambda parent, caption, directory_, filters: (os.path.join(directory, "schedule.pdf"
+                                                          if "PDF" in caption else "schedule.csv"), ""))
+        QMessageBox.information = staticmethod(lambda *args: QMessageBox.Ok)
+        QMessageBox.warning = QMessageBox.critical = staticmethod(fail)
+        _window = LoanCalculator()
+
+    window = _window
+    app = QApplication.instance()
+    data = calculate_amortization(LOAN_AMOUNT, ANNUAL_INTEREST_RATE, number_of_years)
+
+    def run():
+        window.amortization_data = data
+        if method in ("show_amortization_table", "show_graph"):
+            getattr(window, method)()
+            app.processEvents()  # Lets the chart's deferred redraw run
+        else:
+            getattr(window, method)(window.save_results())
+    return run
+
+
+def time_case(function):
+    """Returns (median, spread): the median per-call time over REPEATS samples and their interquartile range."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()  # Also warms up caches and lazy imports
+    number = max(1, number // SAMPLES_PER_AUTORANGE)
+    samples = np.array(timer.repeat(repeat=REPEATS, number=number)) / number
+    lower, median, upper = np.percentile(samples, (25, 50, 75))
+    return float(median), float(upper - lower)
+
+
+def machine_description():
+    """Describes the machine the timings were taken on; baselines only compare on the same kind."""
+    return f"{platform.machine()} {platform.system()} Python {platform.python_version()} ({os.cpu_count()} CPUs)"
+
+
+def load_baseline(path):
+    """Returns the stored baseline dictionary, or None when none has been saved."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def _format_time(seconds):
+    """Formats a duration with a unit suited to its size."""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds:8.3f} s "
+
+
+def _status(name, results, noise, baseline_results, baseline_noise, threshold):
+    """Returns "REGRESSION", "slower, within noise" or None for a case compared with its baseline."""
+    previous = baseline_results.get(name)
+    if not previous or results[name] <= previous * (1 + threshold):
+        return None
+    floor = max(MIN_REGRESSION_SECONDS, NOISE_MULTIPLE * max(noise[name], baseline_noise.get(name, 0.0)))
+    return "REGRESSION" if results[name] - previous > floor else "slower, within noise"
+
+
+def _report(name, results, noise, baseline_results, baseline_noise, threshold):
+    """Returns the printed line for a case: its timing, noise and change against the baseline."""
+    seconds, previous = results[name], baseline_results.get(name)
+    line = f"{name:<28} {_format_time(seconds)} ±{_format_time(noise[name] / 2).strip()}"
+    if previous:
+        line += f"   {seconds / previous - 1:+7.1%} vs {_format_time(previous).strip()}"
+        status = _status(name, results, noise, baseline_results, baseline_noise, threshold)
+        if status:
+            line += f"   {status}"
+    return line
+
+
+def main(argv=None):
+    """Runs the benchmarks and returns 1 if any case regressed against the baseline beyond its noise."""
+    parser = argparse.ArgumentParser(description="Benchmark the loan calculator's hot paths.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file.")
+    parser.add_argument("--save", action="store_true", help="Store the timings as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed slowdown as a fraction of the baseline (default: {DEFAULT_THRESHOLD}).")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this text.")
+    parser.add_argument("--passes", type=int, default=1,
+                        help="Times to run the whole suite; use 3 or more when recording a baseline (default: 1).")
+    args = parser.parse_args(argv)
+    if args.passes < 1:
+        parser.error("--passes must be at least 1")
+
+    _register_cases()
+    baseline = load_baseline(args.baseline)
+    baseline_results = baseline["results"] if baseline else {}
+    if baseline and baseline.get("machine") != machine_description():
+        print(f"warning: baseline was recorded on {baseline.get('machine')}, not {machine_description()}",
+              file=sys.stderr)
+
+    baseline_noise = baseline.get("noise", {}) if baseline else {}
+    functions, timings, results, noise, suspects, regressions, warnings = {}, {}, {}, {}, [], [], []
+    for pass_number in range(1, args.passes + 1):
+        for name, setup in BENCHMARKS.items():
+            if args.filter not in name:
+                continue
+            if name not in functions:
+                functions[name] = setup()
+            timings.setdefault(name, []).append(time_case(functions[name]))
+            if pass_number < args.passes:
+                continue
+
+            medians = [median for median, _ in timings[name]]
+            seconds = float(np.median(medians))
+            spread = max(max(spread for _, spread in timings[name]), max(medians) - min(medians))
+            results[name], noise[name] = seconds, spread
+            status = _status(name, results, noise, baseline_results, baseline_noise, args.threshold)
+            if status == "REGRESSION" and not args.save:
+                suspects.append(name)
+                continue
+            print(_report(name, results, noise, baseline_results, baseline_noise, args.threshold), flush=True)
+
+    for name in suspects:  # Re-timed minutes later, so a slow spell of the machine has usually passed
+        for _ in range(CONFIRMATIONS):
+            results[name], noise[name] = min((results[name], noise[name]), time_case(functions[name]))
+        print(_report(name, results, noise, baseline_results, baseline_noise, args.threshold) + " (re-timed)",
+              flush=True)
+    for name in results:
+        status = _status(name, results, noise, baseline_results, baseline_noise, args.threshold)
+        if status == "REGRESSION":
+            regressions.append(name)
+        elif status:
+            warnings.append(name)
+
+    if warnings:
+        print(f"warning: {len(warnings)} case(s) were slower by more than {args.threshold:.0%} but within their "
+              f"timing noise: {', '.join(warnings)}", file=sys.stderr)
+    if args.save:
+        stored = dict(baseline_results, **results)  # Filtered runs only replace the cases they ran
+        stored_noise = dict(baseline_noise, **noise)
+        with open(args.baseline, "w") as handle:
+            json.dump({"machine": machine_description(), "results": stored, "noise": stored_noise}, handle,
+                      indent=2, sort_keys=True)
+            handle.write("\n")
+        print(f"Saved {len(results)} timings to {args.baseline}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
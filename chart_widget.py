@@ -0,0 +1,163 @@
+"""
+Embedded amortization chart widget.
+Keeps one Matplotlib figure on a Qt canvas for the lifetime of the window and updates its line
+data in place, blitting only the lines when the axes do not need to change.
+"""
+import math
+
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+from PyQt5.QtWidgets import QSizePolicy, QVBoxLayout, QWidget
+
+# Minimum number of points kept per line; long series are decimated to about two points per pixel
+MIN_POINTS = 500
+
+
+def downsample(x, y, max_points):
+    """
+    Reduces a series to at most max_points with min/max decimation.
+    Every bucket keeps its smallest and largest value, so peaks and troughs survive.
+    """
+    if len(x) <= max_points:
+        return x, y
+    buckets = max_points // 2
+    starts = np.linspace(0, len(x), buckets + 1).astype(np.int64)[:-1]
+    centers = (x[starts] + x[np.append(starts[1:], len(x)) - 1]) / 2
+    low = np.minimum.reduceat(y, starts)
+    high = np.maximum.reduceat(y, starts)
+    return np.repeat(centers, 2), np.column_stack((low, high)).ravel()
+
+
+def nice_ceiling(value):
+    """Rounds a positive value up to 1, 2 or 5 times a power of ten, so nearby data keeps the same axes."""
+    if value <= 0 or not math.isfinite(value):
+        return 1.0
+    magnitude = 10 ** math.floor(math.log10(value))
+    for step in (1, 2, 5, 10):
+        if value <= step * magnitude:
+            return step * magnitude
+    return 10 * magnitude
+
+
+def chart_series(schedule):
+    """
+    Returns (months, series) for a schedule DataFrame, where series maps line names to arrays.
+    Multi-loan schedules with a "Loan" column are summed by month into one portfolio series.
+    """
+    if "Loan" in schedule.columns:
+        # Summed straight from the columns, which may be read-only views of a memory-mapped file
+        month_index = schedule["Month"].to_numpy().astype(np.intp, copy=False)
+        interest = np.bincount(month_index, weights=schedule["Interest"].to_numpy())[1:]
+        principal = np.bincount(month_index, weights=schedule["Principal"].to_numpy())[1:]
+        months = np.arange(1, len(interest) + 1, dtype=float)
+    else:
+        months = schedule["Month"].to_numpy(dtype=float)
+        interest = schedule["Interest"].to_numpy(dtype=float)
+        principal = schedule["Principal"].to_numpy(dtype=float)
+    return months, {
+        "Principal": principal,
+        "Interest": interest,
+        "Cumulative Interest": np.cumsum(interest),
+        "Balance": principal.sum() - np.cumsum(principal),  # Balance after each month's payment
+    }
+
+
+class AmortizationChart(QWidget):
+    """
+    Persistent chart of a schedule: monthly principal and interest on top, cumulative interest
+    and the remaining balance below. set_schedule() replaces the line data without recreating
+    the figure.
+    """
+
+    # Line name -> (axes index, color)
+    LINES = {
+        "Principal": (0, "blue"),
+        "Interest": (0, "red"),
+        "Cumulative Interest": (1, "darkorange"),
+        "Balance": (1, "green"),
+    }
+
+    def __init__(self, parent=None):
+        """Initializes the figure, its two axes and empty animated lines."""
+        super().__init__(parent)
+        self.figure = Figure(figsize=(8, 5), tight_layout=True)
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.canvas)
+
+        top = self.figure.add_subplot(2, 1, 1)
+        bottom = self.figure.add_subplot(2, 1, 2, sharex=top)
+        self.axes = (top, bottom)
+        top.set_title("Loan Payment Breakdown: Principal vs Interest")
+        top.set_ylabel("Amount")
+        bottom.set_ylabel("Amount")
+        bottom.set_xlabel("Months")
+        amount_format = FuncFormatter(lambda value, _: f"{value:,.0f}")
+        self.lines = {}
+        for name, (axes_index, color) in self.LINES.items():
+            axes = self.axes[axes_index]
+            # Animated lines are left out of full redraws and drawn over the cached background instead
+            (self.lines[name],) = axes.plot([], [], label=name, color=color, animated=True)
+        for axes, legend_location in zip(self.axes, ("upper right", "upper center")):
+            axes.yaxis.set_major_formatter(amount_format)
+            axes.grid(True)
+            axes.legend(loc=legend_location)
+
+        self._backgrounds = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def set_schedule(self, schedule):
+        """Shows a schedule DataFrame, updating the existing lines in place."""
+        months, series = chart_series(schedule)
+        max_points = max(MIN_POINTS, 2 * self.canvas.width())
+        limits = []
+        for axes in self.axes:
+            names = [name for name, (axes_index, _) in self.LINES.items() if self.axes[axes_index] is axes]
+            peak = max((float(np.max(series[name])) for name in names if len(series[name])), default=0.0)
+            limits.append(nice_ceiling(peak))
+        for name, line in self.lines.items():
+            line.set_data(*downsample(months, series[name], max_points))
+        self._update_view((0, max(float(months[-1]) if len(months) else 1.0, 1.0)), limits)
+
+    def clear(self):
+        """Removes the plotted schedule, keeping the current axes."""
+        for line in self.lines.values():
+            line.set_data([], [])
+        self._blit()
+
+    def _update_view(self, x_limits, y_limits):
+        """Blits the new line data, or redraws everything when the axes limits change."""
+        current = [(axes.get_xlim(), axes.get_ylim()) for axes in self.axes]
+        wanted = [(x_limits, (0.0, y_limit)) for y_limit in y_limits]
+        if self._backgrounds is not None and np.allclose(current, wanted):
+            self._blit()
+            return
+        for axes, (x_range, y_range) in zip(self.axes, wanted):
+            axes.set_xlim(*x_range)
+            axes.set_ylim(*y_range)
+        self.canvas.draw_idle()  # _on_draw caches the new background and draws the lines
+
+    def _on_draw(self, event):
+        """Caches the static background after a full redraw and draws the animated lines over it."""
+        self._backgrounds = [self.canvas.copy_from_bbox(axes.bbox) for axes in self.axes]
+        self._draw_lines()
+
+    def _draw_lines(self):
+        """Draws every line onto the canvas renderer."""
+        for line in self.lines.values():
+            line.axes.draw_artist(line)
+
+    def _blit(self):
+        """Restores the cached background, redraws only the lines and pushes the changed regions."""
+        if self._backgrounds is None:
+            self.canvas.draw_idle()
+            return
+        for background in self._backgrounds:
+            self.canvas.restore_region(background)
+        self._draw_lines()
+        for axes in self.axes:
+            self.canvas.blit(axes.bbox)
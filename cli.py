@@ -0,0 +1,238 @@
+"""
+Headless command-line batch runner for the loan calculator.
+Streams loan requests from CSV or JSON-lines through the batch amortization engine in
+bounded-memory chunks and writes per-loan summaries and, optionally, full schedules.
+
+Example:
+    python cli.py loans.jsonl --summary summary.csv --schedules schedules.csv.gz --workers 4
+"""
+import argparse
+import csv
+import io
+import json
+import math
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from amortization import MONTHS_IN_YEAR, InvalidInputError
+from exporters import open_text
+
+# Loans read, computed and written per chunk
+DEFAULT_CHUNK_SIZE = 5_000
+
+# Accepted input field names, canonical name first
+FIELD_ALIASES = {
+    "loan_amount": ("loan_amount", "amount", "principal"),
+    "annual_interest_rate": ("annual_interest_rate", "rate"),
+    "number_of_years": ("number_of_years", "years", "term"),
+}
+SUMMARY_FIELDS = ("id", "loan_amount", "annual_interest_rate", "number_of_years", "monthly_payment",
+                  "total_payment", "total_interest")
+SCHEDULE_HEADER = "Loan,Month,Interest Rate (%),Current Payment,Interest,Principal,Remaining Balance\n"
+
+
+def _field(row, name):
+    """Returns a request field under its canonical name or any alias."""
+    for alias in FIELD_ALIASES[name]:
+        if row.get(alias) not in (None, ""):
+            return row[alias]
+    raise InvalidInputError(f"Missing field '{name}'.")
+
+
+def _number(row, name):
+    """Returns a request field as a finite float."""
+    value = _field(row, name)
+    if isinstance(value, bool):  # JSON true/false would otherwise pass as 1 and 0
+        raise InvalidInputError("Invalid input: Please enter valid numbers.")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise InvalidInputError("Invalid input: Please enter valid numbers.")
+    if not math.isfinite(number):
+        raise InvalidInputError(f"Field '{name}' must be a finite number.")
+    return number
+
+
+def parse_loan_request(row):
+    """Validates one request row and returns (loan_amount, annual_interest_rate, number_of_years)."""
+    if not isinstance(row, dict):
+        raise InvalidInputError("Request must be an object.")
+    loan_amount = _number(row, "loan_amount")
+    annual_interest_rate = _number(row, "annual_interest_rate")
+    number_of_years = _number(row, "number_of_years")
+    if loan_amount <= 0:
+        raise InvalidInputError("Loan amount must be positive.")
+    if number_of_years <= 0:
+        raise InvalidInputError("Loan term must be positive.")
+    if not number_of_years.is_integer():
+        raise InvalidInputError("Loan term must be a whole number of years.")
+    if not 0 <= annual_interest_rate <= 100:
+        raise InvalidInputError("Interest rate must be between 0 and 100.")
+    return loan_amount, annual_interest_rate, int(number_of_years)
+
+
+def iter_request_rows(handle, input_format):
+    """Yields (line_number, row_dict) pairs from a CSV or JSON-lines input stream."""
+    if input_format == "csv":
+        reader = csv.DictReader(handle)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(handle, start=1):
+        if line.strip():
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, {"_error": f"Invalid JSON: {e}"}
+
+
+def _report_invalid_row(line_number, message):
+    """Reports an invalid request row on stderr."""
+    print(f"line {line_number}: {message}", file=sys.stderr)
+
+
+def iter_request_chunks(rows, chunk_size, errors, report=_report_invalid_row):
+    """
+    Groups request rows into chunks of parsed arrays (ids, loan_amounts, rates, years).
+    Invalid rows, including JSON values that are not objects, are passed to report(line_number, message),
+    counted in errors["count"] and skipped.
+    """
+    ids, loan_amounts, rates, years = [], [], [], []
+    loan_number = 0
+    for line_number, row in rows:
+        try:
+            if isinstance(row, dict) and "_error" in row:
+                raise InvalidInputError(row["_error"])
+            loan_amount, annual_interest_rate, number_of_years = parse_loan_request(row)
+        except InvalidInputError as e:
+            errors["count"] += 1
+            report(line_number, str(e))
+            continue
+        ids.append(str(row.get("id", loan_number)))
+        loan_amounts.append(loan_amount)
+        rates.append(annual_interest_rate)
+        years.append(number_of_years)
+        loan_number += 1
+        if len(ids) >= chunk_size:
+            yield ids, np.array(loan_amounts), np.array(rates), np.array(years)
+            ids, loan_amounts, rates, years = [], [], [], []
+    if ids:
+        yield ids, np.array(loan_amounts), np.array(rates), np.array(years)
+
+
+def process_chunk(chunk, summary_format, include_schedules):
+    """
+    Computes one chunk of loans and formats its output.
+    Returns (summary_text, schedule_text, schedule_rows); runs in worker processes when --workers > 1.
+    """
+    from portfolio import amortize_portfolio, calculate_monthly_payments, to_long_format
+
+    ids, loan_amounts, rates, years = chunk
+    schedule_text, schedule_rows = "", 0
+    if include_schedules:
+        result = amortize_portfolio(loan_amounts, rates, years)
+        monthly_payments = result["monthly_payment"]
+        frame = to_long_format(result)
+        frame["Loan"] = np.asarray(ids, dtype=object)[frame["Loan"].to_numpy()]
+        schedule_text = frame.to_csv(None, header=False, index=False, float_format="%.2f")
+        schedule_rows = len(frame)
+    else:
+        monthly_payments = calculate_monthly_payments(loan_amounts, rates, years)
+    total_payments = monthly_payments * years * MONTHS_IN_YEAR
+
+    summary = io.StringIO()
+    writer = csv.writer(summary, lineterminator="\n") if summary_format == "csv" else None
+    for values in zip(ids, loan_amounts, rates, years, monthly_payments, total_payments, total_payments - loan_amounts):
+        record = (values[0], float(values[1]), float(values[2]), int(values[3]),
+                  round(float(values[4]), 2), round(float(values[5]), 2), round(float(values[6]), 2))
+        if writer is not None:
+            writer.writerow(record)
+        else:
+            summary.write(json.dumps(dict(zip(SUMMARY_FIELDS, record))) + "\n")
+    return summary.getvalue(), schedule_text, schedule_rows
+
+
+def _map_chunks(chunks, workers, *args):
+    """Processes chunks in order, keeping at most two chunks per worker in flight to bound memory."""
+    if workers <= 1:
+        for chunk in chunks:
+            yield len(chunk[0]), process_chunk(chunk, *args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((len(chunk[0]), executor.submit(process_chunk, chunk, *args)))
+            if len(pending) >= 2 * workers:
+                loans, future = pending.popleft()
+                yield loans, future.result()
+        while pending:
+            loans, future = pending.popleft()
+            yield loans, future.result()
+
+
+def build_parser():
+    """Creates the command-line argument parser."""
+    parser = argparse.ArgumentParser(description="Amortize loan requests from CSV or JSON-lines without the GUI.")
+    parser.add_argument("input", nargs="?", default="-", help="Input file, or '-' for stdin (default).")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"),
+                        help="Input format; inferred from the file extension, jsonl for stdin.")
+    parser.add_argument("--summary", default="-", help="Summary output file, or '-' for stdout (default).")
+    parser.add_argument("--summary-format", choices=("csv", "jsonl"), default="jsonl",
+                        help="Summary output format (default: jsonl).")
+    parser.add_argument("--no-summary", action="store_true", help="Do not write per-loan summaries.")
+    parser.add_argument("--schedules", help="Write full schedules as long-format CSV to this file (.gz to compress).")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Loans processed per chunk.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes (default: 1).")
+    return parser
+
+
+def _open_output(path):
+    """Opens an output path for text, treating '-' as stdout."""
+    return open(sys.stdout.fileno(), "w", closefd=False) if path == "-" else open_text(path)
+
+
+def main(argv=None):
+    """Runs the batch amortization and returns the process exit code."""
+    args = build_parser().parse_args(argv)
+    input_format = args.input_format or ("csv" if args.input.lower().endswith((".csv", ".csv.gz")) else "jsonl")
+    input_handle = sys.stdin if args.input == "-" else open_text(args.input, "r")
+    summary_handle = None if args.no_summary else _open_output(args.summary)
+    schedule_handle = open_text(args.schedules) if args.schedules else None
+
+    errors = {"count": 0}
+    loans = schedule_rows = 0
+    started = time.perf_counter()
+    try:
+        if summary_handle is not None and args.summary_format == "csv":
+            summary_handle.write(",".join(SUMMARY_FIELDS) + "\n")
+        if schedule_handle is not None:
+            schedule_handle.write(SCHEDULE_HEADER)
+
+        chunks = iter_request_chunks(iter_request_rows(input_handle, input_format), args.chunk_size, errors)
+        for chunk_loans, (summary_text, schedule_text, chunk_rows) in _map_chunks(
+                chunks, args.workers, args.summary_format, schedule_handle is not None):
+            if summary_handle is not None:
+                summary_handle.write(summary_text)
+            if schedule_handle is not None:
+                schedule_handle.write(schedule_text)
+            loans += chunk_loans
+            schedule_rows += chunk_rows
+    finally:
+        for handle in (input_handle, summary_handle, schedule_handle):
+            if handle is not None and handle is not sys.stdin:
+                handle.close()
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    message = f"Processed {loans:,} loans in {elapsed:.2f}s ({loans / elapsed:,.0f} loans/s"
+    if schedule_handle is not None:
+        message += f", {schedule_rows:,} schedule rows at {schedule_rows / elapsed:,.0f} rows/s"
+    print(message + f"); {errors['count']:,} invalid rows skipped.", file=sys.stderr)
+    return 1 if errors["count"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
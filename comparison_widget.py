@@ -0,0 +1,181 @@
+"""
+Scenario comparison widget.
+Shows the scenarios of a ScenarioWorkspace as a differential table against the baseline and as
+overlaid balance curves. sync() adds and removes only the rows and lines that changed.
+"""
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QAbstractItemView, QHBoxLayout, QHeaderView, QPushButton, QSizePolicy, QSplitter,
+                             QTableWidget, QTableWidgetItem, QVBoxLayout, QWidget)
+
+from chart_widget import MIN_POINTS, downsample
+from scenarios import COMPARISON_FIELDS
+
+# Table headers of the compared figures and of their differences from the baseline
+FIELD_HEADERS = {
+    "monthly_payment": "Monthly Payment",
+    "total_interest": "Total Interest",
+    "total_payment": "Total Payment",
+    "payoff_month": "Payoff Month",
+}
+DIFFERENCE_HEADERS = {
+    "monthly_payment": "Payment vs Baseline",
+    "total_interest": "Interest vs Baseline",
+    "total_payment": "Total vs Baseline",
+    "payoff_month": "Payoff vs Baseline",
+}
+
+BASELINE_LINE_WIDTH = 2.5
+LINE_WIDTH = 1.25
+
+
+def format_value(field, value, signed=False):
+    """Formats a compared figure: months as whole numbers, amounts to two decimal places."""
+    sign = "+" if signed else ""
+    if field == "payoff_month":
+        return f"{int(value):{sign},d}"
+    return f"{value:{sign},.2f}"
+
+
+class ScenarioComparison(QWidget):
+    """
+    Side-by-side view of a ScenarioWorkspace: one table row and one balance curve per scenario.
+    Call sync() after changing the workspace; rows and lines of unchanged scenarios are kept.
+    """
+
+    def __init__(self, workspace, parent=None):
+        """Initializes the table, the balance chart and the Set Baseline, Remove and Clear buttons."""
+        super().__init__(parent)
+        self.workspace = workspace
+        self._keys = []  # Scenario key of every table row
+        self._lines = {}  # Scenario key -> balance line
+        self._baseline_key = None
+
+        headers = ["Scenario", *(FIELD_HEADERS[field] for field in COMPARISON_FIELDS),
+                   *(DIFFERENCE_HEADERS[field] for field in COMPARISON_FIELDS)]
+        self.table = QTableWidget(0, len(headers), self)
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+
+        self.figure = Figure(figsize=(8, 4), tight_layout=True)
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.axes = self.figure.add_subplot(1, 1, 1)
+        self.axes.set_title("Remaining Balance by Scenario")
+        self.axes.set_xlabel("Months")
+        self.axes.set_ylabel("Balance")
+        self.axes.yaxis.set_major_formatter(FuncFormatter(lambda value, _: f"{value:,.0f}"))
+        self.axes.grid(True)
+
+        buttons = QHBoxLayout()
+        for text, function in (("Set Baseline", self.set_selected_baseline), ("Remove", self.remove_selected),
+                               ("Clear", self.clear)):
+            button = QPushButton(text, self)
+            button.clicked.connect(function)
+            buttons.addWidget(button)
+        buttons.addStretch(1)
+
+        splitter = QSplitter(Qt.Vertical, self)
+        splitter.addWidget(self.table)
+        splitter.addWidget(self.canvas)
+        layout = QVBoxLayout(self)
+        layout.addWidget(splitter)
+        layout.addLayout(buttons)
+
+    def sync(self):
+        """
+        Brings the table and chart in line with the workspace.
+        New scenarios get a row and a line, removed ones lose theirs, and only when the baseline
+        changed are the difference columns of the other rows refreshed.
+        """
+        for row in reversed(range(len(self._keys))):
+            if self._keys[row] not in self.workspace:
+                self.table.removeRow(row)
+                self._lines.pop(self._keys.pop(row)).remove()
+        for scenario in self.workspace:
+            if scenario["key"] not in self._lines:
+                self._add_row(scenario)
+                self._add_line(scenario)
+        if self._baseline_key != self.workspace.baseline_key:
+            self._baseline_key = self.workspace.baseline_key
+            for row, key in enumerate(self._keys):
+                self._set_differences(row, self.workspace[key])
+            for key, line in self._lines.items():
+                line.set_linewidth(BASELINE_LINE_WIDTH if key == self._baseline_key else LINE_WIDTH)
+        self._update_chart()
+
+    def _add_row(self, scenario):
+        """Appends the table row of a scenario."""
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self._keys.append(scenario["key"])
+        self.table.setItem(row, 0, QTableWidgetItem(scenario["name"]))
+        for column, field in enumerate(COMPARISON_FIELDS, start=1):
+            self.table.setItem(row, column, self._number_item(format_value(field, scenario[field])))
+        self._set_differences(row, scenario)
+
+    def _set_differences(self, row, scenario):
+        """Fills the difference-from-baseline cells of a row; the baseline row reads "Baseline"."""
+        first_column = 1 + len(COMPARISON_FIELDS)
+        is_baseline = scenario["key"] == self.workspace.baseline_key
+        for column, (field, value) in enumerate(self.workspace.differences(scenario).items(), start=first_column):
+            text = "Baseline" if is_baseline else format_value(field, value, signed=True)
+            self.table.setItem(row, column, self._number_item(text))
+
+    @staticmethod
+    def _number_item(text):
+        """Creates a right-aligned table cell."""
+        item = QTableWidgetItem(text)
+        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        return item
+
+    def _add_line(self, scenario):
+        """Plots the balance curve of a scenario, decimated to the canvas width."""
+        balance = scenario["balance"]
+        months = np.arange(len(balance), dtype=float)
+        max_points = max(MIN_POINTS, 2 * self.canvas.width())
+        width = BASELINE_LINE_WIDTH if scenario["key"] == self.workspace.baseline_key else LINE_WIDTH
+        (self._lines[scenario["key"]],) = self.axes.plot(*downsample(months, balance, max_points),
+                                                         label=scenario["name"], linewidth=width)
+
+    def _update_chart(self):
+        """Rescales the axes to the plotted curves and schedules one redraw."""
+        if self._lines:
+            self.axes.relim()
+            self.axes.autoscale_view()
+            self.axes.set_xlim(left=0)
+            self.axes.set_ylim(bottom=0)
+            self.axes.legend(loc="upper right", fontsize="small")
+        elif self.axes.get_legend() is not None:
+            self.axes.get_legend().remove()
+        self.canvas.draw_idle()
+
+    def _selected_key(self):
+        """Returns the key of the selected scenario row, or None."""
+        rows = self.table.selectionModel().selectedRows()
+        return self._keys[rows[0].row()] if rows else None
+
+    def set_selected_baseline(self):
+        """Compares every scenario against the selected one."""
+        key = self._selected_key()
+        if key is not None:
+            self.workspace.set_baseline(key)
+            self.sync()
+
+    def remove_selected(self):
+        """Removes the selected scenario from the workspace."""
+        key = self._selected_key()
+        if key is not None:
+            self.workspace.remove(key)
+            self.sync()
+
+    def clear(self):
+        """Removes every scenario from the workspace."""
+        self.workspace.clear()
+        self.sync()
@@ -0,0 +1,124 @@
+"""
+Exact-money amortization engine working in integer cents.
+Interest is rounded to the cent every period with half-up or banker's rounding, and the last
+payment reconciles the balance exactly, matching how servicing systems keep their ledgers.
+"""
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal, localcontext
+
+import numpy as np
+
+from amortization import MONTHS_IN_YEAR, InvalidInputError, _month_blocks, create_amortization_data
+
+# Calculation engines selectable by the schedule cache and the GUI
+ENGINE_FLOAT = "float"
+ENGINE_CENTS = "cents"
+
+# Rates are held in hundredths of a percent, so a month's interest is balance * rate / RATE_DENOMINATOR
+RATE_DENOMINATOR = MONTHS_IN_YEAR * 100 * 100
+
+
+def to_cents(amount, rounding=ROUND_HALF_UP):
+    """Converts a dollar amount to integer cents, using its shortest decimal representation."""
+    return int(Decimal(repr(float(amount))).scaleb(2).quantize(Decimal(1), rounding))
+
+
+def rate_to_basis_points(annual_interest_rate):
+    """Converts an annual rate in percent to integer hundredths of a percent."""
+    basis_points = Decimal(repr(float(annual_interest_rate))).scaleb(2)
+    if basis_points != basis_points.to_integral_value():
+        raise InvalidInputError("Exact cents mode supports interest rates with at most two decimal places.")
+    return int(basis_points)
+
+
+def _round_division(numerator, denominator, rounding):
+    """Divides non-negative integers and rounds half-up or half-even."""
+    quotient, remainder = divmod(numerator, denominator)
+    twice_remainder = 2 * remainder
+    if rounding == ROUND_HALF_EVEN:
+        return quotient + ((twice_remainder > denominator) | ((twice_remainder == denominator) & (quotient % 2 == 1)))
+    return quotient + (twice_remainder >= denominator)
+
+
+def calculate_monthly_payment_cents(loan_cents, rate_basis_points, number_of_months, rounding=ROUND_HALF_UP):
+    """Calculates the monthly payment in integer cents with 34-digit Decimal arithmetic."""
+    with localcontext() as context:
+        context.prec = 34
+        if rate_basis_points == 0:
+            payment = Decimal(loan_cents) / number_of_months
+        else:
+            monthly_interest_rate = Decimal(rate_basis_points) / RATE_DENOMINATOR
+            factor = (1 + monthly_interest_rate) ** number_of_months
+            payment = loan_cents * monthly_interest_rate * factor / (factor - 1)
+        return int(payment.quantize(Decimal(1), rounding))
+
+
+def amortize_cents(loan_cents, monthly_payment_cents, rate_basis_points, number_of_months, rounding=ROUND_HALF_UP,
+                   progress=None):
+    """
+    Amortizes one loan in integer cents, rounding each month's interest to the cent.
+    Returns (interest, principal, remaining_balance) int64 arrays; as in the float schedule,
+    Remaining Balance holds each month's opening balance and zero for the last month, whose
+    payment clears the balance so principal always sums to the loan amount.
+    progress(months_done, total_months) is called after each block of months and may raise to stop.
+
+    Each month's rounding depends on the balance the previous one left, so the months cannot be
+    vectorized; a 30-year loan takes about 0.2 ms, two to three times the float engine.
+    """
+    interest = []
+    principal = []
+    remaining_balance = []
+
+    # Plain Python integers and lists are much faster than NumPy scalars for a single sequential loan
+    balance = int(loan_cents)
+    payment = int(monthly_payment_cents)
+    rate_basis_points = int(rate_basis_points)
+    for block in _month_blocks(number_of_months, progress):
+        for month in range(block.start, block.stop):
+            month_interest = _round_division(balance * rate_basis_points, RATE_DENOMINATOR, rounding)
+            if month < number_of_months - 1:
+                month_principal = min(payment - month_interest, balance)
+            else:  # Handle the last payment to ensure zero remaining balance
+                month_principal = balance
+            interest.append(month_interest)
+            principal.append(month_principal)
+            remaining_balance.append(balance)
+            balance -= month_principal
+    if remaining_balance:
+        remaining_balance[-1] = 0
+    return (np.array(interest, dtype=np.int64), np.array(principal, dtype=np.int64),
+            np.array(remaining_balance, dtype=np.int64))
+
+
+def calculate_amortization_columns_cents(loan_amount, annual_interest_rate, number_of_years,
+                                         rounding=ROUND_HALF_UP, progress=None):
+    """
+    Calculates a fixed-rate schedule with the exact cents engine.
+    Returns (monthly_payment, total_payment, columns): the payment and the reconciled total of
+    every payment made as Decimal dollars, and schedule columns as float dollars.
+    progress is passed on to amortize_cents().
+    """
+    number_of_months = number_of_years * MONTHS_IN_YEAR
+    loan_cents = to_cents(loan_amount, rounding)
+    rate_basis_points = rate_to_basis_points(annual_interest_rate)
+    payment_cents = calculate_monthly_payment_cents(loan_cents, rate_basis_points, number_of_months, rounding)
+    interest, principal, remaining_balance = amortize_cents(loan_cents, payment_cents, rate_basis_points,
+                                                            number_of_months, rounding, progress)
+    columns = {
+        "Month": np.arange(1, number_of_months + 1),
+        "Interest Rate (%)": np.full(number_of_months, float(annual_interest_rate)),
+        "Current Payment": np.full(number_of_months, payment_cents / 100),
+        "Interest": interest / 100,
+        "Principal": principal / 100,
+        "Remaining Balance": remaining_balance / 100
+    }
+    total_payment_cents = int(interest.sum()) + int(principal.sum())
+    return Decimal(payment_cents).scaleb(-2), Decimal(total_payment_cents).scaleb(-2), columns
+
+
+def calculate_amortization_cents(loan_amount, annual_interest_rate, number_of_years, rounding=ROUND_HALF_UP):
+    """Calculates amortization data with the exact cents engine, as amortization.calculate_amortization() does."""
+    import pandas as pd  # Imported lazily so payment-only callers skip the pandas start-up cost
+
+    monthly_payment, total_payment, columns = calculate_amortization_columns_cents(loan_amount, annual_interest_rate,
+                                                                                   number_of_years, rounding)
+    return create_amortization_data(monthly_payment, total_payment, columns["Interest Rate (%)"], pd.DataFrame(columns))
@@ -0,0 +1,212 @@
+"""
+File exporters for amortization schedules.
+Writes CSV in fixed-size chunks so memory stays flat for very large exports,
+lays out paginated PDF reports in a single pass over pre-formatted columns, and
+writes and memory-maps columnar Arrow/Feather and Parquet files for analytics.
+"""
+import gzip
+
+import numpy as np
+
+# Number of schedule rows formatted and written per chunk
+CSV_CHUNK_ROWS = 10_000
+
+# PDF report layout
+PDF_FONT_FAMILY = "helvetica"
+PDF_FONT_SIZE = 12
+PDF_LINE_HEIGHT_FACTOR = 2.5  # Row height as a multiple of the font size
+PDF_COLUMN_PADDING = 6
+
+# Columnar file formats by file name suffix
+FORMAT_ARROW = "arrow"
+FORMAT_PARQUET = "parquet"
+COLUMNAR_SUFFIXES = {".arrow": FORMAT_ARROW, ".feather": FORMAT_ARROW, ".ipc": FORMAT_ARROW,
+                     ".parquet": FORMAT_PARQUET}
+PARQUET_COMPRESSION = "zstd"
+
+
+def open_text(filename, mode="w", compress=None):
+    """Opens a file for text reading or writing, gzip-compressed when compress is set or the name ends in .gz."""
+    if compress is None:
+        compress = str(filename).endswith(".gz")
+    if compress:
+        return gzip.open(filename, mode + "t", newline="")
+    return open(filename, mode, newline="")
+
+
+def iter_schedule_chunks(schedule, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    Splits a schedule into consecutive DataFrame views of at most chunk_rows rows.
+    An iterable of DataFrames (e.g. one per loan or portfolio block) is passed through as-is.
+    """
+    if hasattr(schedule, "iloc"):
+        for start in range(0, schedule.shape[0], chunk_rows):
+            yield schedule.iloc[start:start + chunk_rows]
+    else:
+        yield from schedule
+
+
+def write_schedule_csv(filename, schedule, chunk_rows=CSV_CHUNK_ROWS, compress=None):
+    """
+    Streams a schedule to a CSV file, formatting floats to two decimals as it goes.
+    Accepts a DataFrame or an iterable of DataFrame chunks sharing the same columns; only
+    one chunk is formatted at a time and no rounded copy of the schedule is made.
+    Returns the number of data rows written.
+    """
+    rows_written = 0
+    header_written = False
+    with open_text(filename, "w", compress) as handle:
+        for chunk in iter_schedule_chunks(schedule, chunk_rows):
+            chunk.to_csv(handle, header=not header_written, index=False, float_format="%.2f")
+            header_written = True
+            rows_written += chunk.shape[0]
+    return rows_written
+
+
+def _format_column(values):
+    """Formats a whole column at once: integers as-is, other numbers to two decimal places."""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.integer):
+        return values.astype(str)
+    if np.issubdtype(values.dtype, np.number):
+        return np.char.mod("%.2f", values)
+    return values.astype(str)
+
+
+def _column_width(pdf, header, formatted_values):
+    """Returns the width needed for the header or the longest formatted value of a column."""
+    width = pdf.get_string_width(header)
+    if len(formatted_values):
+        longest = formatted_values[np.argmax(np.char.str_len(formatted_values))]
+        width = max(width, pdf.get_string_width(str(longest)))
+    return width + PDF_COLUMN_PADDING
+
+
+def write_schedule_pdf(filename, schedule, title="Amortization Schedule"):
+    """
+    Renders a schedule DataFrame to a paginated PDF report.
+    Columns are formatted once with NumPy and sized from their widest value; rows are drawn
+    as plain text over a ruled grid, and the header row is repeated on every page.
+    A multi-loan report can be written from a long-format frame with a "Loan" column.
+    Returns the number of pages written.
+    """
+    from fpdf import FPDF  # Imported on first use to keep start-up fast
+
+    headers = [str(column) for column in schedule.columns]
+    formatted_columns = [_format_column(schedule[column].to_numpy()) for column in schedule.columns]
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(False)  # Pages are broken explicitly so the header can be repeated
+    pdf.set_font(PDF_FONT_FAMILY, size=PDF_FONT_SIZE)
+    line_height = pdf.font_size * PDF_LINE_HEIGHT_FACTOR
+    col_widths = [_column_width(pdf, header, values) for header, values in zip(headers, formatted_columns)]
+
+    # Switch to landscape when the table does not fit across a portrait page
+    if sum(col_widths) > pdf.w - pdf.l_margin - pdf.r_margin:
+        pdf = FPDF(orientation="L")
+        pdf.set_auto_page_break(False)
+        pdf.set_font(PDF_FONT_FAMILY, size=PDF_FONT_SIZE)
+
+    col_edges = pdf.l_margin + np.concatenate(([0], np.cumsum(col_widths)))
+    text_offset = line_height / 2 + 0.3 * pdf.font_size  # Baseline of vertically centred text
+    rows = list(zip(*(values.tolist() for values in formatted_columns)))
+    page_bottom = pdf.h - pdf.b_margin
+
+    pdf.add_page()
+    pdf.cell(0, 10, text=title, align="C")
+    pdf.ln(10)
+    first_row = 0
+    while True:
+        # Header row
+        top = pdf.get_y()
+        for header, width in zip(headers, col_widths):
+            pdf.cell(width, line_height, text=header, border=1)
+        pdf.ln(line_height)
+
+        # As many data rows as fit on the page, drawn as text then ruled in one go
+        y = pdf.get_y()
+        rows_on_page = max(1, int((page_bottom - y) // line_height))
+        page_rows = rows[first_row:first_row + rows_on_page]
+        for row in page_rows:
+            for x, datum in zip(col_edges, row):
+                pdf.text(x + pdf.c_margin, y + text_offset, datum)
+            y += line_height
+            pdf.line(col_edges[0], y, col_edges[-1], y)
+        for x in col_edges:
+            pdf.line(x, top, x, y)
+
+        first_row += len(page_rows)
+        if first_row >= len(rows):
+            break
+        pdf.add_page()
+
+    pdf.output(filename)
+    return pdf.pages_count
+
+
+def _import_pyarrow():
+    """Imports pyarrow on first use, explaining how to install it when it is missing."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Arrow and Parquet files need the optional pyarrow package: pip install pyarrow") from e
+    return pyarrow
+
+
+def columnar_format(filename):
+    """Returns FORMAT_ARROW or FORMAT_PARQUET for a file name, based on its suffix."""
+    for suffix, file_format in COLUMNAR_SUFFIXES.items():
+        if str(filename).lower().endswith(suffix):
+            return file_format
+    raise ValueError(f"Unsupported file type: {filename} (expected one of {', '.join(COLUMNAR_SUFFIXES)})")
+
+
+def write_schedule_arrow(filename, schedule, loan_id=0):
+    """
+    Writes a schedule DataFrame to an Arrow/Feather (.arrow, .feather) or Parquet (.parquet) file.
+    A leading "Loan" column set to loan_id is added to single-loan schedules, so files from
+    one or many loans share a layout. Arrow files are written uncompressed as a single record
+    batch, which lets read_schedule_arrow() map them without copying.
+    Returns the number of rows written.
+    """
+    pa = _import_pyarrow()
+    file_format = columnar_format(filename)
+    table = pa.Table.from_pandas(schedule, preserve_index=False)
+    if "Loan" not in table.column_names:
+        table = table.add_column(0, "Loan", pa.array(np.full(table.num_rows, loan_id, dtype=np.int64)))
+
+    if file_format == FORMAT_PARQUET:
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, filename, compression=PARQUET_COMPRESSION)
+    else:
+        with pa.OSFile(str(filename), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=None)  # One batch keeps every column contiguous
+    return table.num_rows
+
+
+def read_schedule_arrow(filename):
+    """
+    Opens a schedule written by write_schedule_arrow() as a DataFrame.
+    Arrow/Feather files are memory-mapped and their numeric columns wrap the mapped pages
+    directly, so rows are only read from disk when they are displayed or aggregated; the
+    returned columns are read-only. Parquet files are compressed and are decoded into memory.
+    """
+    pa = _import_pyarrow()
+    import pandas as pd
+
+    if columnar_format(filename) == FORMAT_PARQUET:
+        import pyarrow.parquet as pq
+
+        return pq.read_table(filename, memory_map=True).to_pandas()
+
+    table = pa.ipc.open_file(pa.memory_map(str(filename), "r")).read_all()
+    columns = {}
+    for name, column in zip(table.column_names, table.columns):
+        numeric = pa.types.is_integer(column.type) or pa.types.is_floating(column.type)
+        if numeric and column.num_chunks == 1 and column.null_count == 0:
+            # Zero-copy view of the mapped buffer; the array keeps the memory map open
+            columns[name] = column.chunk(0).to_numpy(zero_copy_only=True)
+        else:
+            columns[name] = column.to_numpy()  # Multi-batch, nullable or text columns are copied
+    return pd.DataFrame(columns, copy=False)
@@ -0,0 +1,106 @@
+"""
+Opt-in timing, memory and profiling instrumentation for user actions.
+
+Set LOAN_CALCULATOR_INSTRUMENT=1 before starting the application to log one JSON line per
+action to stderr with its wall time, peak traced memory and schedule row count. Set
+LOAN_CALCULATOR_PROFILE=<directory> to also write a cProfile dump per action (implies
+instrumentation). When neither is set, @instrumented returns the wrapped function itself,
+so there is no overhead.
+"""
+import cProfile
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from functools import wraps
+
+INSTRUMENT_ENV = "LOAN_CALCULATOR_INSTRUMENT"
+PROFILE_ENV = "LOAN_CALCULATOR_PROFILE"
+
+PROFILE_DIRECTORY = os.environ.get(PROFILE_ENV) or None
+ENABLED = os.environ.get(INSTRUMENT_ENV, "").lower() not in ("", "0", "false", "no") or PROFILE_DIRECTORY is not None
+
+logger = logging.getLogger("loan_calculator.instrumentation")
+_profile_lock = threading.Lock()
+_profile_count = 0
+
+
+def _start():
+    """Configures logging and memory tracing the first time an instrumented action runs."""
+    if not logger.handlers and not logging.getLogger().handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def _profile_path(action):
+    """Returns a unique cProfile dump path for an action."""
+    global _profile_count
+    with _profile_lock:
+        _profile_count += 1
+        count = _profile_count
+    os.makedirs(PROFILE_DIRECTORY, exist_ok=True)
+    return os.path.join(PROFILE_DIRECTORY, f"{action}-{time.strftime('%Y%m%d-%H%M%S')}-{count}.prof")
+
+
+def instrumented(action, rows=None):
+    """
+    Decorates a function to record one structured record per call when instrumentation is on.
+    rows(args, result) returns the number of schedule rows the call handled, or None.
+    Peak memory is measured process-wide, so it includes other threads running at the same time.
+    """
+    def decorate(function):
+        if not ENABLED:
+            return function
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not tracemalloc.is_tracing():
+                _start()
+            profiler = cProfile.Profile() if PROFILE_DIRECTORY else None
+            if profiler is not None:
+                try:
+                    profiler.enable()
+                except ValueError:  # Another profiler is already active, e.g. a nested action
+                    profiler = None
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            status, result = "ok", None
+            try:
+                result = function(*args, **kwargs)
+                return result
+            except BaseException as e:
+                status = type(e).__name__
+                raise
+            finally:
+                wall_time = time.perf_counter() - started
+                peak_memory = tracemalloc.get_traced_memory()[1] - start_memory
+                if profiler is not None:
+                    profiler.disable()
+                    profiler.dump_stats(_profile_path(action))
+                record = {
+                    "action": action,
+                    "wall_ms": round(wall_time * 1000, 3),
+                    "peak_kib": round(max(peak_memory, 0) / 1024, 1),
+                    "rows": rows(args, result) if rows is not None and status == "ok" else None,
+                    "status": status,
+                    "thread": threading.current_thread().name,
+                }
+                logger.info(json.dumps(record))
+
+        return wrapper
+    return decorate
+
+
+def schedule_rows(amortization_data):
+    """Returns the number of rows of an amortization data dictionary, or None."""
+    if not amortization_data:
+        return None
+    return len(amortization_data["amortization_schedule"])
+
@@ -1,27 +1,41 @@
 import sys
-import pandas as pd
-import numpy as np
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
-import matplotlib.pyplot as plt
-from decimal import Decimal, ROUND_HALF_UP
-import threading
 import locale  # For currency formatting
-import csv
-from fpdf import FPDF
-
-# Constants
-MONTHS_IN_YEAR = 12
-
-# Custom Exception Classes
-class InvalidInputError(Exception):
-    """Custom exception raised for invalid user input."""
-    pass
-
-class CalculationError(Exception):
-    """Custom exception raised for errors during calculations."""
-    pass
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP
+import numpy as np
+import amortization
+from amortization import MONTHS_IN_YEAR, InvalidInputError, CalculationError
+from exact_money import ENGINE_CENTS, ENGINE_FLOAT, calculate_monthly_payment_cents, rate_to_basis_points, to_cents
+from exporters import (COLUMNAR_SUFFIXES, read_schedule_arrow, write_schedule_arrow, write_schedule_csv,
+                       write_schedule_pdf)
+from instrumentation import instrumented, schedule_rows
+from scenarios import ScenarioWorkspace, scenario_label
+from schedule_cache import ScheduleCache
+from sweep import SWEEP_FIELDS, sweep
+from table_model import AmortizationTableModel
+from workers import CalculationWorker
+
+# Calculation engine and rounding mode behind each precision option
+PRECISION_MODES = {
+    "Standard": (ENGINE_FLOAT, ROUND_HALF_UP),
+    "Exact Cents (Half-Up)": (ENGINE_CENTS, ROUND_HALF_UP),
+    "Exact Cents (Banker's)": (ENGINE_CENTS, ROUND_HALF_EVEN),
+}
+
+# Share of the progress bar covered by computing the schedule; building the table takes it to 90%
+SCHEDULE_PROGRESS = 80
+
+# Delay after the last keystroke before the payment preview is recalculated
+PREVIEW_DELAY_MS = 200
+
+# Minimum size of the embedded chart
+CHART_WIDTH = 900
+CHART_HEIGHT = 420
+
+# Columns a reopened schedule file must have to be shown
+SCHEDULE_COLUMNS = ("Month", "Interest Rate (%)", "Current Payment", "Interest", "Principal")
 
 
 class LoanCalculator(QMainWindow):
@@ -42,6 +56,15 @@ class LoanCalculator(QMainWindow):
         self.show()
         self.amortization_data = None
         self.progress_dialog = None
+        self.calculation_worker = None
+        self.chart = None
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_DELAY_MS)
+        self.preview_timer.timeout.connect(self.update_preview)
+        self.schedule_cache = ScheduleCache()
+        self.scenarios = ScenarioWorkspace(self.schedule_cache)  # Shares schedules with the main window
+        self.comparison_dialog = None
         self.currency_symbol = "$"  
         self.currency.currentIndexChanged.connect(self.update_currency_symbol)
         locale.setlocale(locale.LC_ALL, '') 
@@ -109,6 +132,13 @@ class LoanCalculator(QMainWindow):
             QPushButton#tableButton:hover {
                 background-color: #BA68C8;
             }
+            QPushButton#sweepButton {
+                background-color: #009688;
+                color: white;
+            }
+            QPushButton#sweepButton:hover {
+                background-color: #26A69A;
+            }
 
         """
 
@@ -118,10 +148,14 @@ class LoanCalculator(QMainWindow):
         self.years.clear()
         self.amount.clear()
         self.currency.setCurrentIndex(0)
+        self.precision.setCurrentIndex(0)
         self.monthly_payment.clear()
         self.total_payment.clear()
         self.progress_bar.reset()  
         self.amortization_data = None 
+        if self.chart is not None:
+            self.chart.clear()
+        self._cancel_active_worker()
         if self.progress_dialog:
             self.progress_dialog.close()
         
@@ -137,10 +171,30 @@ class LoanCalculator(QMainWindow):
         main_layout.addWidget(output_group_box)
         main_layout.addSpacing(20)
         main_layout.addLayout(self.create_button_section())
+        self.create_menu_bar()
+        self.main_layout = main_layout
         central_widget = QWidget(self)
         central_widget.setLayout(main_layout)
         self.setCentralWidget(central_widget)
 
+    def create_menu_bar(self):
+        """Creates the File menu for reopening saved schedules and the Scenarios menu for comparing loans."""
+        file_menu = self.menuBar().addMenu("&File")
+        open_action = QAction("&Open Schedule...", self)
+        open_action.setShortcut(QKeySequence.Open)
+        # Lambdas drop the checked flag of triggered(bool), which the (possibly instrumented) slots don't accept
+        open_action.triggered.connect(lambda: self.open_schedule())
+        file_menu.addAction(open_action)
+
+        scenario_menu = self.menuBar().addMenu("&Scenarios")
+        add_action = QAction("&Add Current Loan", self)
+        add_action.setShortcut(QKeySequence("Ctrl+D"))
+        add_action.triggered.connect(lambda: self.add_scenario())
+        scenario_menu.addAction(add_action)
+        compare_action = QAction("&Compare Scenarios...", self)
+        compare_action.triggered.connect(lambda: self.show_comparison())
+        scenario_menu.addAction(compare_action)
+
     def create_title_section(self):
         """Creates the title section of the UI."""
         title_layout = QHBoxLayout()
@@ -184,6 +238,10 @@ class LoanCalculator(QMainWindow):
         self.currency = QComboBox()
         self.currency.addItems(["USD", "EUR", "CAD"])
         self.currency.setFixedWidth(100)
+        precision_label = self._create_label("Precision")
+        self.precision = QComboBox()
+        self.precision.addItems(list(PRECISION_MODES))
+        self.precision.setFixedWidth(180)
         input_layout.addWidget(rate_label, 0, 0) 
         input_layout.addWidget(self.rate, 0, 1)    
         input_layout.addWidget(years_label, 1, 0)  
@@ -192,20 +250,62 @@ class LoanCalculator(QMainWindow):
         input_layout.addWidget(self.amount, 2, 1)
         input_layout.addWidget(currency_label, 3, 0)
         input_layout.addWidget(self.currency, 3, 1)
+        input_layout.addWidget(precision_label, 4, 0)
+        input_layout.addWidget(self.precision, 4, 1)
         input_group_box = QGroupBox("Loan Details")
         input_group_box.setLayout(input_layout)
         self.currency.currentIndexChanged.connect(self.update_currency_symbol) 
-        self.rate.textEdited.connect(self.clear_results_and_progress) 
-        self.years.textEdited.connect(self.clear_results_and_progress)
-        self.amount.textEdited.connect(self.clear_results_and_progress)
+        self.rate.textEdited.connect(self.schedule_preview) 
+        self.years.textEdited.connect(self.schedule_preview)
+        self.amount.textEdited.connect(self.schedule_preview)
+        self.precision.currentIndexChanged.connect(self.schedule_preview)
+        self.currency.currentIndexChanged.connect(self.schedule_preview)
         return input_group_box
 
     def clear_results_and_progress(self): 
-        """Clears the results and resets the progress bar."""
+        """Clears the results, resets the progress bar and supersedes any running calculation."""
+        self._cancel_active_worker()
         self.monthly_payment.clear()
         self.total_payment.clear()
         self.progress_bar.reset()
         self.amortization_data = None 
+        if self.chart is not None:
+            self.chart.clear()
+
+    def schedule_preview(self):
+        """Discards results for the previous inputs and restarts the payment preview timer."""
+        self._cancel_active_worker()
+        self.progress_bar.reset()
+        self.amortization_data = None
+        self.preview_timer.start()  # Restarting on every keystroke debounces the preview
+
+    def update_preview(self):
+        """
+        Shows the monthly and total payment for the current inputs without building the schedule.
+        The schedule itself is built when Table, Graph or Save asks for it, or on the worker pool while the chart
+        is shown.
+        """
+        try:
+            loan_amount, annual_interest_rate, number_of_years = self._read_inputs()
+            engine, rounding = PRECISION_MODES[self.precision.currentText()]
+            number_of_months = number_of_years * MONTHS_IN_YEAR
+            if engine == ENGINE_CENTS:
+                monthly_payment = calculate_monthly_payment_cents(
+                    to_cents(loan_amount, rounding), rate_to_basis_points(annual_interest_rate), number_of_months,
+                    rounding) / 100
+            else:
+                monthly_payment = amortization.calculate_monthly_payment(
+                    loan_amount, annual_interest_rate / (MONTHS_IN_YEAR * 100), number_of_months, rounding)
+        except (InvalidInputError, ArithmeticError):  # Half-typed input; the preview simply stays empty
+            self.monthly_payment.clear()
+            self.total_payment.clear()
+            if self.chart is not None:
+                self.chart.clear()
+            return
+        self.update_output_fields(float(monthly_payment), float(monthly_payment * number_of_months))
+        if self.chart is not None and self.chart.isVisible():
+            # Built off the GUI thread, so typing stays responsive; the chart is redrawn when it arrives
+            self._start_calculation(loan_amount, annual_interest_rate, number_of_years)
 
     def _create_button(self, text, function, button_id=""):
         """Creates a QPushButton."""
@@ -213,7 +313,7 @@ class LoanCalculator(QMainWindow):
         button.setFont(QFont('Arial', 12))
         button.setFixedHeight(45)
         button.setFixedWidth(100)
-        button.clicked.connect(function)
+        button.clicked.connect(lambda: function())  # Drops the checked flag, which slots don't accept
         button.setObjectName(button_id)
         return button
 
@@ -225,6 +325,7 @@ class LoanCalculator(QMainWindow):
         button_layout.addWidget(self._create_button("Clear", self.clear_fields, "clearButton"))  
         button_layout.addWidget(self._create_button("Graph", self.show_graph, "graphButton"))      
         button_layout.addWidget(self._create_button("Table", self.show_amortization_table, "tableButton")) 
+        button_layout.addWidget(self._create_button("Sweep", self.show_sweep, "sweepButton"))
         button_layout.addWidget(self._create_button("Save", self.save_dialog, "saveButton")) 
         return button_layout
 
@@ -259,33 +360,12 @@ class LoanCalculator(QMainWindow):
         return value_label
 
 
+    @instrumented("calculate_loan")
     def calculate_loan(self):
         """Initiates the loan calculation process."""
         try:
-            # Input validation
-            if not self.rate.text() or not self.years.text() or not self.amount.text():
-                raise InvalidInputError("All fields are required.")
-
-            try:
-                annual_interest_rate = float(self.rate.text())
-                loan_amount = float(self.amount.text())
-                number_of_years = int(self.years.text())
-            except ValueError:
-                raise InvalidInputError("Invalid input: Please enter valid numbers.")
-
-            if loan_amount <= 0:
-                raise InvalidInputError("Loan amount must be positive.")
-            if number_of_years <= 0:
-                raise InvalidInputError("Loan term must be positive.")
-            if not 0 < annual_interest_rate <= 100:
-                raise InvalidInputError("Interest rate must be between 0 and 100.")
-
-            self.calculation_thread = threading.Thread(
-                target=self._perform_calculation,
-                args=(loan_amount, annual_interest_rate, number_of_years),
-                daemon=True
-            )
-            self.calculation_thread.start()
+            loan_amount, annual_interest_rate, number_of_years = self._read_inputs()
+            self._start_calculation(loan_amount, annual_interest_rate, number_of_years)
 
         except InvalidInputError as e:
             QMessageBox.critical(self, "Input Error", str(e))
@@ -293,76 +373,122 @@ class LoanCalculator(QMainWindow):
             QMessageBox.critical(self, "Unexpected Error", f"An unexpected error occurred: {e}")
 
 
+    def _start_calculation(self, loan_amount, annual_interest_rate, number_of_years):
+        """Starts building the schedule on the worker pool; the result arrives through _on_calculation_finished."""
+        # A new request supersedes any calculation still running for older inputs
+        self._cancel_active_worker()
+        engine, rounding = PRECISION_MODES[self.precision.currentText()]
+        worker = CalculationWorker(self._perform_calculation, loan_amount, annual_interest_rate,
+                                   number_of_years, self.currency.currentText(), engine, rounding)
+        worker.signals.progress.connect(self._on_calculation_progress)
+        worker.signals.finished.connect(self._on_calculation_finished)
+        worker.signals.failed.connect(self._on_calculation_failed)
+        self.calculation_worker = worker
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        worker.start()
+
+    def _read_inputs(self):
+        """Validates the input fields and returns (loan_amount, annual_interest_rate, number_of_years)."""
+        if not self.rate.text() or not self.years.text() or not self.amount.text():
+            raise InvalidInputError("All fields are required.")
+
+        try:
+            annual_interest_rate = float(self.rate.text())
+            loan_amount = float(self.amount.text())
+            number_of_years = int(self.years.text())
+        except ValueError:
+            raise InvalidInputError("Invalid input: Please enter valid numbers.")
+
+        if loan_amount <= 0:
+            raise InvalidInputError("Loan amount must be positive.")
+        if number_of_years <= 0:
+            raise InvalidInputError("Loan term must be positive.")
+        if not 0 < annual_interest_rate <= 100:
+            raise InvalidInputError("Interest rate must be between 0 and 100.")
+        return loan_amount, annual_interest_rate, number_of_years
+
+    def ensure_amortization_data(self):
+        """Returns the amortization data for the current inputs, building the schedule on first request."""
+        if self.amortization_data is None:
+            loan_amount, annual_interest_rate, number_of_years = self._read_inputs()
+            self._cancel_active_worker()
+            engine, rounding = PRECISION_MODES[self.precision.currentText()]
+            # Served from the schedule cache when the scenario was calculated before
+            self.amortization_data = self.schedule_cache.get_amortization(
+                loan_amount, annual_interest_rate, number_of_years, self.currency.currentText(), rounding, engine)
+            self.progress_bar.setValue(100)
+            self.calculation_finished.emit(self.amortization_data['monthly_payment'],
+                                           self.amortization_data['total_payment'])
+        return self.amortization_data
+
     def cancel_calculation(self):
-        """Cancels the ongoing calculation (currently only closes the dialog)."""
+        """Cancels the ongoing calculation and clears its partial results."""
         if self.progress_dialog:
             self.progress_dialog.close()
         self.clear_results_and_progress()
         QMessageBox.warning(self, "Calculation Canceled", "The calculation has been canceled.")
-    
 
-    def _perform_calculation(self, loan_amount, annual_interest_rate, number_of_years):
+    def _cancel_active_worker(self):
+        """Cancels the running calculation worker, if any, so its result is discarded."""
+        if self.calculation_worker is not None:
+            self.calculation_worker.cancel()
+            self.calculation_worker = None
+
+    @instrumented("perform_calculation", rows=lambda args, result: schedule_rows(result))
+    def _perform_calculation(self, token, report_progress, loan_amount, annual_interest_rate, number_of_years,
+                             currency="USD", engine=ENGINE_FLOAT, rounding=ROUND_HALF_UP):
         """
-        Performs the loan calculation in a separate thread.
-        Uses QTimer.singleShot to update the UI safely from a background thread.
+        Performs the loan calculation on a worker thread.
+        Never touches widgets; progress and the result reach the UI through the worker's signals.
         """
-        try:
-            self.progress_bar.setRange(0, 0)  
-            self.progress_bar.show() 
-
-            self.amortization_data = self.calculate_amortization(loan_amount, annual_interest_rate, number_of_years)
-            self.calculation_finished.emit(self.amortization_data['monthly_payment'], self.amortization_data['total_payment']) 
-
-            self.progress_bar.setRange(0, 1) 
-            self.progress_bar.setValue(1) 
-
-        except Exception as e:
-            # Use QTimer.singleShot for thread-safe UI updates
-            QTimer.singleShot(0, lambda: QMessageBox.critical(self, "Calculation Error", f"An error occurred during calculation: {e}"))
+        def report_months(months_done, total_months):
+            # Called between blocks of months; report_progress raises once the worker is cancelled
+            report_progress(SCHEDULE_PROGRESS * months_done // total_months)
+
+        report_progress(0)
+        amortization_data = self.calculate_amortization(loan_amount, annual_interest_rate, number_of_years, currency,
+                                                        engine, rounding, report_months)
+        token.raise_if_cancelled()
+        report_progress(90)
+        return amortization_data
+
+    def _on_calculation_progress(self, worker, percent):
+        """Updates the progress bar for the active calculation."""
+        if worker is self.calculation_worker:
+            self.progress_bar.setValue(percent)
+
+    def _on_calculation_finished(self, worker, amortization_data):
+        """Stores and displays the result of the active calculation, ignoring superseded ones."""
+        if worker is not self.calculation_worker or amortization_data is None:
+            return
+        self.calculation_worker = None
+        self.amortization_data = amortization_data
+        self.progress_bar.setValue(100)
+        if self.chart is not None and self.chart.isVisible():
+            self.chart.set_schedule(amortization_data['amortization_schedule'])
+        self.calculation_finished.emit(amortization_data['monthly_payment'], amortization_data['total_payment'])
+
+    def _on_calculation_failed(self, worker, message):
+        """Reports an error raised by the active calculation."""
+        if worker is not self.calculation_worker:
+            return
+        self.calculation_worker = None
+        self.progress_bar.reset()
+        QMessageBox.critical(self, "Calculation Error", f"An error occurred during calculation: {message}")
 
     def _calculate_monthly_payment(self, loan_amount, monthly_interest_rate, number_of_months):
         """Calculates the monthly loan payment."""
-        if monthly_interest_rate == 0:
-            return loan_amount / number_of_months
-        factor = (1 + monthly_interest_rate) ** number_of_months
-        monthly_payment = (loan_amount * monthly_interest_rate * factor) / (factor - 1)
-        return Decimal(monthly_payment).quantize(Decimal("0.00"), ROUND_HALF_UP)
-
-    def _create_amortization_data(self, monthly_payment, total_payment, interest_rates, amortization_schedule):
-        """Creates a dictionary containing amortization data."""
-        return {
-            "monthly_payment": float(monthly_payment),
-            "total_payment": float(total_payment),
-            "interest_rates": interest_rates,
-            "amortization_schedule": amortization_schedule
-        }
-    
-    def calculate_amortization(self, loan_amount, annual_interest_rate, number_of_years):
-        """Calculates the full amortization schedule."""
+        return amortization.calculate_monthly_payment(loan_amount, monthly_interest_rate, number_of_months)
 
-        number_of_months = number_of_years * MONTHS_IN_YEAR
-        monthly_interest_rate = annual_interest_rate / (MONTHS_IN_YEAR * 100)  # Calculate this once
-
-        try:
-            monthly_payment = self._calculate_monthly_payment(loan_amount, monthly_interest_rate, number_of_months)
-        except CalculationError as e:
-            QTimer.singleShot(0, lambda: QMessageBox.critical(self, "Calculation Error", str(e))) # Handle error from _calculate_monthly_payment
-            return None  # Return None to indicate failure
-
-
-        interest_rates = np.full(number_of_months, float(annual_interest_rate))
-        monthly_payments = np.full(number_of_months, float(monthly_payment))
-        amortization_schedule_df = self.create_amortization_schedule(loan_amount, monthly_payments, interest_rates)
-
-        if amortization_schedule_df is not None:  # Check if the schedule was created successfully
-            return {  # Return the data directly as a dictionary
-                "monthly_payment": float(monthly_payment),
-                "total_payment": float(monthly_payment * number_of_months),
-                "interest_rates": interest_rates,
-                "amortization_schedule": amortization_schedule_df
-            }
-        else:
-            return None # If schedule creation fails
+    def calculate_amortization(self, loan_amount, annual_interest_rate, number_of_years, currency="USD",
+                               engine=ENGINE_FLOAT, rounding=ROUND_HALF_UP, progress=None):
+        """
+        Calculates the full amortization schedule, reusing a cached one for repeated scenarios.
+        Errors propagate to the caller; on a worker thread they reach the UI through the failed signal.
+        """
+        return self.schedule_cache.get_amortization(loan_amount, annual_interest_rate, number_of_years, currency,
+                                                    rounding, engine, progress)
 
     def update_currency_symbol(self, index):
         """Updates the currency symbol based on the selected currency."""
@@ -377,112 +503,160 @@ class LoanCalculator(QMainWindow):
         self.total_payment.setText(total_payment_str)
 
     def create_amortization_schedule(self, loan_amount, monthly_payments, interest_rates):
-        """
-        Creates a Pandas DataFrame representing the amortization schedule.
-        Handles the last payment to ensure a zero remaining balance.
-        """
-        total_months = len(interest_rates)
-        amortization_data = {  
-            "Month": np.arange(1, total_months + 1),
-            "Interest Rate (%)": interest_rates,
-            "Current Payment": monthly_payments,  
-            "Interest": np.zeros(total_months),
-            "Principal": np.zeros(total_months),
-            "Remaining Balance": np.zeros(total_months)
-        }
-        amortization_data["Remaining Balance"][0] = loan_amount
-
-        for i in range(total_months):
-            monthly_interest_rate = float(Decimal(interest_rates[i]) / (MONTHS_IN_YEAR * Decimal(100)))
-            amortization_data["Interest"][i] = amortization_data["Remaining Balance"][i] * monthly_interest_rate
-
-            if i < total_months - 1:
-                principal_payment = monthly_payments[i] - amortization_data["Interest"][i]
-                principal_payment = min(principal_payment, amortization_data["Remaining Balance"][i])  
-                amortization_data["Principal"][i] = principal_payment
-                amortization_data["Remaining Balance"][i+1] = amortization_data["Remaining Balance"][i] - principal_payment
-
-            else: # Handle the last payment to ensure zero remaining balance
-                amortization_data["Principal"][i] = amortization_data["Remaining Balance"][i]
-                amortization_data["Remaining Balance"][i] = 0  
-
-        return pd.DataFrame(amortization_data)
+        """Creates a Pandas DataFrame representing the amortization schedule."""
+        return amortization.create_amortization_schedule(loan_amount, monthly_payments, interest_rates)
 
     def save_results(self):
         """Saves the amortization schedule data."""
         try:
-            if self.amortization_data is None:
-                raise ValueError("Please calculate the payment before saving results.")
+            # Exporters only read the schedule, so no copy is needed
+            return self.ensure_amortization_data()['amortization_schedule']
 
-            return self.amortization_data['amortization_schedule'].copy() 
-
-        except (ValueError, KeyError) as e:
+        except (InvalidInputError, CalculationError, ValueError, KeyError) as e:
             QMessageBox.warning(self, "Invalid Input", f"Error: {e}")
             return None
         except Exception as e:
             QMessageBox.critical(self, "Unexpected Error", f"An unexpected error occurred during saving: {e}")
             return None
         
+    @instrumented("show_amortization_table", rows=lambda args, result: schedule_rows(args[0].amortization_data))
     def show_amortization_table(self):
-        """Displays the amortization schedule in a QTableWidget."""
+        """Displays the amortization schedule in a QTableView backed by a lazy table model."""
         try:
-            if self.amortization_data is None:
-                raise ValueError("Please calculate the payment before showing the amortization table.")
-
-            df = self.amortization_data['amortization_schedule'] 
-
-            table_widget = QTableWidget(self)
-            table_widget.setRowCount(df.shape[0])
-            table_widget.setColumnCount(df.shape[1])
-            table_widget.setHorizontalHeaderLabels(df.columns)
+            df = self.ensure_amortization_data()['amortization_schedule'] 
 
-            for i in range(table_widget.columnCount()):
-                table_widget.setColumnWidth(i, 120)
+            table_view = QTableView(self)
+            table_view.setModel(AmortizationTableModel(df, table_view))
+            # Fixed row heights let the view lay out rows without measuring each one
+            table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
 
-            for row in df.itertuples():
-                for col, value in enumerate(row[1:]):
-                    table_widget.setItem(row.Index, col, QTableWidgetItem(f"{value:,.2f}"))
+            for i in range(df.shape[1]):
+                table_view.setColumnWidth(i, 120)
 
             table_dialog = QDialog(self)
             table_layout = QVBoxLayout(table_dialog)
-            table_layout.addWidget(table_widget)
+            table_layout.addWidget(table_view)
             table_dialog.setWindowTitle("Amortization Table")
             table_dialog.setWindowModality(Qt.WindowModality.WindowModal)
 
-            total_width = sum(table_widget.columnWidth(i) for i in range(table_widget.columnCount()))
+            total_width = sum(table_view.columnWidth(i) for i in range(df.shape[1]))
             table_dialog.resize(total_width + 40, 600)
             table_dialog.exec_()
 
-        except (ValueError, KeyError) as e:
+        except (InvalidInputError, CalculationError, ValueError, KeyError) as e:
             QMessageBox.warning(self, "Invalid Input", f"Error: {e}")
         except Exception as e:
             QMessageBox.critical(self, "Unexpected Error", f"An unexpected error occurred: {e}")
 
+    @instrumented("show_graph", rows=lambda args, result: schedule_rows(args[0].amortization_data))
     def show_graph(self):
-        """Displays a graph of the amortization schedule."""
+        """Shows the schedule in the chart embedded below the buttons, creating the chart on first use."""
         try:
-            if self.amortization_data is None:
-                raise ValueError("No data to graph. Please perform a calculation.") 
+            df = self.ensure_amortization_data()['amortization_schedule']
 
-            self.create_graph(self.amortization_data['amortization_schedule']).show()  
+            if self.chart is None:
+                self.chart = self.create_chart()
+            self.chart.show()
+            self.chart.set_schedule(df)
 
-        except (ValueError, KeyError) as e:
+        except (InvalidInputError, CalculationError, ValueError, KeyError) as e:
             QMessageBox.critical(self, "Graph Error", str(e))  
         except Exception as e:
             QMessageBox.critical(self, "Unexpected Error", f"An unexpected error occurred: {e}")
 
-    def create_graph(self, amortization_data):
-        """Creates a Matplotlib graph of principal and interest payments."""
+    def create_chart(self):
+        """Creates the persistent chart widget and grows the window to make room for it."""
+        from chart_widget import AmortizationChart  # Imported on first use to keep start-up fast
+
+        chart = AmortizationChart(self)
+        chart.setMinimumHeight(CHART_HEIGHT)
+        self.main_layout.addWidget(chart, stretch=1)
+        self.resize(max(self.width(), CHART_WIDTH), self.height() + CHART_HEIGHT)
+        return chart
+
+    def show_sweep(self):
+        """Asks for rate and term ranges and shows a heatmap of the sweep over them for the current amount."""
+        try:
+            if not self.amount.text():
+                raise InvalidInputError("Please enter a loan amount to sweep rates and terms for.")
+            loan_amount = float(self.amount.text())
+
+            ranges = self._ask_sweep_ranges()
+            if ranges is None:
+                return
+            (rate_from, rate_to, rate_step), (years_from, years_to, years_step), field = ranges
+            if rate_from > rate_to or years_from > years_to:
+                raise InvalidInputError("Each range must start at or below its end.")
+
+            rates = np.arange(rate_from, rate_to + rate_step / 2, rate_step)
+            years = np.arange(years_from, years_to + 1, years_step)
+            sweep_result = sweep(rates, years, loan_amount)
+            self.create_sweep_heatmap(sweep_result, field).show()
+
+        except InvalidInputError as e:
+            QMessageBox.critical(self, "Input Error", str(e))
+        except Exception as e:
+            QMessageBox.critical(self, "Unexpected Error", f"An unexpected error occurred: {e}")
+
+    def _ask_sweep_ranges(self):
+        """Shows the sweep range dialog; returns ((rate range), (term range), field) or None if cancelled."""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Scenario Sweep")
+        form = QFormLayout(dialog)
+
+        current_rate = float(self.rate.text()) if self.rate.text() else 5.0
+        current_years = int(self.years.text()) if self.years.text() else 30
+
+        def spin_box(minimum, maximum, value, step, decimals=2):
+            box = QDoubleSpinBox(dialog) if decimals else QSpinBox(dialog)
+            if decimals:
+                box.setDecimals(decimals)
+            box.setRange(minimum, maximum)
+            box.setSingleStep(step)
+            box.setValue(value)
+            return box
+
+        rate_from = spin_box(0, 100, max(0.0, current_rate - 2), 0.25)
+        rate_to = spin_box(0, 100, current_rate + 2, 0.25)
+        rate_step = spin_box(0.01, 10, 0.25, 0.05)
+        years_from = spin_box(1, 100, max(1, current_years - 15), 1, decimals=0)
+        years_to = spin_box(1, 100, min(100, current_years + 10), 1, decimals=0)
+        years_step = spin_box(1, 50, 1, 1, decimals=0)
+        field = QComboBox(dialog)
+        field.addItems([name.replace("_", " ").title() for name in SWEEP_FIELDS])
+
+        form.addRow("Rate From (%)", rate_from)
+        form.addRow("Rate To (%)", rate_to)
+        form.addRow("Rate Step (%)", rate_step)
+        form.addRow("Term From (Years)", years_from)
+        form.addRow("Term To (Years)", years_to)
+        form.addRow("Term Step (Years)", years_step)
+        form.addRow("Show", field)
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, parent=dialog)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        form.addRow(buttons)
+
+        if dialog.exec_() != QDialog.Accepted:
+            return None
+        return ((rate_from.value(), rate_to.value(), rate_step.value()),
+                (years_from.value(), years_to.value(), years_step.value()),
+                SWEEP_FIELDS[field.currentIndex()])
+
+    def create_sweep_heatmap(self, sweep_result, field):
+        """Creates a Matplotlib heatmap of one sweep field over interest rate and loan term."""
+        import matplotlib.pyplot as plt  # Imported on first use to keep start-up fast
+
+        title = field.replace("_", " ").title()
         plt.figure(figsize=(10, 6))
-        plt.plot(amortization_data['Principal'], label='Principal', color='blue')
-        plt.plot(amortization_data['Interest'], label='Interest', color='red')
-        plt.ylabel('Amount') 
-        plt.xlabel('Months')
-        plt.title('Loan Payment Breakdown: Principal vs Interest')
-        plt.legend()
-        plt.grid(True)
+        mesh = plt.pcolormesh(sweep_result['number_of_years'], sweep_result['annual_interest_rate'],
+                              sweep_result[field][:, :, 0], shading='nearest', cmap='viridis')
+        plt.colorbar(mesh, label=f"{title} ({self.currency_symbol})")
+        plt.xlabel('Loan Term (Years)')
+        plt.ylabel('Annual Interest Rate (%)')
+        plt.title(f"{title} for a Loan of {self.currency_symbol} {sweep_result['loan_amount'][0]:,.2f}")
         plt.tight_layout()
-        return plt 
+        return plt
 
     def save_dialog(self):
         """Opens a dialog to choose the file type and save the results."""
@@ -490,70 +664,131 @@ class LoanCalculator(QMainWindow):
         if df is None:
             return
 
-        save_type, ok = QInputDialog.getItem(self, "Save As", "Choose file type:", ["PDF", "CSV"], 0, False)
+        save_type, ok = QInputDialog.getItem(self, "Save As", "Choose file type:", ["PDF", "CSV", "Parquet / Arrow"],
+                                             0, False)
 
         if ok:
             if save_type == "PDF":
                 self.save_pdf(df)
             elif save_type == "CSV":
                 self.save_csv(df)
+            else:
+                self.save_arrow(df)
 
+    @instrumented("save_csv", rows=lambda args, result: len(args[1]))
     def save_csv(self, df):
-        filename, _ = QFileDialog.getSaveFileName(self, "Save Amortization Table", "", "CSV Files (*.csv)")
+        """Streams the amortization schedule to a CSV file, optionally gzip-compressed."""
+        filename, _ = QFileDialog.getSaveFileName(self, "Save Amortization Table", "",
+                                                  "CSV Files (*.csv);;Gzipped CSV Files (*.csv.gz)")
         if filename:
             try:
-                df = df.round(2)  # Round all numerical columns to two decimal places
-                df.to_csv(filename, index=False, float_format='%.2f') #Format all float numbers to two decimal places
+                write_schedule_csv(filename, df)  # Formats floats to two decimal places chunk by chunk
 
                 QMessageBox.information(self, "Success", f"Amortization schedule saved to {filename}")
 
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error saving CSV: {e}")
 
+    @instrumented("save_pdf", rows=lambda args, result: len(args[1]))
     def save_pdf(self, df):
-        """Saves the amortization schedule to a PDF file with dynamically adjusted column widths and formatted numbers."""
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", size=12)
-        pdf.cell(200, 10, txt="Amortization Schedule", ln=1, align="C")
-
-        col_widths = []
-        line_height = pdf.font_size * 2.5
-
-        # Calculate maximum column widths, formatting numerical values to two decimal places
-        for col in df.columns:
-            max_width = pdf.get_string_width(str(col))  # Use column names for width calculation
-            for value in df[col]:
-                formatted_value = f"{value:.2f}" if isinstance(value, (int, float)) else str(value) #  Limit numbers to 2 decimal places
-                max_width = max(max_width, pdf.get_string_width(formatted_value))
-            col_widths.append(max_width + 6)
-
-        # Write header row
-        x_pos = 10  # Start x position
-        for i, col in enumerate(df.columns):
-            pdf.cell(col_widths[i], line_height, txt=col, border=1)
-            x_pos += col_widths[i]
-        pdf.ln(line_height)
-
-        # Write data rows, formatting numerical values to two decimal places
-        x_pos = 10
-        for row in df.itertuples(index=False):
-            for i, datum in enumerate(row):
-                formatted_datum = f"{datum:.2f}" if isinstance(datum, (int, float)) else str(datum)  # Format numerical values to 2 decimal places if number.
-                pdf.cell(col_widths[i], line_height, txt=formatted_datum, border=1)  # Use the formatted value
-                x_pos += col_widths[i]
-            pdf.ln(line_height)
-            x_pos = 10
-
+        """Saves the amortization schedule to a paginated PDF report once a file name has been chosen."""
         pdf_filename, _ = QFileDialog.getSaveFileName(self, "Save Amortization Table as PDF", "", "PDF Files (*.pdf)")
         if pdf_filename:
             try:
-                pdf.output(pdf_filename)
+                write_schedule_pdf(pdf_filename, df)
                 QMessageBox.information(self, "Success", f"Amortization schedule saved to {pdf_filename}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error saving PDF: {e}")
 
-app = QApplication(sys.argv)
-window = LoanCalculator()
-window.calculation_finished.connect(window.update_output_fields)  
-sys.exit(app.exec_())
\ No newline at end of file
+    @instrumented("save_arrow", rows=lambda args, result: len(args[1]))
+    def save_arrow(self, df):
+        """Saves the amortization schedule to a Parquet or Arrow/Feather file for analytics tools."""
+        filename, selected_filter = QFileDialog.getSaveFileName(
+            self, "Save Amortization Table", "", "Parquet Files (*.parquet);;Arrow/Feather Files (*.arrow *.feather)")
+        if filename:
+            if not filename.lower().endswith(tuple(COLUMNAR_SUFFIXES)):
+                filename += ".parquet" if "Parquet" in selected_filter else ".arrow"
+            try:
+                write_schedule_arrow(filename, df)
+                QMessageBox.information(self, "Success", f"Amortization schedule saved to {filename}")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Error saving file: {e}")
+
+    @instrumented("open_schedule", rows=lambda args, result: schedule_rows(args[0].amortization_data))
+    def open_schedule(self):
+        """
+        Reopens a schedule saved as Arrow/Feather or Parquet so it can be viewed in the table and graph.
+        Arrow files are memory-mapped rather than read into memory; the inputs are cleared because
+        they no longer describe the results shown.
+        """
+        filename, _ = QFileDialog.getOpenFileName(self, "Open Amortization Schedule", "",
+                                                  "Schedule Files (*.arrow *.feather *.parquet);;All Files (*)")
+        if not filename:
+            return
+        try:
+            df = read_schedule_arrow(filename)
+            missing = [column for column in SCHEDULE_COLUMNS if column not in df.columns]
+            if missing:
+                raise ValueError(f"{filename} is not an amortization schedule (missing {', '.join(missing)}).")
+            months = df['Month'].to_numpy()
+            # Summed over every loan in the file for multi-loan schedules
+            monthly_payment = df['Current Payment'].to_numpy()[months == months.min()].sum() if len(df) else 0.0
+            total_payment = df['Interest'].to_numpy().sum() + df['Principal'].to_numpy().sum()
+        except (ImportError, OSError, ValueError) as e:
+            QMessageBox.critical(self, "Open Error", f"Error opening schedule: {e}")
+            return
+        except Exception as e:
+            QMessageBox.critical(self, "Unexpected Error", f"An unexpected error occurred: {e}")
+            return
+
+        self._cancel_active_worker()
+        self.preview_timer.stop()
+        self.rate.clear()
+        self.years.clear()
+        self.amount.clear()
+        self.amortization_data = amortization.create_amortization_data(
+            monthly_payment, total_payment, df['Interest Rate (%)'].to_numpy(), df)
+        self.progress_bar.setValue(100)
+        if self.chart is not None and self.chart.isVisible():
+            self.chart.set_schedule(df)
+        self.calculation_finished.emit(self.amortization_data['monthly_payment'],
+                                       self.amortization_data['total_payment'])
+
+    @instrumented("add_scenario", rows=lambda args, result: len(args[0].scenarios))
+    def add_scenario(self):
+        """Adds the loan described by the current inputs to the scenario comparison, computing only that loan."""
+        try:
+            loan_amount, annual_interest_rate, number_of_years = self._read_inputs()
+            engine, rounding = PRECISION_MODES[self.precision.currentText()]
+            detail = self.precision.currentText() if self.precision.currentIndex() != 0 else None
+            name = scenario_label(loan_amount, annual_interest_rate, number_of_years, self.currency_symbol, detail)
+            self.scenarios.add(loan_amount, annual_interest_rate, number_of_years, self.currency.currentText(),
+                               rounding, engine, name)
+        except (InvalidInputError, CalculationError, ValueError) as e:
+            QMessageBox.warning(self, "Invalid Input", f"Error: {e}")
+            return
+        except Exception as e:
+            QMessageBox.critical(self, "Unexpected Error", f"An unexpected error occurred: {e}")
+            return
+        self.show_comparison()
+
+    def show_comparison(self):
+        """Shows the scenario comparison window, creating it on first use and updating it in place."""
+        if self.comparison_dialog is None:
+            from comparison_widget import ScenarioComparison  # Imported on first use to keep start-up fast
+
+            self.comparison_dialog = QDialog(self)
+            self.comparison_dialog.setWindowTitle("Scenario Comparison")
+            layout = QVBoxLayout(self.comparison_dialog)
+            self.comparison_dialog.comparison = ScenarioComparison(self.scenarios, self.comparison_dialog)
+            layout.addWidget(self.comparison_dialog.comparison)
+            self.comparison_dialog.resize(CHART_WIDTH + 200, 700)
+        self.comparison_dialog.comparison.sync()
+        self.comparison_dialog.show()
+        self.comparison_dialog.raise_()
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    window = LoanCalculator()
+    window.calculation_finished.connect(window.update_output_fields)  
+    sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""
+Path-dependent amortization for many loans at once.
+Payment caps, negative amortization and per-period rounding to cents make each month depend on
+the last, so these schedules are stepped month by month instead of solved in closed form. The
+recurrence runs as a Numba kernel in parallel across loans when Numba is installed, and as a
+NumPy loop over months, vectorized across loans, when it is not.
+"""
+import importlib.util
+
+import numpy as np
+
+from amortization import InvalidInputError, _monthly_rates
+
+# Calculation engines
+ENGINE_NUMBA = "numba"
+ENGINE_NUMPY = "numpy"
+
+# Replaced by numba.prange when the kernel is compiled; both behave like range when it runs uncompiled
+prange = range
+
+_compiled_kernel = None
+
+
+def numba_available():
+    """Returns True if the optional numba package is installed."""
+    return importlib.util.find_spec("numba") is not None
+
+
+def _round_cents(amounts):
+    """
+    Rounds amounts half-up to cents with the kernel's floor(x * 100 + 0.5) arithmetic, so both engines agree.
+    Unlike portfolio.round_half_up_cents(), amounts within a few ulps of a half cent are not re-rounded exactly.
+    """
+    return np.floor(amounts * 100.0 + 0.5) / 100.0
+
+
+def _amortize_loans(loan_amounts, monthly_rates, numbers_of_months, payment_caps, balance_limits, round_to_cents,
+                    payments, interest, principal, remaining_balance):
+    """
+    Steps every loan through its months, filling the (loans x months) output arrays in place.
+    Written in the subset of Python that Numba compiles; each loan is independent, so the outer
+    loop runs in parallel once compiled.
+    """
+    for loan in prange(loan_amounts.shape[0]):
+        balance = loan_amounts[loan]
+        number_of_months = numbers_of_months[loan]
+        payment = 0.0
+        rate = 0.0
+        recast = True  # The first payment, and any forced by the negative amortization limit, is uncapped
+        for month in range(number_of_months):
+            rate_now = monthly_rates[loan, month]
+            if recast or rate_now != rate:
+                remaining = number_of_months - month
+                target = 0.0
+                if balance > 0 and rate_now == 0:
+                    target = balance / remaining
+                elif balance > 0:
+                    factor = (1.0 + rate_now) ** float(remaining)
+                    target = balance * rate_now * factor / (factor - 1.0)
+                target = np.floor(target * 100.0 + 0.5) / 100.0
+                cap = payment_caps[loan]
+                if not recast and np.isfinite(cap):
+                    lower = np.floor(payment * (1.0 - cap) * 100.0 + 0.5) / 100.0
+                    upper = np.floor(payment * (1.0 + cap) * 100.0 + 0.5) / 100.0
+                    target = min(max(target, lower), upper)
+                payment = target
+                rate = rate_now
+                recast = False
+
+            month_interest = balance * rate_now
+            if round_to_cents:
+                month_interest = np.floor(month_interest * 100.0 + 0.5) / 100.0
+            due = balance + month_interest
+            paid = due if month == number_of_months - 1 else min(payment, due)
+            payments[loan, month] = paid
+            interest[loan, month] = month_interest
+            principal[loan, month] = paid - month_interest
+            remaining_balance[loan, month] = balance
+            balance = due - paid
+            if round_to_cents:
+                balance = np.floor(balance * 100.0 + 0.5) / 100.0
+            if balance > balance_limits[loan]:
+                recast = True
+        if number_of_months > 0:
+            remaining_balance[loan, number_of_months - 1] = 0.0
+
+
+def _amortize_loans_numpy(loan_amounts, monthly_rates, numbers_of_months, payment_caps, balance_limits,
+                          round_to_cents, payments, interest, principal, remaining_balance):
+    """
+    Runs the same recurrence as _amortize_loans() with one vectorized step per month across all loans,
+    filling the output arrays in place.
+    """
+    balance = loan_amounts.copy()
+    payment = np.zeros(len(loan_amounts))
+    rate = np.zeros(len(loan_amounts))
+    recast = np.ones(len(loan_amounts), dtype=bool)
+    capped_loans = np.isfinite(payment_caps)
+    for month in range(monthly_rates.shape[1]):
+        active = month < numbers_of_months
+        rate_now = monthly_rates[:, month]
+        reset = active & (recast | (rate_now != rate))
+        if reset.any():
+            remaining = np.maximum(numbers_of_months - month, 1)
+            safe_rate = np.where(rate_now == 0, 1.0, rate_now)
+            with np.errstate(over="ignore", invalid="ignore", divide="ignore"):  # Placeholders are discarded
+                factor = (1.0 + safe_rate) ** remaining.astype(float)
+                target = np.where(rate_now == 0, balance / remaining, balance * safe_rate * factor / (factor - 1.0))
+                target = _round_cents(np.where(balance > 0, target, 0.0))
+                lower = _round_cents(payment * (1.0 - payment_caps))
+                upper = _round_cents(payment * (1.0 + payment_caps))
+            capped = reset & ~recast & capped_loans
+            target = np.where(capped, np.minimum(np.maximum(target, lower), upper), target)
+            payment = np.where(reset, target, payment)
+            rate = np.where(reset, rate_now, rate)
+            recast &= ~reset
+
+        month_interest = balance * rate_now
+        if round_to_cents:
+            month_interest = _round_cents(month_interest)
+        due = balance + month_interest
+        paid = np.where(month == numbers_of_months - 1, due, np.minimum(payment, due))
+        payments[active, month] = paid[active]
+        interest[active, month] = month_interest[active]
+        principal[active, month] = (paid - month_interest)[active]
+        remaining_balance[active, month] = balance[active]
+        closing = due - paid
+        if round_to_cents:
+            closing = _round_cents(closing)
+        balance = np.where(active, closing, balance)
+        recast |= active & (balance > balance_limits)
+
+    loans = np.flatnonzero(numbers_of_months > 0)
+    remaining_balance[loans, numbers_of_months[loans] - 1] = 0.0
+
+
+def _numba_kernel():
+    """Compiles _amortize_loans() with Numba on first use, parallelizing the loop over loans."""
+    global _compiled_kernel, prange
+    if _compiled_kernel is None:
+        import numba  # Imported on first use; compiling takes a few seconds unless the on-disk cache is warm
+
+        prange = numba.prange
+        _compiled_kernel = numba.njit(parallel=True, cache=True)(_amortize_loans)
+    return _compiled_kernel
+
+
+def amortize_path_dependent(loan_amounts, interest_rates, numbers_of_months=None, payment_cap=None,
+                            negative_amortization_limit=None, round_to_cents=True, engine=None):
+    """
+    Amortizes many loans whose schedules depend on their own history.
+
+    interest_rates is a (loans x months) array of annual rates (%), or one loan's per-month rates;
+    loans shorter than the widest term give their months in numbers_of_months (default: all).
+    The payment is re-amortized over the remaining term at the start and whenever the rate
+    changes, rounded to cents. payment_cap limits each rate-driven change to that fraction of the
+    previous payment, e.g. 0.075, so a capped payment may not cover the interest and the unpaid
+    interest is added to the balance. Once the balance exceeds negative_amortization_limit times
+    the loan amount, e.g. 1.10, the next payment is re-amortized without the cap. With
+    round_to_cents, every month's interest and balance are rounded to cents. The last payment
+    clears the balance. payment_cap and negative_amortization_limit may be per-loan arrays;
+    None disables them.
+
+    engine is ENGINE_NUMBA or ENGINE_NUMPY; by default Numba is used when it is installed.
+    Returns a dictionary of padded (loans x months) arrays "payment", "interest", "principal" and
+    "remaining_balance" (the opening balance, zero in the last month, as in amortize()), the
+    "mask" of months that belong to each loan, per-loan "number_of_months", "total_payment" and
+    "total_interest", and the "engine" used.
+    """
+    interest_rates = np.asarray(interest_rates, dtype=float)
+    if interest_rates.ndim == 1:
+        interest_rates = interest_rates[None, :]
+    number_of_loans, max_months = interest_rates.shape
+    loan_amounts = np.broadcast_to(np.asarray(loan_amounts, dtype=float), (number_of_loans,)).copy()
+    if numbers_of_months is None:
+        numbers_of_months = max_months
+    numbers_of_months = np.broadcast_to(np.asarray(numbers_of_months, dtype=np.int64), (number_of_loans,)).copy()
+    payment_caps = np.broadcast_to(np.asarray(np.inf if payment_cap is None else payment_cap, dtype=float),
+                                   (number_of_loans,)).copy()
+    limits = np.asarray(np.inf if negative_amortization_limit is None else negative_amortization_limit, dtype=float)
+    balance_limits = loan_amounts * np.broadcast_to(limits, (number_of_loans,))
+
+    if np.any(loan_amounts < 0) or np.any(numbers_of_months < 0) or np.any(numbers_of_months > max_months):
+        raise InvalidInputError("Loan amounts must be non-negative and terms must fit the rate paths.")
+    if np.any(payment_caps < 0) or np.any(limits < 1):
+        raise InvalidInputError("Payment caps must be non-negative and negative amortization limits at least 1.")
+    if engine is None:
+        engine = ENGINE_NUMBA if numba_available() else ENGINE_NUMPY
+    if engine not in (ENGINE_NUMBA, ENGINE_NUMPY):
+        raise InvalidInputError(f"Unknown engine: {engine}")
+
+    monthly_rates = np.ascontiguousarray(_monthly_rates(interest_rates))
+    payments, interest, principal, remaining_balance = (np.zeros((number_of_loans, max_months)) for _ in range(4))
+    kernel = _numba_kernel() if engine == ENGINE_NUMBA else _amortize_loans_numpy
+    kernel(loan_amounts, monthly_rates, numbers_of_months, payment_caps, balance_limits, bool(round_to_cents),
+           payments, interest, principal, remaining_balance)
+
+    return {
+        "payment": payments,
+        "interest": interest,
+        "principal": principal,
+        "remaining_balance": remaining_balance,
+        "mask": np.arange(max_months) < numbers_of_months[:, None],
+        "number_of_months": numbers_of_months,
+        "total_payment": payments.sum(axis=1),
+        "total_interest": interest.sum(axis=1),
+        "engine": engine,
+    }
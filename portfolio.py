@@ -0,0 +1,156 @@
+"""
+Batch amortization for whole loan books.
+Computes payments and schedules for many loans at once as padded (loans x months) arrays.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+
+from amortization import (CLOSED_FORM_TOLERANCE, MONTHS_IN_YEAR, _fixed_rate_balances, _monthly_rates,
+                          _sequential_balances)
+
+# Number of loans amortized per block when iterating over a large portfolio
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Distance from a half cent, relative to the amount, within which x * 100 may have rounded across it
+HALF_CENT_MARGIN = 8 * np.finfo(float).eps
+
+
+def _as_loan_arrays(loan_amounts, annual_interest_rates, numbers_of_years):
+    """Broadcasts the per-loan inputs to flat arrays of equal length."""
+    loan_amounts, annual_interest_rates, numbers_of_years = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(loan_amounts, dtype=float)),
+        np.atleast_1d(np.asarray(annual_interest_rates, dtype=float)),
+        np.atleast_1d(np.asarray(numbers_of_years, dtype=np.int64)),
+    )
+    if np.any(numbers_of_years <= 0):
+        raise ValueError("Loan terms must be positive.")
+    return loan_amounts, annual_interest_rates, numbers_of_years
+
+
+def round_half_up_cents(amounts):
+    """
+    Rounds amounts half-up to cents exactly as Decimal.quantize(ROUND_HALF_UP) does on their binary values.
+    floor(x * 100 + 0.5) can be off by a cent when x * 100 rounds across the half-cent point, so
+    amounts that land within rounding distance of a half cent are re-rounded with Decimal.
+    """
+    amounts = np.asarray(amounts, dtype=float)
+    scaled = amounts * 100
+    cents = np.floor(scaled + 0.5)
+    with np.errstate(invalid="ignore"):
+        # x * 100 is within a few ulps of x's exact value, so only amounts that close to a half cent can differ
+        near_half = np.abs(scaled - cents) >= 0.5 - HALF_CENT_MARGIN * np.abs(scaled)
+    for index in zip(*np.nonzero(near_half)):
+        exact = Decimal(float(amounts[index])).quantize(Decimal("0.01"), ROUND_HALF_UP)
+        cents[index] = float(exact.scaleb(2))
+    return cents / 100
+
+
+def calculate_monthly_payments(loan_amounts, annual_interest_rates, numbers_of_years):
+    """
+    Calculates the monthly payment of every loan in one vectorized pass.
+    Payments are rounded half-up to cents, except for interest-free loans which are
+    split evenly across the term, matching the single-loan calculation.
+    """
+    loan_amounts, annual_interest_rates, numbers_of_years = _as_loan_arrays(
+        loan_amounts, annual_interest_rates, numbers_of_years)
+    number_of_months = numbers_of_years * MONTHS_IN_YEAR
+    monthly_rates = _monthly_rates(annual_interest_rates)
+
+    interest_bearing = monthly_rates != 0
+    safe_rates = np.where(interest_bearing, monthly_rates, 1.0)
+    with np.errstate(over="ignore", invalid="ignore"):  # Placeholder rates are discarded below
+        factor = np.power(1 + safe_rates, number_of_months)
+        annuity_payments = (loan_amounts * safe_rates * factor) / (factor - 1)
+    annuity_payments = round_half_up_cents(annuity_payments)
+    return np.where(interest_bearing, annuity_payments, loan_amounts / number_of_months)
+
+
+def amortize_portfolio(loan_amounts, annual_interest_rates, numbers_of_years):
+    """
+    Amortizes a batch of fixed-rate loans with one broadcast computation.
+
+    Returns a dictionary of per-loan values ("annual_interest_rate", "monthly_payment",
+    "total_payment", "number_of_months") and padded (loans x months) schedule arrays ("interest",
+    "principal", "remaining_balance"). Loans shorter than the longest term are padded
+    with zeros; the boolean "mask" array marks the months that belong to each loan.
+    """
+    loan_amounts, annual_interest_rates, numbers_of_years = _as_loan_arrays(
+        loan_amounts, annual_interest_rates, numbers_of_years)
+    monthly_payments = calculate_monthly_payments(loan_amounts, annual_interest_rates, numbers_of_years)
+    number_of_months = numbers_of_years * MONTHS_IN_YEAR
+    monthly_rates = _monthly_rates(annual_interest_rates)[:, None]
+
+    months = np.arange(number_of_months.max() if number_of_months.size else 0)
+    mask = months < number_of_months[:, None]
+    balance = _fixed_rate_balances(loan_amounts[:, None], monthly_payments[:, None], monthly_rates, months)
+
+    # Loans whose closed form would lose cents are stepped month by month instead, as amortize() does
+    with np.errstate(over="ignore"):
+        closed_form_error = (np.finfo(float).eps * np.maximum(np.abs(loan_amounts), np.abs(monthly_payments))
+                             * np.exp(number_of_months * np.log1p(monthly_rates[:, 0])))
+    for loan in np.flatnonzero(closed_form_error > CLOSED_FORM_TOLERANCE):
+        term = number_of_months[loan]
+        balance[loan, :term] = _sequential_balances(loan_amounts[loan], np.full(term, monthly_payments[loan]),
+                                                    np.full(term, monthly_rates[loan, 0]))
+
+    # Once a payment would overshoot the balance the loan is paid off and stays at zero
+    overshoot = (balance[:, 1:] < 0) & mask[:, 1:]
+    balance[:, 1:][np.logical_or.accumulate(overshoot, axis=1)] = 0
+    balance[~mask] = 0
+
+    interest = balance * monthly_rates
+    principal = np.minimum(monthly_payments[:, None] - interest, balance)
+    principal[~mask] = 0
+
+    # Last payment of each loan ensures a zero remaining balance
+    loans = np.arange(len(loan_amounts))
+    last_month = number_of_months - 1
+    principal[loans, last_month] = balance[loans, last_month]
+    balance[loans, last_month] = 0
+
+    return {
+        "annual_interest_rate": annual_interest_rates,
+        "monthly_payment": monthly_payments,
+        "total_payment": monthly_payments * number_of_months,
+        "number_of_months": number_of_months,
+        "mask": mask,
+        "interest": interest,
+        "principal": principal,
+        "remaining_balance": balance,
+    }
+
+
+def iter_portfolio_schedules(loan_amounts, annual_interest_rates, numbers_of_years, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Amortizes a large portfolio in blocks of at most chunk_size loans.
+    Yields (first_loan_index, result) pairs, where result is an amortize_portfolio dictionary,
+    so memory stays bounded by the block size rather than the size of the loan book.
+    """
+    loan_amounts, annual_interest_rates, numbers_of_years = _as_loan_arrays(
+        loan_amounts, annual_interest_rates, numbers_of_years)
+    for start in range(0, len(loan_amounts), chunk_size):
+        stop = start + chunk_size
+        yield start, amortize_portfolio(loan_amounts[start:stop], annual_interest_rates[start:stop],
+                                        numbers_of_years[start:stop])
+
+
+def to_long_format(result, first_loan_index=0):
+    """
+    Converts an amortize_portfolio result into a long-format Pandas DataFrame.
+    Produces one row per loan and month using the same columns as the single-loan schedule,
+    plus a leading "Loan" column; padded months are dropped.
+    """
+    import pandas as pd
+
+    mask = result["mask"]
+    loan_index, month_index = np.nonzero(mask)
+    return pd.DataFrame({
+        "Loan": loan_index + first_loan_index,
+        "Month": month_index + 1,
+        "Interest Rate (%)": result["annual_interest_rate"][loan_index],
+        "Current Payment": result["monthly_payment"][loan_index],
+        "Interest": result["interest"][mask],
+        "Principal": result["principal"][mask],
+        "Remaining Balance": result["remaining_balance"][mask],
+    })
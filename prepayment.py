@@ -0,0 +1,159 @@
+"""
+Extra-payment and prepayment modeling for fixed-rate loans.
+Supports recurring extra principal, one-off lump sums and an accelerated biweekly cadence, and
+finds the payoff month of many prepayment strategies at once from closed-form balances.
+"""
+from decimal import ROUND_HALF_UP
+
+import numpy as np
+
+from amortization import (CLOSED_FORM_TOLERANCE, MONTHS_IN_YEAR, InvalidInputError, _closed_form_error,
+                          _fixed_rate_balances, calculate_monthly_payment, create_amortization_data,
+                          create_amortization_schedule)
+
+# Payment cadences
+CADENCE_MONTHLY = "monthly"
+CADENCE_BIWEEKLY = "biweekly"
+
+# A balance at or below half a cent counts as paid off
+PAYOFF_TOLERANCE = 0.005
+
+
+def build_extra_payments(number_of_months, extra_monthly=0.0, lump_sums=None, extra_start_month=1):
+    """
+    Creates a per-month array of extra principal payments.
+    extra_monthly is paid every month from extra_start_month (1-based) on; lump_sums maps the
+    1-based month of a one-off payment to its amount, e.g. {12: 5000}.
+    """
+    if extra_monthly < 0 or any(amount < 0 for amount in dict(lump_sums or {}).values()):
+        raise InvalidInputError("Extra payments cannot be negative.")
+    if not 1 <= extra_start_month <= number_of_months:
+        raise InvalidInputError(f"Extra payment start month {extra_start_month} is outside the loan term.")
+    extra_payments = np.zeros(number_of_months)
+    extra_payments[extra_start_month - 1:] = float(extra_monthly)
+    for month, amount in dict(lump_sums or {}).items():
+        if not 1 <= month <= number_of_months:
+            raise InvalidInputError(f"Lump sum month {month} is outside the loan term.")
+        extra_payments[month - 1] += float(amount)
+    return extra_payments
+
+
+def _prepaid_balances(loan_amount, monthly_payment, monthly_interest_rate, extra_payments):
+    """
+    Returns the opening balance of months 0..n for each row of a (strategies x months) extra-payment array.
+    Extra principal paid in month j lowers every later balance B_k by extra_j * (1 + r)^(k - 1 - j), so
+    it is superposed on the closed-form scheduled balance without stepping through the months.
+    Falls back to stepping when the closed form would lose cents, as amortization.amortize() does.
+    """
+    number_of_months = extra_payments.shape[1]
+    monthly_rates = np.full(number_of_months, float(monthly_interest_rate))
+    largest_payments = monthly_payment + extra_payments.max(axis=0, initial=0.0)
+    if _closed_form_error(loan_amount, largest_payments, monthly_rates) > CLOSED_FORM_TOLERANCE:
+        return _stepped_prepaid_balances(loan_amount, monthly_payment, monthly_interest_rate, extra_payments)
+    months = np.arange(number_of_months + 1, dtype=float)
+    scheduled = _fixed_rate_balances(loan_amount, monthly_payment, monthly_interest_rate, months)
+    with np.errstate(over="ignore"):
+        growth = np.exp(months * np.log1p(monthly_interest_rate))  # (1 + r)^k
+    discounted = np.cumsum(extra_payments / growth[1:], axis=1)
+    return scheduled - growth * np.concatenate((np.zeros((len(extra_payments), 1)), discounted), axis=1)
+
+
+def _stepped_prepaid_balances(loan_amount, monthly_payment, monthly_interest_rate, extra_payments):
+    """
+    Returns the same balances as _prepaid_balances() by stepping B_{k+1} = B_k - (M + extra_k - B_k * r),
+    one month at a time for all strategies at once.
+    """
+    number_of_months = extra_payments.shape[1]
+    balances = np.empty((len(extra_payments), number_of_months + 1))
+    balances[:, 0] = loan_amount
+    for month in range(number_of_months):
+        current = balances[:, month]
+        payments = monthly_payment + extra_payments[:, month]
+        balances[:, month + 1] = current - (payments - current * monthly_interest_rate)
+    return balances
+
+
+def _payoff_months(balances):
+    """Returns the 1-based payoff month of each row: the first month whose closing balance is paid off."""
+    paid_off = balances[:, 1:] <= PAYOFF_TOLERANCE
+    paid_off[:, -1] = True  # The last scheduled payment always clears the balance
+    return np.argmax(paid_off, axis=1) + 1
+
+
+def _extra_payment_rows(extra_payments, number_of_months):
+    """Validates extra payments and returns them as a 2-D (strategies x months) float array."""
+    extra_payments = np.atleast_2d(np.asarray(extra_payments, dtype=float))
+    if extra_payments.shape[1] != number_of_months:
+        raise InvalidInputError(f"Extra payments must cover all {number_of_months} months of the loan term.")
+    if np.any(extra_payments < 0):
+        raise InvalidInputError("Extra payments cannot be negative.")
+    return extra_payments
+
+
+def compare_prepayments(loan_amount, annual_interest_rate, number_of_years, extra_payments, cadence=CADENCE_MONTHLY,
+                        rounding=ROUND_HALF_UP):
+    """
+    Evaluates many prepayment strategies in one vectorized pass.
+
+    extra_payments is a (strategies x months) array of extra principal per month. Returns a
+    dictionary of per-strategy arrays "payoff_month", "months_saved", "total_interest" and
+    "interest_saved", each measured against the loan without prepayments, plus the scalar
+    "monthly_payment".
+    """
+    number_of_months = number_of_years * MONTHS_IN_YEAR
+    monthly_interest_rate = annual_interest_rate / (MONTHS_IN_YEAR * 100)
+    monthly_payment = float(calculate_monthly_payment(loan_amount, monthly_interest_rate, number_of_months, rounding))
+    extra_payments = _extra_payment_rows(extra_payments, number_of_months)
+    if cadence == CADENCE_BIWEEKLY:
+        extra_payments = extra_payments + round(monthly_payment / MONTHS_IN_YEAR, 2)
+    elif cadence != CADENCE_MONTHLY:
+        raise InvalidInputError(f"Unknown payment cadence: {cadence}")
+
+    # Row 0 is the loan without prepayments, the reference for months and interest saved
+    strategies = np.vstack((np.zeros(number_of_months), extra_payments))
+    balances = _prepaid_balances(loan_amount, monthly_payment, monthly_interest_rate, strategies)
+    payoff_month = _payoff_months(balances)
+    before_payoff = np.arange(number_of_months) < payoff_month[:, None]
+    total_interest = np.where(before_payoff, balances[:, :-1], 0).sum(axis=1) * monthly_interest_rate
+    return {
+        "monthly_payment": monthly_payment,
+        "payoff_month": payoff_month[1:],
+        "months_saved": payoff_month[0] - payoff_month[1:],
+        "total_interest": total_interest[1:],
+        "interest_saved": total_interest[0] - total_interest[1:],
+    }
+
+
+def calculate_prepayment_amortization(loan_amount, annual_interest_rate, number_of_years, extra_monthly=0.0,
+                                      lump_sums=None, extra_start_month=1, cadence=CADENCE_MONTHLY,
+                                      rounding=ROUND_HALF_UP):
+    """
+    Calculates a schedule with prepayments that stops at the payoff month.
+
+    Returns the same dictionary as amortization.calculate_amortization(), where Current Payment
+    is the scheduled payment plus that month's extra principal and the total payment is what is
+    actually paid, plus "payoff_month", "months_saved", "total_interest" and "interest_saved".
+    CADENCE_BIWEEKLY models half the monthly payment every two weeks as 13 monthly payments a
+    year, crediting the extra twelfth of a payment each month.
+    """
+    number_of_months = number_of_years * MONTHS_IN_YEAR
+    extra_payments = build_extra_payments(number_of_months, extra_monthly, lump_sums, extra_start_month)
+    comparison = compare_prepayments(loan_amount, annual_interest_rate, number_of_years, extra_payments, cadence,
+                                     rounding)
+    monthly_payment = comparison["monthly_payment"]
+    payoff_month = int(comparison["payoff_month"][0])
+    if cadence == CADENCE_BIWEEKLY:
+        extra_payments = extra_payments + round(monthly_payment / MONTHS_IN_YEAR, 2)
+
+    monthly_payments = monthly_payment + extra_payments[:payoff_month]
+    interest_rates = np.full(payoff_month, float(annual_interest_rate))
+    schedule = create_amortization_schedule(loan_amount, monthly_payments, interest_rates)
+    total_interest = float(schedule["Interest"].sum())
+
+    amortization_data = create_amortization_data(monthly_payment, loan_amount + total_interest, interest_rates,
+                                                 schedule)
+    amortization_data["payoff_month"] = payoff_month
+    amortization_data["months_saved"] = int(comparison["months_saved"][0])
+    amortization_data["total_interest"] = total_interest
+    amortization_data["interest_saved"] = float(comparison["interest_saved"][0])
+    return amortization_data
@@ -0,0 +1,160 @@
+"""
+Workspace of loan scenarios compared side by side.
+Each scenario keeps its compact, cache-backed Schedule and the few figures a comparison needs,
+derived once when it is added. Differences against the baseline are computed from those
+figures alone, so adding or removing a scenario never recomputes the others.
+"""
+from collections import OrderedDict
+from decimal import ROUND_HALF_UP
+
+import numpy as np
+
+from amortization import InvalidInputError, create_amortization_data
+from exact_money import ENGINE_FLOAT
+from schedule_cache import ScheduleCache, normalize_key
+
+# Figures compared between scenarios, in display order
+COMPARISON_FIELDS = ("monthly_payment", "total_interest", "total_payment", "payoff_month")
+
+# Outstanding balance, in currency units, below which a loan counts as paid off
+PAID_OFF_BALANCE = 0.005
+
+
+def scenario_label(loan_amount, annual_interest_rate, number_of_years, currency="USD", detail=None):
+    """
+    Returns a short default name for a scenario, e.g. "USD 250,000.00 at 5.25% over 30 years";
+    currency may be a code or a symbol, and detail is appended in parentheses when given.
+    """
+    label = f"{currency} {loan_amount:,.2f} at {annual_interest_rate:g}% over {number_of_years} years"
+    return f"{label} ({detail})" if detail else label
+
+
+def payoff_month(loan_amount, principal):
+    """Returns the first month, counted from 1, after which the balance has reached zero, or the term."""
+    closing_balances = loan_amount - np.cumsum(principal)
+    paid_off = np.flatnonzero(closing_balances < PAID_OFF_BALANCE)
+    return int(paid_off[0]) + 1 if paid_off.size else len(principal)
+
+
+class ScenarioWorkspace:
+    """
+    Ordered collection of computed loan scenarios with one of them as the comparison baseline.
+    Schedules come from a ScheduleCache, which can be shared with the rest of the application so
+    loans already calculated elsewhere are not computed again.
+    """
+
+    def __init__(self, cache=None):
+        """Initializes an empty workspace over the given schedule cache, or a private one."""
+        self.cache = ScheduleCache() if cache is None else cache
+        self._scenarios = OrderedDict()  # Cache key -> scenario dictionary, in the order added
+        self.baseline_key = None
+
+    def __len__(self):
+        """Returns the number of scenarios."""
+        return len(self._scenarios)
+
+    def __iter__(self):
+        """Iterates over the scenario dictionaries in the order they were added."""
+        return iter(list(self._scenarios.values()))
+
+    def __getitem__(self, key):
+        """Returns the scenario dictionary with the given key."""
+        return self._scenarios[key]
+
+    def __contains__(self, key):
+        """Returns True if a scenario with the given key is in the workspace."""
+        return key in self._scenarios
+
+    @property
+    def baseline(self):
+        """Returns the baseline scenario dictionary, or None when the workspace is empty."""
+        return self._scenarios.get(self.baseline_key)
+
+    def add(self, loan_amount, annual_interest_rate, number_of_years, currency="USD", rounding=ROUND_HALF_UP,
+            engine=ENGINE_FLOAT, name=None):
+        """
+        Adds a loan scenario, computing only its own schedule, and returns its dictionary.
+
+        The dictionary holds "key", "name", the loan inputs, "monthly_payment", "total_payment",
+        "total_interest", "payoff_month", the cached read-only "schedule" and its "balance" curve
+        (the balance after months 0..n). Adding a loan that is already in the workspace returns
+        the existing scenario. The first scenario added becomes the baseline.
+        """
+        key = normalize_key(loan_amount, annual_interest_rate, number_of_years, currency, rounding, engine)
+        if key in self._scenarios:
+            return self._scenarios[key]
+        if key[0] <= 0 or key[2] <= 0:
+            raise InvalidInputError("Scenarios need a positive loan amount and term.")
+
+        monthly_payment, total_payment, schedule = self.cache.get_schedule(*key)
+        total_interest = float(schedule["Interest"].sum())
+        balance = np.append(schedule["Remaining Balance"], 0.0)  # Opening balances, then the final zero
+        balance.setflags(write=False)
+        scenario = {
+            "key": key,
+            "name": name or scenario_label(key[0], key[1], key[2], currency),
+            "loan_amount": key[0],
+            "annual_interest_rate": key[1],
+            "number_of_years": key[2],
+            "currency": currency,
+            "monthly_payment": float(monthly_payment),
+            "total_payment": float(total_payment),
+            "total_interest": total_interest,
+            "payoff_month": payoff_month(key[0], schedule["Principal"]),
+            "schedule": schedule,
+            "balance": balance,
+        }
+        self._scenarios[key] = scenario
+        if self.baseline_key is None:
+            self.baseline_key = key
+        return scenario
+
+    def remove(self, key):
+        """Removes a scenario; when it was the baseline, the oldest remaining scenario takes its place."""
+        del self._scenarios[key]
+        if key == self.baseline_key:
+            self.baseline_key = next(iter(self._scenarios), None)
+
+    def set_baseline(self, key):
+        """Makes the scenario with the given key the one every other scenario is compared against."""
+        if key not in self._scenarios:
+            raise KeyError(key)
+        self.baseline_key = key
+
+    def clear(self):
+        """Removes every scenario; cached schedules stay in the schedule cache."""
+        self._scenarios.clear()
+        self.baseline_key = None
+
+    def differences(self, scenario):
+        """Returns each comparison field of a scenario minus the baseline's, e.g. {"total_interest": -1234.5}."""
+        baseline = self.baseline
+        if baseline is None:
+            return {field: 0 for field in COMPARISON_FIELDS}
+        return {field: scenario[field] - baseline[field] for field in COMPARISON_FIELDS}
+
+    def amortization_data(self, key):
+        """
+        Returns the amortization data dictionary of a scenario, as amortization.calculate_amortization() does.
+        The DataFrame is built over the scenario's stored schedule, so nothing is recomputed.
+        """
+        scenario = self._scenarios[key]
+        schedule = scenario["schedule"]
+        return create_amortization_data(scenario["monthly_payment"], scenario["total_payment"],
+                                        schedule["Interest Rate (%)"], schedule.to_pandas())
+
+    def comparison(self):
+        """
+        Returns the comparison as a DataFrame with one row per scenario: its name, the comparison
+        fields and a "<field>_difference" column against the baseline for each of them.
+        """
+        import pandas as pd
+
+        rows = []
+        for scenario in self:
+            row = {"name": scenario["name"]}
+            row.update({field: scenario[field] for field in COMPARISON_FIELDS})
+            row.update({f"{field}_difference": value for field, value in self.differences(scenario).items()})
+            rows.append(row)
+        columns = ["name", *COMPARISON_FIELDS, *(f"{field}_difference" for field in COMPARISON_FIELDS)]
+        return pd.DataFrame(rows, columns=columns)
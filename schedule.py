@@ -0,0 +1,119 @@
+"""
+Compact columnar representation of an amortization schedule.
+Stores only the columns that vary month to month; constant-per-run columns are run-length
+encoded and the month number is implicit.
+"""
+import numpy as np
+
+# Column order of an expanded schedule, matching amortization.create_amortization_columns()
+SCHEDULE_COLUMNS = ("Month", "Interest Rate (%)", "Current Payment", "Interest", "Principal", "Remaining Balance")
+VARYING_COLUMNS = ("Interest", "Principal", "Remaining Balance")
+RUN_LENGTH_COLUMNS = ("Interest Rate (%)", "Current Payment")
+
+# Storage precisions of the varying columns. The float engine's interest and balances carry fractions
+# of a cent that the table, chart and exports show unrounded, so its schedules stay float64; storing
+# them as cents would change every figure downstream. The cents engine's values are whole cents.
+PRECISION_EXACT = "exact"  # float64, returned as zero-copy views
+PRECISION_CENTS = "cents"  # Integer cents, int32 when every value fits and int64 otherwise
+
+
+def run_length_encode(values):
+    """Encodes an array as (run_values, run_starts), the value and first index of every run."""
+    values = np.asarray(values)
+    if values.size == 0:
+        return values[:0].copy(), np.zeros(0, dtype=np.int64)
+    run_starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+    return values[run_starts].copy(), run_starts
+
+
+def run_length_decode(run_values, run_starts, length):
+    """
+    Expands (run_values, run_starts) back to an array of the given length.
+    A single run is returned as a read-only broadcast view, so it costs no memory.
+    """
+    if len(run_values) == 1:
+        return np.broadcast_to(run_values[0], (length,))
+    run_lengths = np.diff(np.append(run_starts, length))
+    return np.repeat(run_values, run_lengths)
+
+
+def _to_cents(values):
+    """Rounds dollar amounts to integer cents, using int32 when every value fits."""
+    cents = np.rint(np.asarray(values, dtype=float) * 100)
+    int32 = np.iinfo(np.int32)
+    fits = cents.size == 0 or (cents.min() >= int32.min and cents.max() <= int32.max)
+    return cents.astype(np.int32 if fits else np.int64)
+
+
+class Schedule:
+    """
+    Lightweight amortization schedule storing only its varying columns.
+    Interest, Principal and Remaining Balance are kept as float64 (PRECISION_EXACT) or integer
+    cents (PRECISION_CENTS); Interest Rate (%) and Current Payment are run-length encoded and
+    Month is implicit. Columns are exposed read-only through to_numpy() and to_pandas().
+    """
+
+    __slots__ = ("precision", "_length", "_varying", "_runs")
+
+    def __init__(self, interest, principal, remaining_balance, interest_rates, monthly_payments,
+                 precision=PRECISION_EXACT):
+        """Initializes a schedule from full-length column arrays, compacting them for storage."""
+        if precision not in (PRECISION_EXACT, PRECISION_CENTS):
+            raise ValueError(f"Unknown schedule precision: {precision}")
+        self.precision = precision
+        self._length = len(interest)
+        store = _to_cents if precision == PRECISION_CENTS else (lambda values: np.asarray(values, dtype=float))
+        self._varying = {}
+        for name, values in zip(VARYING_COLUMNS, (interest, principal, remaining_balance)):
+            stored = store(values)
+            if stored is values:  # Never alias arrays owned by the caller
+                stored = stored.copy()
+            stored.setflags(write=False)
+            self._varying[name] = stored
+        self._runs = {name: run_length_encode(values)
+                      for name, values in zip(RUN_LENGTH_COLUMNS, (interest_rates, monthly_payments))}
+
+    @classmethod
+    def from_columns(cls, columns, precision=PRECISION_EXACT):
+        """Creates a schedule from a dictionary of columns or a schedule DataFrame."""
+        return cls(np.asarray(columns["Interest"]), np.asarray(columns["Principal"]),
+                   np.asarray(columns["Remaining Balance"]), np.asarray(columns["Interest Rate (%)"]),
+                   np.asarray(columns["Current Payment"]), precision)
+
+    def __len__(self):
+        """Returns the number of months in the schedule."""
+        return self._length
+
+    @property
+    def columns(self):
+        """Returns the column names of the expanded schedule."""
+        return list(SCHEDULE_COLUMNS)
+
+    @property
+    def nbytes(self):
+        """Returns the number of bytes held by the stored arrays."""
+        varying = sum(values.nbytes for values in self._varying.values())
+        runs = sum(run_values.nbytes + run_starts.nbytes for run_values, run_starts in self._runs.values())
+        return varying + runs
+
+    def __getitem__(self, column):
+        """Returns one column as a read-only NumPy array."""
+        if column == "Month":
+            return np.arange(1, self._length + 1)
+        if column in self._runs:
+            return run_length_decode(*self._runs[column], self._length)
+        values = self._varying[column]
+        if self.precision == PRECISION_CENTS:
+            values = values / 100
+            values.setflags(write=False)
+        return values
+
+    def to_numpy(self):
+        """Returns a dictionary of every column; float64 varying columns are zero-copy views."""
+        return {column: self[column] for column in SCHEDULE_COLUMNS}
+
+    def to_pandas(self):
+        """Returns the schedule as a DataFrame with the same columns as create_amortization_schedule()."""
+        import pandas as pd
+
+        return pd.DataFrame(self.to_numpy(), copy=False)
@@ -0,0 +1,131 @@
+"""
+Memoizing cache of computed amortization schedules.
+Keeps the most recently used schedules as compact, read-only Schedule objects so repeated
+scenarios are returned without recomputation.
+"""
+import threading
+from collections import OrderedDict
+from decimal import ROUND_HALF_UP
+
+from amortization import MONTHS_IN_YEAR, calculate_amortization_columns, create_amortization_data
+from exact_money import ENGINE_CENTS, ENGINE_FLOAT, calculate_amortization_columns_cents
+from schedule import PRECISION_CENTS, Schedule
+
+# Default bounds of a schedule cache
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def normalize_key(loan_amount, annual_interest_rate, number_of_years, currency="USD", rounding=ROUND_HALF_UP,
+                  engine=ENGINE_FLOAT):
+    """Builds the cache key for a loan, so equal inputs typed differently (e.g. 5 and 5.00) share an entry."""
+    return (round(float(loan_amount), 2), round(float(annual_interest_rate), 6), int(number_of_years),
+            currency, rounding, engine)
+
+
+class ScheduleCache:
+    """
+    Bounded LRU cache of amortization schedules keyed by (principal, rate, term, currency, rounding, engine).
+    Entries are evicted least recently used first once either max_entries or max_bytes is exceeded.
+    Safe to share between the GUI thread and calculation threads.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        """Initializes an empty cache with the given entry and memory limits."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        """Returns the number of cached schedules."""
+        return len(self._entries)
+
+    def get_amortization(self, loan_amount, annual_interest_rate, number_of_years, currency="USD",
+                         rounding=ROUND_HALF_UP, engine=ENGINE_FLOAT, progress=None):
+        """
+        Returns the amortization data for a loan, computing and caching it on a miss.
+        engine selects the float engine or the exact integer-cents engine (ENGINE_CENTS).
+        The result has the same shape as amortization.calculate_amortization(); its schedule
+        DataFrame is rebuilt over the cached read-only arrays on every call.
+        """
+        monthly_payment, total_payment, schedule = self.get_schedule(
+            loan_amount, annual_interest_rate, number_of_years, currency, rounding, engine, progress)
+        return create_amortization_data(monthly_payment, total_payment, schedule["Interest Rate (%)"],
+                                        schedule.to_pandas())
+
+    def get_schedule(self, loan_amount, annual_interest_rate, number_of_years, currency="USD",
+                     rounding=ROUND_HALF_UP, engine=ENGINE_FLOAT, progress=None):
+        """
+        Returns (monthly_payment, total_payment, schedule) for a loan without building a DataFrame,
+        computing and caching it on a miss. schedule is the cached read-only Schedule.
+        On a miss, progress(months_done, total_months) is called after each block of months;
+        an exception it raises abandons the computation and nothing is cached.
+        """
+        key = normalize_key(loan_amount, annual_interest_rate, number_of_years, currency, rounding, engine)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            entry = self._compute_entry(key, progress)
+            self._store(key, entry)
+
+        return entry[:3]
+
+    def _compute_entry(self, key, progress=None):
+        """Computes the schedule for a key and stores it as a compact, read-only Schedule."""
+        loan_amount, annual_interest_rate, number_of_years, _, rounding, engine = key
+        if engine == ENGINE_CENTS:
+            monthly_payment, total_payment, columns = calculate_amortization_columns_cents(
+                loan_amount, annual_interest_rate, number_of_years, rounding, progress)
+            schedule = Schedule.from_columns(columns, PRECISION_CENTS)  # Lossless, every value is whole cents
+        else:
+            monthly_payment, columns = calculate_amortization_columns(loan_amount, annual_interest_rate,
+                                                                      number_of_years, rounding, progress)
+            schedule = Schedule.from_columns(columns)
+            total_payment = monthly_payment * number_of_years * MONTHS_IN_YEAR
+        return monthly_payment, total_payment, schedule, schedule.nbytes
+
+    def _store(self, key, entry):
+        """Inserts an entry and evicts least recently used entries until the limits are met."""
+        entry_bytes = entry[3]
+        if entry_bytes > self.max_bytes or self.max_entries <= 0:
+            return  # Too large to ever fit; returned to the caller without being cached
+        with self._lock:
+            if key in self._entries:  # Computed concurrently by another thread
+                return
+            self._entries[key] = entry
+            self._bytes += entry_bytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[3]
+                self.evictions += 1
+
+    def stats(self):
+        """Returns a dictionary of hit/miss counters and current usage."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def clear(self):
+        """Removes every cached schedule and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,525 @@
+"""
+Local HTTP calculation service for the loan calculator.
+Serves payment quotes, schedules and batch summaries over asyncio so other tools can use the
+calculation core without the GUI. Payment quotes arriving together are micro-batched into one
+vectorized computation, schedules are computed on an executor and streamed as NDJSON, and
+responses are cached.
+
+Endpoints (parameters as a query string or a JSON body):
+    GET  /payment?loan_amount=250000&annual_interest_rate=5.25&number_of_years=30
+    GET  /schedule?...&currency=USD&engine=float|cents&rounding=half_up|half_even  (NDJSON)
+    POST /batch   JSON array or JSON-lines of loan requests                         (NDJSON)
+    GET  /stats
+
+Request bodies must be sent with a Content-Length; chunked uploads are answered with 411.
+
+Example:
+    python service.py --port 8000
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+from amortization import MONTHS_IN_YEAR, CalculationError, InvalidInputError
+from cli import DEFAULT_CHUNK_SIZE, SUMMARY_FIELDS, iter_request_chunks, iter_request_rows, parse_loan_request, \
+    process_chunk
+from exact_money import ENGINE_CENTS, ENGINE_FLOAT
+from portfolio import calculate_monthly_payments
+from schedule_cache import ScheduleCache, normalize_key
+
+# Server defaults
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_THREADS = 4
+
+# Payment quotes arriving within the window are computed together, up to MAX_BATCH at a time
+DEFAULT_BATCH_WINDOW = 0.001
+DEFAULT_MAX_BATCH = 1024
+
+# Response cache bounds
+RESPONSE_CACHE_ENTRIES = 4096
+RESPONSE_CACHE_BYTES = 32 * 1024 * 1024
+
+# Schedule rows per streamed NDJSON chunk, and the largest accepted request body
+SCHEDULE_CHUNK_ROWS = 240
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+# Longest term quoted or scheduled, so one request cannot allocate an unbounded schedule
+MAX_NUMBER_OF_YEARS = 100
+
+SUPPORTED_CURRENCIES = ("USD", "EUR", "CAD")
+ENGINES = (ENGINE_FLOAT, ENGINE_CENTS)
+ROUNDING_MODES = {"half_up": ROUND_HALF_UP, "half_even": ROUND_HALF_EVEN}
+
+NDJSON = "application/x-ndjson"
+JSON = "application/json"
+
+
+class HttpError(Exception):
+    """Exception raised for requests that cannot be served, carrying the HTTP status."""
+
+    def __init__(self, status, message):
+        """Initializes the error with an HTTP status code and a client-facing message."""
+        super().__init__(message)
+        self.status = status
+
+
+class ResponseCache:
+    """Bounded LRU cache of encoded response bodies (bytes or lists of byte chunks)."""
+
+    def __init__(self, max_entries=RESPONSE_CACHE_ENTRIES, max_bytes=RESPONSE_CACHE_BYTES):
+        """Initializes an empty cache with the given entry and memory limits."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Returns the cached body for a key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, body):
+        """Stores a body, evicting least recently used entries until the limits are met."""
+        size = len(body) if isinstance(body, bytes) else sum(len(chunk) for chunk in body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (body, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def stats(self):
+        """Returns a dictionary of hit/miss counters and current usage."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._bytes}
+
+
+class PaymentBatcher:
+    """
+    Coalesces concurrent payment quotes into one vectorized calculate_monthly_payments() call.
+    Requests are collected for up to `window` seconds or until `max_batch` are pending.
+    """
+
+    def __init__(self, window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        """Initializes an empty batcher."""
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = []
+        self._timer = None
+        self.batches = 0
+        self.requests = 0
+
+    def submit(self, loan_amount, annual_interest_rate, number_of_years):
+        """Queues one quote and returns a future resolving to its monthly payment."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((loan_amount, annual_interest_rate, number_of_years, future))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self):
+        """
+        Computes every pending quote in one pass and resolves their futures.
+        If the batch fails, the quotes are computed one by one so only the failing ones get the error.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        loan_amounts, rates, years, futures = zip(*pending)
+        self.batches += 1
+        self.requests += len(pending)
+        try:
+            monthly_payments = calculate_monthly_payments(loan_amounts, rates, years).tolist()
+        except Exception:
+            for loan_amount, annual_interest_rate, number_of_years, future in pending:
+                try:
+                    monthly_payment = calculate_monthly_payments([loan_amount], [annual_interest_rate],
+                                                                 [number_of_years])[0]
+                except Exception as e:
+                    _resolve(future, error=CalculationError(f"Error calculating monthly payment: {e}"))
+                else:
+                    _resolve(future, float(monthly_payment))
+            return
+        for future, monthly_payment in zip(futures, monthly_payments):
+            _resolve(future, monthly_payment)
+
+
+def _resolve(future, monthly_payment=None, error=None):
+    """Sets a quote's payment, or an error when it failed or is not a finite amount."""
+    if future.done():  # The client may have disconnected
+        return
+    if error is None and not math.isfinite(monthly_payment):
+        error = CalculationError("Error calculating monthly payment: the result is not a finite amount.")
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(monthly_payment)
+
+
+def encode_schedule_ndjson(monthly_payment, total_payment, schedule, chunk_rows=SCHEDULE_CHUNK_ROWS):
+    """
+    Encodes a schedule as NDJSON byte chunks: a summary line followed by one line per month.
+    """
+    monthly_payment, total_payment = float(monthly_payment), float(total_payment)
+    loan_amount = float(schedule["Principal"].sum())
+    summary = {
+        "monthly_payment": round(monthly_payment, 2),
+        "total_payment": round(total_payment, 2),
+        "total_interest": round(total_payment - loan_amount, 2) or 0.0,  # Never -0.0
+        "number_of_months": len(schedule),
+    }
+    row_format = ('{"Month": %d, "Interest Rate (%%)": %r, "Current Payment": %.2f, "Interest": %.2f, '
+                  '"Principal": %.2f, "Remaining Balance": %.2f}\n')
+    columns = [schedule[column].tolist() for column in schedule.columns]
+    rows = list(zip(*columns))
+    chunks = [(json.dumps(summary) + "\n").encode()]
+    for start in range(0, len(rows), chunk_rows):
+        chunks.append("".join(row_format % row for row in rows[start:start + chunk_rows]).encode())
+    return chunks
+
+
+def _next_batch_summary(chunks):
+    """Executor task: parses the next chunk of batch requests and returns its NDJSON summaries, or None."""
+    chunk = next(chunks, None)
+    return None if chunk is None else process_chunk(chunk, "jsonl", False)[0]
+
+
+def _batch_rows(body):
+    """
+    Executor task: decodes a batch body and returns its numbered request rows.
+    A JSON array is parsed here; JSON lines are parsed lazily, chunk by chunk, by _next_batch_summary().
+    """
+    text = body.decode("utf-8", errors="replace")
+    if text.lstrip().startswith("["):
+        try:
+            rows = list(enumerate(json.loads(text), start=1))
+        except json.JSONDecodeError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}")
+    else:
+        rows = iter_request_rows(io.StringIO(text), "jsonl")
+    return ((number, row if isinstance(row, dict) else {"_error": "Request must be a JSON object."})
+            for number, row in rows)
+
+
+def _json_body(payload, status=HTTPStatus.OK):
+    """Builds a JSON response tuple."""
+    return status, JSON, json.dumps(payload).encode()
+
+
+async def _iterate(chunks):
+    """Yields pre-encoded chunks as an asynchronous body."""
+    for chunk in chunks:
+        yield chunk
+
+
+async def read_request(reader):
+    """Reads one HTTP/1.1 request; returns None when the client closed the connection."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Incomplete request.")
+        return None
+    except asyncio.LimitOverrunError:
+        raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Request headers too large.")
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line.")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    # Bodies are only read by Content-Length; a chunked body left unread would be parsed as the next request
+    transfer_encoding = headers.get("transfer-encoding")
+    if transfer_encoding is not None:
+        if transfer_encoding.lower() == "chunked":
+            raise HttpError(HTTPStatus.LENGTH_REQUIRED, "Chunked request bodies are not supported; "
+                                                        "send a Content-Length.")
+        raise HttpError(HTTPStatus.NOT_IMPLEMENTED, f"Unsupported Transfer-Encoding: {transfer_encoding}")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+    if length < 0:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+    if length > MAX_BODY_BYTES:
+        raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large.")
+    body = await reader.readexactly(length) if length else b""
+
+    connection = headers.get("connection", "").lower()
+    url = urlsplit(target)
+    return {
+        "method": method.upper(),
+        "path": url.path,
+        "query": dict(parse_qsl(url.query)),
+        "headers": headers,
+        "body": body,
+        "keep_alive": connection != "close" if version == "HTTP/1.1" else connection == "keep-alive",
+    }
+
+
+async def write_response(writer, status, content_type, body, keep_alive=True):
+    """Writes a response; bytes bodies get a Content-Length, asynchronous bodies are sent chunked."""
+    status = HTTPStatus(status)
+    head = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Type: {content_type}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if isinstance(body, bytes):
+        head.append(f"Content-Length: {len(body)}")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+    else:
+        head.append("Transfer-Encoding: chunked")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode())
+        async for chunk in body:
+            if chunk:
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                await writer.drain()  # Back-pressure from slow clients
+        writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+class CalculationService:
+    """
+    Request handlers of the calculation service.
+    Schedules are computed on a thread pool through a shared ScheduleCache; identical
+    schedule requests in flight at the same time share one computation.
+    """
+
+    def __init__(self, threads=DEFAULT_THREADS, batch_window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        """Initializes the service with its executor, caches and payment batcher."""
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="calculation")
+        self.schedule_cache = ScheduleCache()
+        self.responses = ResponseCache()
+        self.batcher = PaymentBatcher(batch_window, max_batch)
+        self._in_flight = {}
+        self.requests_served = 0
+        self.routes = {
+            ("GET", "/payment"): self.payment,
+            ("POST", "/payment"): self.payment,
+            ("GET", "/schedule"): self.schedule,
+            ("POST", "/schedule"): self.schedule,
+            ("POST", "/batch"): self.batch,
+            ("GET", "/stats"): self.stats,
+        }
+
+    async def handle_connection(self, reader, writer):
+        """Serves requests on one keep-alive connection until the client closes it."""
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HttpError as e:
+                    await write_response(writer, *_json_body({"error": str(e)}, e.status), keep_alive=False)
+                    break
+                if request is None:
+                    break
+                status, content_type, body = await self.dispatch(request)
+                await write_response(writer, status, content_type, body, request["keep_alive"])
+                self.requests_served += 1
+                if not request["keep_alive"]:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client went away mid-request
+        finally:
+            writer.close()
+
+    async def dispatch(self, request):
+        """Routes a request and converts calculation errors to HTTP error responses."""
+        handler = self.routes.get((request["method"], request["path"]))
+        if handler is None:
+            known_path = any(path == request["path"] for _, path in self.routes)
+            status = HTTPStatus.METHOD_NOT_ALLOWED if known_path else HTTPStatus.NOT_FOUND
+            return _json_body({"error": status.phrase}, status)
+        try:
+            return await handler(request)
+        except HttpError as e:
+            return _json_body({"error": str(e)}, e.status)
+        except InvalidInputError as e:
+            return _json_body({"error": str(e)}, HTTPStatus.BAD_REQUEST)
+        except CalculationError as e:
+            return _json_body({"error": str(e)}, HTTPStatus.UNPROCESSABLE_ENTITY)
+        except (TypeError, ValueError, OverflowError) as e:
+            return _json_body({"error": f"Invalid request: {e}"}, HTTPStatus.BAD_REQUEST)
+        except Exception as e:  # Never drop the connection without a response
+            print(f"{request['method']} {request['path']}: {e!r}", file=sys.stderr)
+            return _json_body({"error": HTTPStatus.INTERNAL_SERVER_ERROR.phrase}, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    def _loan(params):
+        """Validates a single-loan request and returns (loan_amount, annual_interest_rate, number_of_years)."""
+        loan = parse_loan_request(params)
+        if loan[2] > MAX_NUMBER_OF_YEARS:
+            raise InvalidInputError(f"Loan term must be at most {MAX_NUMBER_OF_YEARS} years.")
+        return loan
+
+    @staticmethod
+    def _params(request):
+        """Returns request parameters from the JSON body, falling back to the query string."""
+        if not request["body"]:
+            return request["query"]
+        try:
+            params = json.loads(request["body"])
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object.")
+        if not isinstance(params, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object.")
+        return params
+
+    async def payment(self, request):
+        """Returns the monthly payment, total payment and total interest of one loan."""
+        loan_amount, annual_interest_rate, number_of_years = self._loan(self._params(request))
+        key = normalize_key(loan_amount, annual_interest_rate, number_of_years)
+        body = self.responses.get(key)
+        if body is None:
+            monthly_payment = await self.batcher.submit(loan_amount, annual_interest_rate, number_of_years)
+            total_payment = monthly_payment * number_of_years * MONTHS_IN_YEAR
+            values = (loan_amount, annual_interest_rate, number_of_years, round(monthly_payment, 2),
+                      round(total_payment, 2), round(total_payment - loan_amount, 2))
+            body = json.dumps(dict(zip(SUMMARY_FIELDS[1:], values))).encode()
+            self.responses.put(key, body)
+        return HTTPStatus.OK, JSON, body
+
+    async def schedule(self, request):
+        """Streams the amortization schedule of one loan as NDJSON."""
+        params = self._params(request)
+        loan_amount, annual_interest_rate, number_of_years = self._loan(params)
+        currency = str(params.get("currency", "USD")).upper()
+        engine = params.get("engine", ENGINE_FLOAT)
+        rounding = ROUNDING_MODES.get(params.get("rounding", "half_up"))
+        if currency not in SUPPORTED_CURRENCIES:
+            raise InvalidInputError(f"Currency must be one of {', '.join(SUPPORTED_CURRENCIES)}.")
+        if engine not in ENGINES or rounding is None:
+            raise InvalidInputError(f"engine must be one of {', '.join(ENGINES)} and rounding one of "
+                                    f"{', '.join(ROUNDING_MODES)}.")
+
+        key = ("schedule",) + normalize_key(loan_amount, annual_interest_rate, number_of_years, currency,
+                                            rounding, engine)
+        chunks = self.responses.get(key)
+        if chunks is None:
+            chunks = await self._compute_once(key, self._encode_schedule, loan_amount, annual_interest_rate,
+                                              number_of_years, currency, rounding, engine)
+        return HTTPStatus.OK, NDJSON, _iterate(chunks)
+
+    def _encode_schedule(self, *loan):
+        """Executor task: computes (or fetches) a schedule and encodes it as NDJSON chunks."""
+        try:
+            monthly_payment, total_payment, schedule = self.schedule_cache.get_schedule(*loan)
+        except (OverflowError, ValueError, ZeroDivisionError) as e:
+            raise CalculationError(f"Error calculating amortization schedule: {e}")
+        return encode_schedule_ndjson(monthly_payment, total_payment, schedule)
+
+    async def _compute_once(self, key, task, *args):
+        """Runs a task on the executor, sharing the result with identical requests already in flight."""
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, task, *args)
+            self._in_flight[key] = future
+
+            def finish(done):
+                self._in_flight.pop(key, None)
+                if not done.cancelled() and done.exception() is None:
+                    self.responses.put(key, done.result())
+
+            future.add_done_callback(finish)
+        return await asyncio.shield(future)  # A disconnecting client must not cancel the shared work
+
+    async def batch(self, request):
+        """Streams NDJSON summaries for a JSON array or JSON-lines body of loan requests."""
+        loop = asyncio.get_running_loop()
+        rows = await loop.run_in_executor(self.executor, _batch_rows, request["body"])
+        return HTTPStatus.OK, NDJSON, self._stream_batch(rows)
+
+    async def _stream_batch(self, rows):
+        """Parses and computes batch chunks on the executor, yielding error lines and summaries in input order."""
+        loop = asyncio.get_running_loop()
+        invalid = []
+        chunks = iter_request_chunks(rows, DEFAULT_CHUNK_SIZE, {"count": 0},
+                                     lambda line, message: invalid.append({"line": line, "error": message}))
+        while True:
+            summary_text = await loop.run_in_executor(self.executor, _next_batch_summary, chunks)
+            errors = "".join(json.dumps(error) + "\n" for error in invalid)
+            invalid.clear()
+            if summary_text is None:
+                yield errors.encode()
+                return
+            yield (errors + summary_text).encode()
+
+    async def stats(self, request):
+        """Returns request, batching and cache statistics."""
+        batcher = self.batcher
+        return _json_body({
+            "requests": self.requests_served,
+            "payment_batches": batcher.batches,
+            "mean_payment_batch": batcher.requests / batcher.batches if batcher.batches else 0.0,
+            "schedule_cache": self.schedule_cache.stats(),
+            "response_cache": self.responses.stats(),
+        })
+
+
+async def serve(service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Runs the service until cancelled."""
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    address = server.sockets[0].getsockname()
+    print(f"Serving on http://{address[0]}:{address[1]}", file=sys.stderr, flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    """Parses the command line and runs the service."""
+    parser = argparse.ArgumentParser(description="Serve loan calculations over HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Interface to bind (default: {DEFAULT_HOST}).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"Port to bind, 0 for any (default: {DEFAULT_PORT}).")
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS, help="Schedule calculation threads.")
+    parser.add_argument("--batch-window-ms", type=float, default=DEFAULT_BATCH_WINDOW * 1000,
+                        help="How long payment quotes are collected into one batch.")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="Largest payment batch.")
+    args = parser.parse_args(argv)
+
+    service = CalculationService(args.threads, args.batch_window_ms / 1000, args.max_batch)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.executor.shutdown(wait=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Scenario sweeps over the full rate x term x amount grid.
+Closed-form payment totals are computed in one vectorized pass; sweeps that need full schedules
+are sharded across a process pool writing into a shared-memory result buffer.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from amortization import MONTHS_IN_YEAR
+from portfolio import amortize_portfolio, calculate_monthly_payments
+
+# Result arrays produced for every scenario, in buffer order
+SWEEP_FIELDS = ("monthly_payment", "total_payment", "total_interest")
+
+# Schedule-based sweeps smaller than this run in-process; larger ones use a process pool
+PARALLEL_MIN_SCENARIOS = 20_000
+# Number of scenarios amortized per task in schedule-based sweeps
+SHARD_SIZE = 2_000
+# Workers start from a clean server process: forking a caller whose Qt or Numba threads are running can deadlock
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _schedule_totals(loan_amounts, annual_interest_rates, numbers_of_years, out):
+    """Amortizes a block of scenarios and writes payment and schedule totals into out (fields x scenarios)."""
+    result = amortize_portfolio(loan_amounts, annual_interest_rates, numbers_of_years)
+    total_interest = result["interest"].sum(axis=1)
+    out[0] = result["monthly_payment"]
+    out[1] = total_interest + result["principal"].sum(axis=1)
+    out[2] = total_interest
+
+
+def _sweep_shard(buffer_name, scenario_count, start, loan_amounts, annual_interest_rates, numbers_of_years):
+    """Process-pool task: amortizes one shard and writes its totals into the shared result buffer."""
+    buffer = shared_memory.SharedMemory(name=buffer_name)
+    try:
+        results = np.ndarray((len(SWEEP_FIELDS), scenario_count), dtype=float, buffer=buffer.buf)
+        stop = start + len(loan_amounts)
+        _schedule_totals(loan_amounts, annual_interest_rates, numbers_of_years, results[:, start:stop])
+        del results  # Release the view before closing the shared buffer
+    finally:
+        buffer.close()
+
+
+def _pool_context():
+    """Returns the multiprocessing context for sweep workers, preloading this module into the fork server."""
+    context = multiprocessing.get_context(POOL_START_METHOD)
+    if POOL_START_METHOD == "forkserver":
+        context.set_forkserver_preload([__name__])  # Workers fork with NumPy already imported
+    return context
+
+
+def _parallel_schedule_totals(loan_amounts, annual_interest_rates, numbers_of_years, workers):
+    """Shards schedule-based totals across a process pool and gathers them from shared memory."""
+    scenario_count = len(loan_amounts)
+    buffer = shared_memory.SharedMemory(create=True, size=len(SWEEP_FIELDS) * scenario_count * 8)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as executor:
+            futures = [
+                executor.submit(_sweep_shard, buffer.name, scenario_count, start,
+                                loan_amounts[start:start + SHARD_SIZE],
+                                annual_interest_rates[start:start + SHARD_SIZE],
+                                numbers_of_years[start:start + SHARD_SIZE])
+                for start in range(0, scenario_count, SHARD_SIZE)
+            ]
+            for future in futures:
+                future.result()
+        shared = np.ndarray((len(SWEEP_FIELDS), scenario_count), dtype=float, buffer=buffer.buf)
+        results = shared.copy()
+        del shared
+        return results
+    finally:
+        buffer.close()
+        buffer.unlink()
+
+
+def sweep(annual_interest_rates, numbers_of_years, loan_amounts, full_schedules=False, workers=None):
+    """
+    Computes monthly payment, total payment and total interest for every combination of inputs.
+
+    Returns a dictionary with the input axes ("annual_interest_rate", "number_of_years",
+    "loan_amount") and one (rates x terms x amounts) array per field in SWEEP_FIELDS.
+    By default totals use the closed form (payment x months). With full_schedules=True they are
+    summed from the amortized schedules, including the final-payment adjustment; large grids are
+    then sharded across `workers` processes (os.cpu_count() when None, in-process when 1).
+    """
+    rate_axis = np.atleast_1d(np.asarray(annual_interest_rates, dtype=float))
+    term_axis = np.atleast_1d(np.asarray(numbers_of_years, dtype=np.int64))
+    amount_axis = np.atleast_1d(np.asarray(loan_amounts, dtype=float))
+    rate_grid, term_grid, amount_grid = (grid.ravel() for grid in
+                                         np.meshgrid(rate_axis, term_axis, amount_axis, indexing="ij"))
+    scenario_count = rate_grid.size
+
+    if not full_schedules:
+        monthly_payments = calculate_monthly_payments(amount_grid, rate_grid, term_grid)
+        total_payments = monthly_payments * term_grid * MONTHS_IN_YEAR
+        results = np.stack((monthly_payments, total_payments, total_payments - amount_grid))
+    elif scenario_count >= PARALLEL_MIN_SCENARIOS and (workers or os.cpu_count() or 1) > 1:
+        results = _parallel_schedule_totals(amount_grid, rate_grid, term_grid, workers)
+    else:
+        results = np.empty((len(SWEEP_FIELDS), scenario_count))
+        for start in range(0, scenario_count, SHARD_SIZE):
+            stop = start + SHARD_SIZE
+            _schedule_totals(amount_grid[start:stop], rate_grid[start:stop], term_grid[start:stop],
+                             results[:, start:stop])
+
+    shape = (rate_axis.size, term_axis.size, amount_axis.size)
+    sweep_result = {
+        "annual_interest_rate": rate_axis,
+        "number_of_years": term_axis,
+        "loan_amount": amount_axis,
+    }
+    for field, values in zip(SWEEP_FIELDS, results):
+        sweep_result[field] = values.reshape(shape)
+    return sweep_result
+
+
+def to_frame(sweep_result):
+    """Converts a sweep result into a long-format Pandas DataFrame with one row per scenario."""
+    import pandas as pd
+
+    rate_grid, term_grid, amount_grid = np.meshgrid(sweep_result["annual_interest_rate"],
+                                                    sweep_result["number_of_years"],
+                                                    sweep_result["loan_amount"], indexing="ij")
+    frame = {
+        "Interest Rate (%)": rate_grid.ravel(),
+        "Loan Term (Years)": term_grid.ravel(),
+        "Loan Amount": amount_grid.ravel(),
+    }
+    for field in SWEEP_FIELDS:
+        frame[field.replace("_", " ").title()] = sweep_result[field].ravel()
+    return pd.DataFrame(frame)
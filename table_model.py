@@ -0,0 +1,41 @@
+"""
+Qt table model for displaying amortization schedules.
+Reads cells lazily from the schedule's NumPy columns so only visible rows are formatted.
+"""
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class AmortizationTableModel(QAbstractTableModel):
+    """
+    Read-only table model over an amortization schedule DataFrame.
+    Keeps one NumPy array per column and formats a value only when the view asks for it.
+    """
+
+    def __init__(self, df, parent=None):
+        """Initializes the model from the columns of the schedule DataFrame."""
+        super().__init__(parent)
+        self._headers = [str(column) for column in df.columns]
+        self._columns = [df[column].to_numpy() for column in df.columns]
+        self._row_count = df.shape[0]
+
+    def rowCount(self, parent=QModelIndex()):
+        """Returns the number of schedule rows."""
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        """Returns the number of schedule columns."""
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Returns the formatted value of a cell."""
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return f"{self._columns[index.column()][index.row()]:,.2f}"
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Returns the column names and 1-based row numbers."""
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._headers[section]
+        return str(section + 1)
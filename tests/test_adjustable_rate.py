@@ -0,0 +1,64 @@
+"""
+Tests for adjustable-rate schedules: the payment re-amortized at every reset against a month-by-month loop.
+"""
+import numpy as np
+import pytest
+
+from adjustable_rate import amortize_adjustable, indexed_rate_schedule, step_rate_schedule
+from amortization import MONTHS_IN_YEAR, InvalidInputError, calculate_monthly_payment
+
+# Half a cent: balances must match the loop to the cent
+CENT_TOLERANCE = 0.005
+
+
+def reference_adjustable(loan_amount, interest_rates):
+    """
+    Returns (monthly_payments, opening_balances) from a month-by-month loop that re-amortizes the
+    remaining balance over the remaining term whenever the rate changes.
+    """
+    total_months = len(interest_rates)
+    monthly_payments = np.zeros(total_months)
+    opening_balances = np.zeros(total_months)
+    balance = float(loan_amount)
+    payment = 0.0
+    for month in range(total_months):
+        rate = interest_rates[month] / (MONTHS_IN_YEAR * 100)
+        if month == 0 or interest_rates[month] != interest_rates[month - 1]:
+            payment = float(calculate_monthly_payment(balance, rate, total_months - month)) if balance > 0 else 0.0
+        monthly_payments[month] = payment
+        opening_balances[month] = balance
+        balance -= payment - balance * rate
+    return monthly_payments, opening_balances
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_payment_at_each_reset_reamortizes_the_remaining_balance(seed):
+    generator = np.random.default_rng(seed)
+    number_of_years = int(generator.choice((15, 30, 40, 80)))
+    loan_amount = round(float(generator.uniform(1_000, 2_000_000)), 2)
+    # Up to 60% index rates over 80 years, where the closed-form segments would drift by cents
+    interest_rates = indexed_rate_schedule(round(float(generator.uniform(1, 30)), 3),
+                                           generator.uniform(0.5, 60, number_of_years * MONTHS_IN_YEAR),
+                                           2.5, number_of_years, initial_cap=2, periodic_cap=5)
+    monthly_payments, remaining_balance, _, _ = amortize_adjustable(loan_amount, interest_rates)
+    expected_payments, expected_balances = reference_adjustable(loan_amount, interest_rates)
+
+    resets = np.concatenate(([0], np.flatnonzero(np.diff(interest_rates)) + 1))
+    assert len(resets) > 1
+    assert np.array_equal(monthly_payments[resets], expected_payments[resets])
+    assert np.array_equal(monthly_payments, expected_payments)
+    assert np.max(np.abs(remaining_balance[:-1] - expected_balances[:-1])) < CENT_TOLERANCE
+
+
+def test_step_rate_payment_matches_calculate_monthly_payment_at_the_reset():
+    interest_rates = step_rate_schedule(4.0, {61: 7.5}, 30)
+    monthly_payments, remaining_balance, _, _ = amortize_adjustable(300_000.0, interest_rates)
+    assert monthly_payments[0] == float(calculate_monthly_payment(300_000.0, 4.0 / 1200, 360))
+    expected = float(calculate_monthly_payment(remaining_balance[60], 7.5 / 1200, 300))
+    assert monthly_payments[60] == expected
+    assert np.all(monthly_payments[60:] == expected)
+
+
+def test_empty_index_rates_are_rejected():
+    with pytest.raises(InvalidInputError):
+        indexed_rate_schedule(5.0, [], 2.5, 30)
@@ -0,0 +1,113 @@
+"""
+Regression tests for the vectorized amortization engine against the original month-by-month loop.
+"""
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from amortization import (MONTHS_IN_YEAR, PROGRESS_BLOCK_MONTHS, amortize, calculate_monthly_payment,
+                          create_amortization_schedule)
+from schedule_cache import ScheduleCache
+
+# Half a cent: the schedule must match the loop to the cent everywhere the GUI accepts
+CENT_TOLERANCE = 0.005
+
+LOAN_AMOUNTS = (1_000.0, 250_000.55, 1_420_000.13)
+ANNUAL_INTEREST_RATES = (0.01, 5.25, 18.0, 30.59, 60.0, 100.0)
+TERMS_IN_YEARS = (1, 15, 30, 81, 97, 100)
+
+
+def reference_schedule(loan_amount, monthly_payments, interest_rates):
+    """Returns (remaining_balance, interest, principal) from the loop the vectorized engine replaced."""
+    total_months = len(interest_rates)
+    interest = np.zeros(total_months)
+    principal = np.zeros(total_months)
+    remaining_balance = np.zeros(total_months)
+    remaining_balance[0] = loan_amount
+    for i in range(total_months):
+        monthly_interest_rate = float(Decimal(interest_rates[i]) / (MONTHS_IN_YEAR * Decimal(100)))
+        interest[i] = remaining_balance[i] * monthly_interest_rate
+        if i < total_months - 1:
+            principal_payment = min(monthly_payments[i] - interest[i], remaining_balance[i])
+            principal[i] = principal_payment
+            remaining_balance[i + 1] = remaining_balance[i] - principal_payment
+        else:
+            principal[i] = remaining_balance[i]
+            remaining_balance[i] = 0
+    return remaining_balance, interest, principal
+
+
+def assert_matches_reference(loan_amount, monthly_payments, interest_rates):
+    """Asserts every column of amortize() is within half a cent of the reference loop."""
+    expected = reference_schedule(loan_amount, monthly_payments, interest_rates)
+    actual = amortize(loan_amount, monthly_payments, interest_rates)
+    for name, expected_column, actual_column in zip(("Remaining Balance", "Interest", "Principal"), expected, actual):
+        difference = np.max(np.abs(expected_column - actual_column))
+        assert difference < CENT_TOLERANCE, f"{name} differs by {difference}"
+
+
+@pytest.mark.parametrize("number_of_years", TERMS_IN_YEARS)
+@pytest.mark.parametrize("annual_interest_rate", ANNUAL_INTEREST_RATES)
+@pytest.mark.parametrize("loan_amount", LOAN_AMOUNTS)
+def test_fixed_rate_matches_loop(loan_amount, annual_interest_rate, number_of_years):
+    number_of_months = number_of_years * MONTHS_IN_YEAR
+    monthly_interest_rate = annual_interest_rate / (MONTHS_IN_YEAR * 100)
+    monthly_payment = float(calculate_monthly_payment(loan_amount, monthly_interest_rate, number_of_months))
+    assert_matches_reference(loan_amount, np.full(number_of_months, monthly_payment),
+                             np.full(number_of_months, annual_interest_rate))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_variable_rate_matches_loop(seed):
+    generator = np.random.default_rng(seed)
+    number_of_months = int(generator.integers(1, 101)) * MONTHS_IN_YEAR
+    loan_amount = round(float(generator.uniform(1_000, 2_000_000)), 2)
+    interest_rates = np.repeat(generator.uniform(0.01, 40, number_of_months // 12).round(2), 12)
+    monthly_payment = float(calculate_monthly_payment(loan_amount, interest_rates.max() / 1200, number_of_months))
+    monthly_payments = np.full(number_of_months, monthly_payment) + generator.uniform(0, 100, number_of_months)
+    assert_matches_reference(loan_amount, monthly_payments, interest_rates)
+
+
+def test_overpayment_pays_off_early_and_stays_at_zero():
+    interest_rates = np.full(24, 6.0)
+    monthly_payments = np.full(24, 20_000.0)
+    assert_matches_reference(100_000.0, monthly_payments, interest_rates)
+    remaining_balance, interest, principal = amortize(100_000.0, monthly_payments, interest_rates)
+    assert np.all(remaining_balance[6:] == 0)
+    assert principal.sum() == pytest.approx(100_000.0)
+
+
+def test_interest_free_loan_is_split_evenly():
+    schedule = create_amortization_schedule(1_200.0, np.full(12, 100.0), np.zeros(12))
+    assert np.allclose(schedule["Principal"], 100.0)
+    assert np.all(schedule["Interest"] == 0)
+
+
+@pytest.mark.parametrize("annual_interest_rate", (5.25, 100.0))  # Closed form, then the stepped fallback
+def test_progress_is_reported_after_each_block_of_months(annual_interest_rate):
+    number_of_months = 97 * MONTHS_IN_YEAR
+    monthly_payment = float(calculate_monthly_payment(250_000.0, annual_interest_rate / 1200, number_of_months))
+    monthly_payments = np.full(number_of_months, monthly_payment)
+    interest_rates = np.full(number_of_months, annual_interest_rate)
+    reports = []
+    columns = amortize(250_000.0, monthly_payments, interest_rates, lambda done, total: reports.append((done, total)))
+    block_ends = range(PROGRESS_BLOCK_MONTHS, number_of_months + PROGRESS_BLOCK_MONTHS, PROGRESS_BLOCK_MONTHS)
+    expected = [(min(end, number_of_months), number_of_months) for end in block_ends]
+    assert reports == expected
+    for with_progress, without_progress in zip(columns, amortize(250_000.0, monthly_payments, interest_rates)):
+        assert np.array_equal(with_progress, without_progress)
+
+
+@pytest.mark.parametrize("engine", ("float", "cents"))
+def test_progress_that_raises_abandons_the_schedule_uncached(engine):
+    class Cancelled(Exception):
+        pass
+
+    def cancel_after_first_block(months_done, total_months):
+        raise Cancelled
+
+    cache = ScheduleCache()
+    with pytest.raises(Cancelled):
+        cache.get_schedule(250_000.0, 5.25, 30, engine=engine, progress=cancel_after_first_block)
+    assert len(cache) == 0
@@ -0,0 +1,73 @@
+"""
+Tests for the CLI batch runner: request validation and end-to-end summaries.
+"""
+import json
+
+import pytest
+
+from amortization import InvalidInputError
+from cli import iter_request_chunks, main, parse_loan_request
+
+
+@pytest.mark.parametrize("row, expected", (
+    ({"loan_amount": 250000, "annual_interest_rate": 5.25, "number_of_years": 30}, (250000.0, 5.25, 30)),
+    ({"amount": "1000", "rate": "0", "term": "1"}, (1000.0, 0.0, 1)),
+    ({"principal": "5e4", "rate": 7, "years": 15.0}, (50000.0, 7.0, 15)),
+))
+def test_valid_requests_are_parsed(row, expected):
+    assert parse_loan_request(row) == expected
+
+
+@pytest.mark.parametrize("row", (
+    [250000, 5.25, 30],
+    "loan",
+    42,
+    None,
+    {"loan_amount": 250000, "annual_interest_rate": 5.25},
+    {"loan_amount": [250000], "annual_interest_rate": 5.25, "number_of_years": 30},
+    {"loan_amount": {"value": 1}, "annual_interest_rate": 5.25, "number_of_years": 30},
+    {"loan_amount": True, "annual_interest_rate": 5.25, "number_of_years": 30},
+    {"loan_amount": "abc", "annual_interest_rate": 5.25, "number_of_years": 30},
+    {"loan_amount": float("nan"), "annual_interest_rate": 5.25, "number_of_years": 30},
+    {"loan_amount": "inf", "annual_interest_rate": 5.25, "number_of_years": 30},
+    {"loan_amount": 250000, "annual_interest_rate": "NaN", "number_of_years": 30},
+    {"loan_amount": 250000, "annual_interest_rate": 5.25, "number_of_years": 30.5},
+    {"loan_amount": 250000, "annual_interest_rate": 5.25, "number_of_years": "1e400"},
+    {"loan_amount": -1, "annual_interest_rate": 5.25, "number_of_years": 30},
+    {"loan_amount": 250000, "annual_interest_rate": 101, "number_of_years": 30},
+    {"loan_amount": 250000, "annual_interest_rate": 5.25, "number_of_years": 0},
+))
+def test_invalid_requests_raise_invalid_input(row):
+    with pytest.raises(InvalidInputError):
+        parse_loan_request(row)
+
+
+def test_invalid_rows_are_reported_and_skipped():
+    rows = [(1, {"loan_amount": 1000, "rate": 5, "years": 1}), (2, [1, 2, 3]), (3, "text"),
+            (4, {"_error": "Invalid JSON"}), (5, {"amount": 2000, "rate": 6, "years": 2.5}),
+            (6, {"id": "last", "amount": 3000, "rate": 7, "years": 3})]
+    errors = {"count": 0}
+    reported = []
+    chunks = list(iter_request_chunks(rows, 10, errors, lambda line, message: reported.append(line)))
+    assert reported == [2, 3, 4, 5]
+    assert errors["count"] == 4
+    (ids, loan_amounts, _, years), = chunks
+    assert ids == ["0", "last"]
+    assert loan_amounts.tolist() == [1000.0, 3000.0]
+    assert years.tolist() == [1, 3]
+
+
+def test_main_writes_summaries_and_exits_nonzero_on_invalid_rows(tmp_path, capsys):
+    requests = tmp_path / "loans.jsonl"
+    requests.write_text("\n".join((
+        json.dumps({"id": "a", "loan_amount": 250000, "annual_interest_rate": 5.25, "number_of_years": 30}),
+        "[250000, 5.25, 30]",
+        '{"loan_amount": NaN, "annual_interest_rate": 5.25, "number_of_years": 30}',
+        "not json",
+    )) + "\n")
+    summary = tmp_path / "summary.jsonl"
+    assert main([str(requests), "--summary", str(summary)]) == 1
+    (record,) = [json.loads(line) for line in summary.read_text().splitlines()]
+    assert record["id"] == "a"
+    assert record["monthly_payment"] == 1380.51
+    assert "3 invalid rows skipped" in capsys.readouterr().err
@@ -0,0 +1,54 @@
+"""
+Tests for the exact integer-cents engine against a Decimal ledger.
+"""
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pytest
+
+from amortization import calculate_monthly_payment
+from exact_money import (RATE_DENOMINATOR, amortize_cents, calculate_amortization_columns_cents,
+                         calculate_monthly_payment_cents, rate_to_basis_points, to_cents)
+
+
+def reference_ledger(loan_cents, payment_cents, rate_basis_points, number_of_months, rounding):
+    """Returns (interest, principal, remaining_balance) lists from a Decimal month-by-month ledger."""
+    interest, principal, remaining_balance = [], [], []
+    balance = loan_cents
+    for month in range(number_of_months):
+        month_interest = int((Decimal(balance * rate_basis_points) / RATE_DENOMINATOR).quantize(Decimal(1), rounding))
+        month_principal = balance if month == number_of_months - 1 else min(payment_cents - month_interest, balance)
+        interest.append(month_interest)
+        principal.append(month_principal)
+        remaining_balance.append(0 if month == number_of_months - 1 else balance)
+        balance -= month_principal
+    return interest, principal, remaining_balance
+
+
+@pytest.mark.parametrize("rounding", (ROUND_HALF_UP, ROUND_HALF_EVEN))
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_decimal_ledger(seed, rounding):
+    generator = np.random.default_rng(seed)
+    loan_cents = int(generator.integers(100_000, 200_000_000))
+    rate_basis_points = int(generator.integers(0, 3_000))
+    number_of_months = int(generator.integers(1, 481))
+    payment_cents = calculate_monthly_payment_cents(loan_cents, rate_basis_points, number_of_months, rounding)
+    result = amortize_cents(loan_cents, payment_cents, rate_basis_points, number_of_months, rounding)
+    expected = reference_ledger(loan_cents, payment_cents, rate_basis_points, number_of_months, rounding)
+    for actual, column in zip(result, expected):
+        assert actual.dtype == np.int64
+        assert actual.tolist() == column
+    assert int(result[1].sum()) == loan_cents
+
+
+def test_total_payment_reconciles_to_the_cent():
+    monthly_payment, total_payment, columns = calculate_amortization_columns_cents(250_000.55, 5.25, 30)
+    assert monthly_payment == calculate_monthly_payment(250_000.55, 5.25 / 1200, 360)
+    paid_cents = np.rint((columns["Interest"] + columns["Principal"]) * 100).astype(np.int64).sum()
+    assert total_payment == Decimal(int(paid_cents)).scaleb(-2)
+    assert columns["Principal"].sum() == pytest.approx(250_000.55, abs=1e-6)
+
+
+def test_inputs_convert_exactly():
+    assert to_cents(0.29) == 29
+    assert rate_to_basis_points(5.25) == 525
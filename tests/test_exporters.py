@@ -0,0 +1,192 @@
+"""
+Tests for the schedule exporters: chunked and gzip CSV files, paginated PDF reports and Arrow/Parquet files.
+"""
+import gzip
+import os
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from amortization import calculate_amortization
+from exporters import (iter_schedule_chunks, read_schedule_arrow, write_schedule_arrow, write_schedule_csv,
+                       write_schedule_pdf)
+from portfolio import amortize_portfolio, to_long_format
+
+
+@pytest.fixture
+def schedule():
+    """Returns a 30-year schedule DataFrame."""
+    return calculate_amortization(250_000.0, 5.25, 30)["amortization_schedule"]
+
+
+def page_texts(path):
+    """Returns the text drawn on each page of a PDF written by write_schedule_pdf(), in drawing order."""
+    data = path.read_bytes()
+    pages = []
+    for stream in re.findall(rb"stream\r?\n(.*?)\r?\nendstream", data, re.S):
+        content = zlib.decompress(stream).decode("latin-1")
+        texts = re.findall(r"\(((?:[^()\\]|\\.)*)\) Tj", content)
+        pages.append([re.sub(r"\\(.)", r"\1", text) for text in texts])
+    return pages
+
+
+def page_size(path):
+    """Returns the (width, height) of the pages of a PDF, in points."""
+    width, height = re.search(rb"/MediaBox ?\[0 0 ([\d.]+) ([\d.]+)\]", path.read_bytes()).groups()
+    return float(width), float(height)
+
+
+def assert_csv_matches(frame, schedule):
+    """Checks a CSV read back with pandas against the schedule it was written from, to the cent."""
+    assert list(frame.columns) == list(schedule.columns)
+    assert np.array_equal(frame["Month"], schedule["Month"])
+    for column in schedule.columns[1:]:
+        np.testing.assert_allclose(frame[column], schedule[column], atol=0.005, err_msg=column)
+
+
+@pytest.mark.parametrize("chunk_rows", (1, 7, 359, 360, 10_000))
+def test_csv_chunks_write_every_row_once_with_one_header(tmp_path, schedule, chunk_rows):
+    path = tmp_path / "schedule.csv"
+    assert write_schedule_csv(path, schedule, chunk_rows=chunk_rows) == 360
+    lines = path.read_text().splitlines()
+    assert len(lines) == 361
+    assert lines.count(lines[0]) == 1
+    assert_csv_matches(pd.read_csv(path), schedule)
+
+
+def test_csv_floats_have_two_decimals(tmp_path, schedule):
+    path = tmp_path / "schedule.csv"
+    write_schedule_csv(path, schedule, chunk_rows=50)
+    first_row = path.read_text().splitlines()[1].split(",")
+    assert first_row[0] == "1"
+    assert all(len(value.split(".")[1]) == 2 for value in first_row[1:])
+
+
+def test_csv_accepts_an_iterable_of_chunks(tmp_path, schedule):
+    path = tmp_path / "schedule.csv"
+    chunks = (schedule.iloc[start:start + 100] for start in range(0, 360, 100))
+    assert write_schedule_csv(path, chunks) == 360
+    assert_csv_matches(pd.read_csv(path), schedule)
+
+
+def test_iter_schedule_chunks_yields_views_of_at_most_chunk_rows(schedule):
+    chunks = list(iter_schedule_chunks(schedule, 100))
+    assert [len(chunk) for chunk in chunks] == [100, 100, 100, 60]
+    assert chunks[-1]["Month"].iloc[0] == 301
+
+
+@pytest.mark.parametrize("name, compress", (("schedule.csv.gz", None), ("schedule.csv", True)))
+def test_gzip_csv_round_trip(tmp_path, schedule, name, compress):
+    path = tmp_path / name
+    assert write_schedule_csv(path, schedule, chunk_rows=64, compress=compress) == 360
+    with gzip.open(path, "rt") as handle:
+        assert handle.readline().startswith("Month,")
+    assert_csv_matches(pd.read_csv(path, compression="gzip"), schedule)
+
+
+def test_gzip_csv_matches_plain_csv(tmp_path, schedule):
+    write_schedule_csv(tmp_path / "plain.csv", schedule, chunk_rows=25)
+    write_schedule_csv(tmp_path / "packed.csv.gz", schedule, chunk_rows=25)
+    assert gzip.decompress((tmp_path / "packed.csv.gz").read_bytes()) == (tmp_path / "plain.csv").read_bytes()
+
+
+def test_pdf_pages_repeat_the_header_and_hold_every_row_once(tmp_path, schedule):
+    path = tmp_path / "schedule.pdf"
+    pages_written = write_schedule_pdf(path, schedule, title="Test Schedule")
+    pages = page_texts(path)
+    headers = list(schedule.columns)
+
+    assert pages_written == len(pages) > 1
+    assert re.search(rb"/Count (\d+)", path.read_bytes()).group(1) == str(pages_written).encode()
+    assert pages[0][0] == "Test Schedule"
+    assert all("Test Schedule" not in page for page in pages[1:])
+    for page in pages:
+        start = page.index("Month")
+        assert page[start:start + len(headers)] == headers
+        assert page.count("Month") == 1
+    months = [int(text) for page in pages for text in page if text.isdigit()]
+    assert months == list(range(1, 361))
+
+
+def test_pdf_rows_are_formatted_to_two_decimals(tmp_path, schedule):
+    path = tmp_path / "schedule.pdf"
+    write_schedule_pdf(path, schedule)
+    first_page = page_texts(path)[0]
+    first_row = first_page[first_page.index(schedule.columns[-1]) + 1:][:len(schedule.columns)]
+    assert first_row[0] == "1"
+    assert first_row[1:] == [f"{value:.2f}" for value in schedule.iloc[0, 1:]]
+
+
+def test_pdf_switches_to_landscape_for_wide_tables(tmp_path, schedule):
+    narrow, wide = tmp_path / "narrow.pdf", tmp_path / "wide.pdf"
+    write_schedule_pdf(narrow, schedule)
+    wide_schedule = schedule.assign(**{f"Extra Column {index}": schedule["Interest"] for index in range(3)})
+    pages_written = write_schedule_pdf(wide, wide_schedule)
+
+    narrow_width, narrow_height = page_size(narrow)
+    wide_width, wide_height = page_size(wide)
+    assert narrow_width < narrow_height
+    assert wide_width > wide_height
+    assert pages_written == len(page_texts(wide))
+    assert page_texts(wide)[1][:len(wide_schedule.columns)] == list(wide_schedule.columns)
+
+
+def test_pdf_of_a_single_row_has_one_page(tmp_path, schedule):
+    path = tmp_path / "schedule.pdf"
+    assert write_schedule_pdf(path, schedule.iloc[:1]) == 1
+    assert len(page_texts(path)) == 1
+
+
+@pytest.mark.parametrize("name", ("schedule.arrow", "schedule.feather", "schedule.parquet"))
+def test_columnar_files_add_a_loan_column(tmp_path, schedule, name):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / name
+    assert write_schedule_arrow(path, schedule, loan_id=7) == 360
+    reopened = read_schedule_arrow(path)
+    assert list(reopened.columns) == ["Loan"] + list(schedule.columns)
+    assert np.all(reopened["Loan"] == 7)
+    pd.testing.assert_frame_equal(reopened.drop(columns="Loan"), schedule)
+
+
+@pytest.mark.parametrize("name", ("portfolio.arrow", "portfolio.parquet"))
+def test_multi_loan_frames_come_back_unchanged(tmp_path, name):
+    pytest.importorskip("pyarrow")
+    frame = to_long_format(amortize_portfolio([100_000.0, 250_000.0, 75_000.0], [4.5, 6.0, 0.0], [1, 30, 5]),
+                           first_loan_index=10)
+    path = tmp_path / name
+    assert write_schedule_arrow(path, frame, loan_id=99) == len(frame)
+    pd.testing.assert_frame_equal(read_schedule_arrow(path), frame)
+
+
+def test_arrow_read_maps_the_file_without_copying(tmp_path, schedule):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "schedule.arrow"
+    write_schedule_arrow(path, schedule)
+    reopened = read_schedule_arrow(path)
+    # The columns wrap the mapped pages, so a change to the file shows through without reopening it
+    balance = reopened["Remaining Balance"].to_numpy()
+    offset = path.read_bytes().index(np.float64(balance[1]).tobytes())
+    with open(path, "r+b") as handle:
+        os.pwrite(handle.fileno(), np.float64(123.45).tobytes(), offset)
+    assert balance[1] == 123.45
+
+
+def test_arrow_columns_are_read_only(tmp_path, schedule):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "schedule.arrow"
+    write_schedule_arrow(path, schedule)
+    reopened = read_schedule_arrow(path)
+    for column in reopened.columns:
+        values = reopened[column].to_numpy()
+        assert not values.flags.writeable
+        with pytest.raises(ValueError):
+            values[0] = 0
+
+
+def test_unsupported_columnar_suffix_raises(tmp_path, schedule):
+    pytest.importorskip("pyarrow")
+    with pytest.raises(ValueError):
+        write_schedule_arrow(tmp_path / "schedule.xlsx", schedule)
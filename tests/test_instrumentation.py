@@ -0,0 +1,55 @@
+"""
+Tests for the opt-in instrumentation: instrumented GUI actions must behave exactly like plain ones.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("PyQt5.QtWidgets")
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Clicks Compute offscreen and prints the monthly payment once the worker has delivered it
+CLICK_COMPUTE = """
+from PyQt5.QtCore import QDeadlineTimer
+from PyQt5.QtWidgets import QApplication, QPushButton
+from main import LoanCalculator
+
+app = QApplication([])
+window = LoanCalculator()
+window.calculation_finished.connect(window.update_output_fields)
+window.rate.setText("5")
+window.years.setText("30")
+window.amount.setText("100000")
+window.findChild(QPushButton, "computeButton").click()
+deadline = QDeadlineTimer(10000)
+while not window.monthly_payment.text() and not deadline.hasExpired():
+    app.processEvents()
+print(window.monthly_payment.text())
+"""
+
+
+def run_gui(script, **environment):
+    """Runs a script against the GUI on Qt's offscreen platform and returns the completed process."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", **environment)
+    env.pop("LOAN_CALCULATOR_PROFILE", None)
+    return subprocess.run([sys.executable, "-c", script], cwd=PROJECT_DIRECTORY, env=env, capture_output=True,
+                          text=True, timeout=60)
+
+
+@pytest.mark.parametrize("instrument", ("0", "1"))
+def test_compute_button_shows_payment(instrument):
+    completed = run_gui(CLICK_COMPUTE, LOAN_CALCULATOR_INSTRUMENT=instrument)
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == "$ 536.82"
+
+
+def test_compute_button_logs_action_records():
+    completed = run_gui(CLICK_COMPUTE, LOAN_CALCULATOR_INSTRUMENT="1")
+    records = [json.loads(line) for line in completed.stderr.splitlines() if line.startswith("{")]
+    actions = {record["action"]: record for record in records}
+    assert actions["calculate_loan"]["status"] == "ok"
+    assert actions["perform_calculation"]["rows"] == 360
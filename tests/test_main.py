@@ -0,0 +1,68 @@
+"""
+Tests for the main window's payment preview and its use of the worker pool, on Qt's offscreen platform.
+"""
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+from PyQt5.QtCore import QDeadlineTimer  # noqa: E402
+
+from main import LoanCalculator  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    """Returns the QApplication shared by the tests in this module."""
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def window(app):
+    """Returns a main window with the chart shown for a 30-year loan."""
+    window = LoanCalculator()
+    window.rate.setText("5")
+    window.years.setText("30")
+    window.amount.setText("100000")
+    window.show_graph()
+    yield window
+    window._cancel_active_worker()
+    app.processEvents()
+    window.close()
+
+
+def wait_for(app, condition, timeout_ms=10000):
+    """Processes Qt events until condition() holds or the timeout expires; returns condition()."""
+    deadline = QDeadlineTimer(timeout_ms)
+    while not condition() and not deadline.hasExpired():
+        app.processEvents()
+    return condition()
+
+
+def test_preview_builds_the_charted_schedule_off_the_gui_thread(app, window):
+    window.years.setText("10")
+    window.schedule_preview()
+    window.update_preview()
+    assert window.amortization_data is None
+    assert window.calculation_worker is not None
+    assert wait_for(app, lambda: window.amortization_data is not None)
+    assert len(window.amortization_data["amortization_schedule"]) == 120
+    assert window.monthly_payment.text() == "$ 1,060.66"
+
+
+def test_preview_without_chart_builds_no_schedule(window):
+    window.chart.hide()
+    window.years.setText("10")
+    window.schedule_preview()
+    window.update_preview()
+    assert window.calculation_worker is None
+    assert window.amortization_data is None
+    assert window.monthly_payment.text() == "$ 1,060.66"
+
+
+
+def test_clear_empties_the_chart(window):
+    window.clear_fields()
+    assert window.amortization_data is None
+    assert all(len(line.get_xdata()) == 0 for line in window.chart.lines.values())
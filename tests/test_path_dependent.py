@@ -0,0 +1,117 @@
+"""
+Equivalence tests for the path-dependent amortization engines.
+Random ARM portfolios with payment caps, negative amortization and per-period rounding must give
+identical schedules from the NumPy engine and the kernel, run uncompiled and, when Numba is
+installed, compiled. Uncapped and unrounded, both must reproduce amortize_adjustable().
+"""
+import numpy as np
+import pytest
+
+import path_dependent
+from adjustable_rate import amortize_adjustable, indexed_rate_schedule
+from amortization import InvalidInputError
+from path_dependent import ENGINE_NUMBA, ENGINE_NUMPY, amortize_path_dependent
+
+SCHEDULE_ARRAYS = ("payment", "interest", "principal", "remaining_balance")
+
+# Largest difference allowed against the closed-form adjustable-rate schedule, which sums differently
+ADJUSTABLE_TOLERANCE = 1e-6
+
+# Loans in the random portfolio, and those also run through the slow uncompiled kernel
+PORTFOLIO_SIZE = 300
+PYTHON_SAMPLE = 20
+
+# Option sets checked, from plain re-amortization to capped payments with negative amortization
+CONFIGURATIONS = (
+    {},
+    {"payment_cap": 0.075, "negative_amortization_limit": 1.10},
+    {"payment_cap": 0.0, "negative_amortization_limit": 1.25},
+    {"payment_cap": 0.075, "round_to_cents": False},
+)
+
+
+def random_portfolio(size, seed=0):
+    """Returns (loan_amounts, interest_rates, numbers_of_months) for a reproducible batch of capped 5/1 ARMs."""
+    generator = np.random.default_rng(seed)
+    loan_amounts = generator.uniform(50_000, 1_000_000, size).round(2)
+    interest_rates = np.stack([
+        indexed_rate_schedule(initial_rate, generator.uniform(1, 9, 360), 2.5, 30, initial_cap=2, periodic_cap=1,
+                              lifetime_cap=5)
+        for initial_rate in generator.uniform(2, 7, size)])
+    numbers_of_months = generator.choice((180, 240, 360), size)
+    return loan_amounts, interest_rates, numbers_of_months
+
+
+@pytest.fixture(scope="module")
+def portfolio():
+    return random_portfolio(PORTFOLIO_SIZE)
+
+
+def run_python_kernel(loan_amounts, interest_rates, numbers_of_months, payment_cap=None,
+                      negative_amortization_limit=None, round_to_cents=True):
+    """Runs the kernel as plain Python and returns its schedule arrays in the engines' result layout."""
+    size = len(loan_amounts)
+    arrays = {name: np.zeros(interest_rates.shape) for name in SCHEDULE_ARRAYS}
+    payment_caps = np.full(size, np.inf if payment_cap is None else payment_cap)
+    balance_limits = loan_amounts * (np.inf if negative_amortization_limit is None else negative_amortization_limit)
+    path_dependent._amortize_loans(loan_amounts, path_dependent._monthly_rates(interest_rates), numbers_of_months,
+                                   payment_caps, balance_limits, round_to_cents,
+                                   *(arrays[name] for name in SCHEDULE_ARRAYS))
+    return arrays
+
+
+def assert_identical(expected, actual, mask):
+    """Asserts two results are identical over the months that belong to a loan."""
+    for name in SCHEDULE_ARRAYS:
+        assert np.array_equal(expected[name][mask], actual[name][mask]), name
+
+
+@pytest.mark.parametrize("options", CONFIGURATIONS)
+def test_numpy_engine_matches_uncompiled_kernel(portfolio, options):
+    loan_amounts, interest_rates, numbers_of_months = (values[:PYTHON_SAMPLE] for values in portfolio)
+    expected = amortize_path_dependent(loan_amounts, interest_rates, numbers_of_months, engine=ENGINE_NUMPY,
+                                       **options)
+    actual = run_python_kernel(loan_amounts, interest_rates, numbers_of_months, **options)
+    assert_identical(expected, actual, expected["mask"])
+
+
+@pytest.mark.parametrize("options", CONFIGURATIONS)
+def test_numpy_engine_matches_numba_kernel(portfolio, options):
+    pytest.importorskip("numba")
+    expected = amortize_path_dependent(*portfolio, engine=ENGINE_NUMPY, **options)
+    actual = amortize_path_dependent(*portfolio, engine=ENGINE_NUMBA, **options)
+    assert actual["engine"] == ENGINE_NUMBA
+    assert_identical(expected, actual, expected["mask"])
+
+
+def test_uncapped_unrounded_schedule_matches_amortize_adjustable(portfolio):
+    loan_amounts, interest_rates, _ = portfolio
+    result = amortize_path_dependent(loan_amounts, interest_rates, round_to_cents=False, engine=ENGINE_NUMPY)
+    for loan in range(50):
+        payments, remaining_balance, interest, principal = amortize_adjustable(loan_amounts[loan], interest_rates[loan])
+        expected = {"payment": payments, "interest": interest, "principal": principal,
+                    "remaining_balance": remaining_balance}
+        actual = {name: result[name][loan] for name in SCHEDULE_ARRAYS}
+        actual["payment"] = np.append(actual["payment"][:-1], payments[-1])  # Final payoff differs by design
+        for name in SCHEDULE_ARRAYS:
+            assert np.max(np.abs(expected[name] - actual[name])) <= ADJUSTABLE_TOLERANCE, name
+
+
+def test_last_payment_clears_the_balance(portfolio):
+    result = amortize_path_dependent(*portfolio, payment_cap=0.075, negative_amortization_limit=1.10,
+                                     engine=ENGINE_NUMPY)
+    principal_paid = np.where(result["mask"], result["principal"], 0.0).sum(axis=1)
+    assert np.allclose(principal_paid, portfolio[0], atol=0.01)
+
+
+@pytest.mark.parametrize("arguments", (
+    {"loan_amounts": -1.0},
+    {"numbers_of_months": 361},
+    {"payment_cap": -0.1},
+    {"negative_amortization_limit": 0.9},
+    {"engine": "fortran"},
+))
+def test_invalid_arguments_are_rejected(arguments):
+    options = {"loan_amounts": 100_000.0, "interest_rates": np.full(360, 5.0), **arguments}
+    with pytest.raises(InvalidInputError):
+        amortize_path_dependent(**options)
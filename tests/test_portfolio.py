@@ -0,0 +1,48 @@
+"""
+Tests for batch amortization: payments and schedules must match the single-loan calculation.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+
+from amortization import calculate_amortization_columns, calculate_monthly_payment
+from portfolio import amortize_portfolio, calculate_monthly_payments, round_half_up_cents
+
+
+def random_loans(size, seed=0):
+    """Returns reproducible (loan_amounts, annual_interest_rates, numbers_of_years) over the GUI's input range."""
+    generator = np.random.default_rng(seed)
+    return (generator.uniform(1_000, 2_000_000, size).round(2), generator.uniform(0.01, 100, size).round(2),
+            generator.integers(1, 101, size))
+
+
+def test_round_half_up_cents_matches_decimal_on_half_cents():
+    generator = np.random.default_rng(0)
+    amounts = (generator.integers(0, 10 ** 8, 20_000) * 10 + 5) / 1000  # x.xx5, just above or below in binary
+    expected = [float(Decimal(amount).quantize(Decimal("0.01"), ROUND_HALF_UP)) for amount in amounts.tolist()]
+    assert round_half_up_cents(amounts).tolist() == expected
+
+
+def test_payments_match_single_loan_calculation():
+    loan_amounts, annual_interest_rates, numbers_of_years = random_loans(5_000)
+    expected = [float(calculate_monthly_payment(amount, rate / 1200, int(years) * 12))
+                for amount, rate, years in zip(loan_amounts.tolist(), annual_interest_rates.tolist(),
+                                               numbers_of_years.tolist())]
+    assert calculate_monthly_payments(loan_amounts, annual_interest_rates, numbers_of_years).tolist() == expected
+
+
+def test_interest_free_payments_are_not_rounded():
+    assert calculate_monthly_payments(1_000.0, 0.0, 1)[0] == 1_000.0 / 12
+
+
+def test_schedules_match_single_loan_schedules():
+    loan_amounts, annual_interest_rates, numbers_of_years = random_loans(200, seed=1)
+    result = amortize_portfolio(loan_amounts, annual_interest_rates, numbers_of_years)
+    for loan in range(len(loan_amounts)):
+        _, columns = calculate_amortization_columns(loan_amounts[loan], annual_interest_rates[loan],
+                                                    int(numbers_of_years[loan]))
+        months = int(numbers_of_years[loan]) * 12
+        for name, column in (("interest", "Interest"), ("principal", "Principal"),
+                             ("remaining_balance", "Remaining Balance")):
+            np.testing.assert_array_equal(result[name][loan, :months], columns[column])
+        assert not result[name][loan, months:].any()
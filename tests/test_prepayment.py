@@ -0,0 +1,138 @@
+"""
+Tests for prepayment modeling: payoff month, interest saved, lump sums and biweekly cadence against a
+month-by-month loop.
+"""
+import numpy as np
+import pytest
+
+from amortization import MONTHS_IN_YEAR, InvalidInputError, calculate_monthly_payment
+from prepayment import (CADENCE_BIWEEKLY, PAYOFF_TOLERANCE, build_extra_payments, calculate_prepayment_amortization,
+                        compare_prepayments)
+
+# Half a cent: balances and interest must match the loop to the cent
+CENT_TOLERANCE = 0.005
+
+
+def reference_prepayment(loan_amount, annual_interest_rate, extra_payments, monthly_payment):
+    """
+    Returns (payoff_month, total_interest) from a month-by-month loop that pays the scheduled payment plus
+    that month's extra principal until the closing balance is paid off.
+    """
+    monthly_interest_rate = annual_interest_rate / (MONTHS_IN_YEAR * 100)
+    balance, total_interest = float(loan_amount), 0.0
+    for month, extra in enumerate(extra_payments, start=1):
+        interest = balance * monthly_interest_rate
+        total_interest += interest
+        balance -= monthly_payment + extra - interest
+        if balance <= PAYOFF_TOLERANCE:
+            break
+    return month, total_interest
+
+
+def scheduled_payment(loan_amount, annual_interest_rate, number_of_years):
+    """Returns the scheduled monthly payment as a float."""
+    return float(calculate_monthly_payment(loan_amount, annual_interest_rate / (MONTHS_IN_YEAR * 100),
+                                           number_of_years * MONTHS_IN_YEAR))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_strategies_match_month_by_month_loop(seed):
+    generator = np.random.default_rng(seed)
+    number_of_years = int(generator.choice((5, 15, 30)))
+    number_of_months = number_of_years * MONTHS_IN_YEAR
+    loan_amount = round(float(generator.uniform(10_000, 1_000_000)), 2)
+    annual_interest_rate = round(float(generator.uniform(0.5, 12)), 3)
+    extra_payments = np.round(generator.uniform(0, 0.02 * loan_amount, (8, 1)) *
+                              (generator.random((8, number_of_months)) < 0.3), 2)
+    comparison = compare_prepayments(loan_amount, annual_interest_rate, number_of_years, extra_payments)
+
+    monthly_payment = scheduled_payment(loan_amount, annual_interest_rate, number_of_years)
+    base_month, base_interest = reference_prepayment(loan_amount, annual_interest_rate,
+                                                     np.zeros(number_of_months), monthly_payment)
+    assert comparison["monthly_payment"] == monthly_payment
+    for strategy, extras in enumerate(extra_payments):
+        payoff_month, total_interest = reference_prepayment(loan_amount, annual_interest_rate, extras,
+                                                            monthly_payment)
+        assert comparison["payoff_month"][strategy] == payoff_month
+        assert comparison["months_saved"][strategy] == base_month - payoff_month
+        assert comparison["total_interest"][strategy] == pytest.approx(total_interest, abs=CENT_TOLERANCE)
+        assert comparison["interest_saved"][strategy] == pytest.approx(base_interest - total_interest,
+                                                                       abs=CENT_TOLERANCE)
+
+
+@pytest.mark.parametrize("annual_interest_rate, number_of_years", ((45.0, 40), (60.0, 50), (90.0, 100)))
+def test_high_growth_terms_match_month_by_month_loop(annual_interest_rate, number_of_years):
+    # Growth of (1 + r)^n this large makes the balances step month by month instead of using the closed form
+    number_of_months = number_of_years * MONTHS_IN_YEAR
+    loan_amount = 750_000.0
+    extra_payments = build_extra_payments(number_of_months, lump_sums={number_of_months - 24: 50_000.0})
+    comparison = compare_prepayments(loan_amount, annual_interest_rate, number_of_years, extra_payments)
+
+    monthly_payment = scheduled_payment(loan_amount, annual_interest_rate, number_of_years)
+    payoff_month, total_interest = reference_prepayment(loan_amount, annual_interest_rate, extra_payments,
+                                                        monthly_payment)
+    assert comparison["payoff_month"][0] == payoff_month
+    assert comparison["total_interest"][0] == pytest.approx(total_interest, abs=CENT_TOLERANCE)
+
+    amortization_data = calculate_prepayment_amortization(loan_amount, annual_interest_rate, number_of_years,
+                                                          lump_sums={number_of_months - 24: 50_000.0})
+    schedule = amortization_data["amortization_schedule"]
+    assert len(schedule) == payoff_month
+    assert np.all(schedule["Remaining Balance"].iloc[:-1] > 0)
+    assert schedule["Principal"].sum() == pytest.approx(loan_amount, abs=CENT_TOLERANCE)
+
+
+def test_lump_sums_shorten_the_schedule():
+    amortization_data = calculate_prepayment_amortization(200_000.0, 6.0, 30, extra_monthly=100.0,
+                                                          lump_sums={12: 10_000.0, 60: 25_000.0},
+                                                          extra_start_month=6)
+    schedule = amortization_data["amortization_schedule"]
+    monthly_payment = scheduled_payment(200_000.0, 6.0, 30)
+    extra_payments = build_extra_payments(360, 100.0, {12: 10_000.0, 60: 25_000.0}, 6)
+    payoff_month, total_interest = reference_prepayment(200_000.0, 6.0, extra_payments, monthly_payment)
+
+    assert amortization_data["payoff_month"] == payoff_month == len(schedule)
+    assert amortization_data["months_saved"] == 360 - payoff_month
+    assert amortization_data["total_interest"] == pytest.approx(total_interest, abs=CENT_TOLERANCE)
+    assert schedule["Current Payment"].iloc[4] == monthly_payment
+    assert schedule["Current Payment"].iloc[11] == pytest.approx(monthly_payment + 10_100.0)
+    assert schedule["Current Payment"].iloc[59] == pytest.approx(monthly_payment + 25_100.0)
+    assert schedule["Remaining Balance"].iloc[-1] == 0
+    assert schedule["Principal"].sum() == pytest.approx(200_000.0, abs=CENT_TOLERANCE)
+
+
+def test_biweekly_cadence_adds_a_twelfth_of_a_payment_each_month():
+    amortization_data = calculate_prepayment_amortization(300_000.0, 5.5, 30, cadence=CADENCE_BIWEEKLY)
+    monthly_payment = scheduled_payment(300_000.0, 5.5, 30)
+    extra = round(monthly_payment / MONTHS_IN_YEAR, 2)
+    payoff_month, total_interest = reference_prepayment(300_000.0, 5.5, np.full(360, extra), monthly_payment)
+    _, base_interest = reference_prepayment(300_000.0, 5.5, np.zeros(360), monthly_payment)
+
+    assert amortization_data["payoff_month"] == payoff_month < 360
+    assert amortization_data["interest_saved"] == pytest.approx(base_interest - total_interest, abs=CENT_TOLERANCE)
+    assert np.all(amortization_data["amortization_schedule"]["Current Payment"] == monthly_payment + extra)
+
+
+def test_without_prepayments_nothing_is_saved():
+    amortization_data = calculate_prepayment_amortization(150_000.0, 4.0, 15)
+    assert amortization_data["payoff_month"] == 180
+    assert amortization_data["months_saved"] == 0
+    assert amortization_data["interest_saved"] == 0
+
+
+@pytest.mark.parametrize("arguments", (
+    {"extra_monthly": -1.0},
+    {"lump_sums": {0: 1_000.0}},
+    {"lump_sums": {361: 1_000.0}},
+    {"lump_sums": {12: -1_000.0}},
+    {"extra_start_month": 361},
+    {"cadence": "weekly"},
+))
+def test_invalid_prepayments_raise(arguments):
+    with pytest.raises(InvalidInputError):
+        calculate_prepayment_amortization(100_000.0, 5.0, 30, **arguments)
+
+
+def test_extra_payments_must_cover_the_term():
+    with pytest.raises(InvalidInputError):
+        compare_prepayments(100_000.0, 5.0, 30, np.zeros((2, 120)))
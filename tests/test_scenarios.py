@@ -0,0 +1,36 @@
+"""
+Tests for the scenario workspace: labels, payoff months and differences against the baseline.
+"""
+import numpy as np
+
+from amortization import create_amortization_columns
+from scenarios import ScenarioWorkspace, payoff_month, scenario_label
+
+
+def test_scenario_label_accepts_a_symbol_and_a_detail():
+    assert scenario_label(250_000, 5.25, 30) == "USD 250,000.00 at 5.25% over 30 years"
+    assert scenario_label(250_000, 5.25, 30, "$", "Exact Cents (Half-Up)") == \
+        "$ 250,000.00 at 5.25% over 30 years (Exact Cents (Half-Up))"
+
+
+def test_payoff_month_is_the_first_month_the_balance_reaches_zero():
+    columns = create_amortization_columns(100_000.0, np.full(24, 20_000.0), np.full(24, 6.0))
+    assert payoff_month(100_000.0, columns["Principal"]) == 6
+    assert np.all(columns["Principal"][6:] == 0)
+
+
+def test_payoff_month_of_a_fully_amortizing_loan_is_its_term():
+    workspace = ScenarioWorkspace()
+    scenario = workspace.add(250_000, 5.25, 30)
+    assert scenario["payoff_month"] == 360
+    assert scenario["name"] == "USD 250,000.00 at 5.25% over 30 years"
+
+
+def test_differences_are_taken_against_the_baseline():
+    workspace = ScenarioWorkspace()
+    baseline = workspace.add(250_000, 5.25, 30)
+    shorter = workspace.add(250_000, 5.25, 15)
+    differences = workspace.differences(shorter)
+    assert differences["payoff_month"] == -180
+    assert differences["total_interest"] == shorter["total_interest"] - baseline["total_interest"]
+    assert workspace.differences(baseline) == {field: 0 for field in differences}
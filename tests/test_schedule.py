@@ -0,0 +1,46 @@
+"""
+Tests for the compact Schedule: both storage precisions reproduce the engines' columns exactly.
+"""
+import numpy as np
+import pytest
+
+from adjustable_rate import calculate_adjustable_amortization, step_rate_schedule
+from amortization import calculate_amortization_columns
+from exact_money import calculate_amortization_columns_cents
+from schedule import PRECISION_CENTS, SCHEDULE_COLUMNS, Schedule
+
+
+@pytest.mark.parametrize("annual_interest_rate, number_of_years", ((5.25, 30), (18.0, 1), (0.0, 15)))
+def test_float_schedule_round_trips_bit_for_bit(annual_interest_rate, number_of_years):
+    _, columns = calculate_amortization_columns(250_000.55, annual_interest_rate, number_of_years)
+    schedule = Schedule.from_columns(columns)
+    for column in SCHEDULE_COLUMNS:
+        assert np.array_equal(schedule[column], columns[column])
+    # Fractions of a cent survive, which storing the float engine as cents would lose
+    assert not np.array_equal(schedule["Remaining Balance"], np.round(schedule["Remaining Balance"], 2))
+
+
+def test_float_columns_are_read_only_and_do_not_alias_the_input():
+    _, columns = calculate_amortization_columns(100_000.0, 6.0, 10)
+    schedule = Schedule.from_columns(columns)
+    with pytest.raises(ValueError):
+        schedule["Interest"][0] = 0.0
+    columns["Interest"][0] = -1.0
+    assert schedule["Interest"][0] != -1.0
+
+
+def test_cents_schedule_is_lossless_and_smaller():
+    _, _, columns = calculate_amortization_columns_cents(250_000.55, 5.25, 30)
+    exact = Schedule.from_columns(columns)
+    cents = Schedule.from_columns(columns, PRECISION_CENTS)
+    for column in SCHEDULE_COLUMNS:
+        assert np.array_equal(cents[column], columns[column])
+    assert cents.nbytes < exact.nbytes
+
+
+def test_varying_rates_and_payments_are_run_length_encoded():
+    data = calculate_adjustable_amortization(300_000.0, step_rate_schedule(4.0, {61: 6.5, 121: 5.0}, 30))
+    schedule = Schedule.from_columns(data["amortization_schedule"])
+    for column in SCHEDULE_COLUMNS:
+        assert np.array_equal(schedule[column], data["amortization_schedule"][column].to_numpy())
+    assert schedule.nbytes < 3.5 * 8 * len(schedule)
@@ -0,0 +1,158 @@
+"""
+Tests for the HTTP service: request validation, error isolation in payment batches and request parsing.
+"""
+import asyncio
+import json
+import threading
+from http import HTTPStatus
+
+import pytest
+
+from amortization import CalculationError
+import service as service_module
+from service import MAX_NUMBER_OF_YEARS, CalculationService, HttpError, PaymentBatcher, read_request
+
+
+def make_request(method, path, params=None):
+    """Returns a parsed request dictionary as read_request() produces it."""
+    return {"method": method, "path": path, "query": {}, "headers": {},
+            "body": json.dumps(params).encode() if params is not None else b"", "keep_alive": True}
+
+
+async def dispatch_all(*requests):
+    """Dispatches requests concurrently, so payment quotes share a batch; returns (status, payload) pairs."""
+    service = CalculationService(threads=1, batch_window=0.01)
+    try:
+        responses = await asyncio.gather(*(service.dispatch(request) for request in requests))
+    finally:
+        service.executor.shutdown(wait=True)
+    return [(status, json.loads(body)) for status, _, body in responses]
+
+
+@pytest.mark.parametrize("params", (
+    {"loan_amount": "NaN", "annual_interest_rate": 5.25, "number_of_years": 30},
+    {"loan_amount": 250000, "annual_interest_rate": "inf", "number_of_years": 30},
+    {"loan_amount": [1], "annual_interest_rate": 5.25, "number_of_years": 30},
+    {"loan_amount": 250000, "annual_interest_rate": 5.25, "number_of_years": 30.5},
+    {"loan_amount": 250000, "annual_interest_rate": 5.25, "number_of_years": MAX_NUMBER_OF_YEARS + 1},
+    {"loan_amount": 250000, "annual_interest_rate": 5.25, "number_of_years": 10 ** 400},
+))
+@pytest.mark.parametrize("path", ("/payment", "/schedule"))
+def test_invalid_requests_are_rejected_before_batching(path, params):
+    ((status, payload),) = asyncio.run(dispatch_all(make_request("POST", path, params)))
+    assert status == HTTPStatus.BAD_REQUEST
+    assert payload["error"]
+
+
+def test_one_bad_request_does_not_fail_the_rest_of_its_batch():
+    valid = {"loan_amount": 250000, "annual_interest_rate": 5.25, "number_of_years": 30}
+    invalid = dict(valid, loan_amount="NaN")
+    responses = asyncio.run(dispatch_all(*(make_request("POST", "/payment", params)
+                                           for params in (valid, invalid, dict(valid, number_of_years=15)))))
+    assert [status for status, _ in responses] == [HTTPStatus.OK, HTTPStatus.BAD_REQUEST, HTTPStatus.OK]
+    assert responses[0][1]["monthly_payment"] == 1380.51
+
+
+def test_failing_batch_is_retried_quote_by_quote():
+    async def quote():
+        batcher = PaymentBatcher(window=0.01)
+        futures = [batcher.submit(250000.0, 5.25, 30), batcher.submit(250000.0, 5.25, "thirty"),
+                   batcher.submit(100000.0, 0.0, 10)]
+        return await asyncio.gather(*futures, return_exceptions=True), batcher.batches
+
+    (first, failed, interest_free), batches = asyncio.run(quote())
+    assert batches == 1
+    assert first == 1380.51
+    assert isinstance(failed, CalculationError)
+    assert interest_free == pytest.approx(100000.0 / 120)
+
+
+def test_unexpected_errors_return_500():
+    async def broken(request):
+        raise RuntimeError("boom")
+
+    async def run():
+        service = CalculationService(threads=1)
+        service.routes[("GET", "/broken")] = broken
+        try:
+            return await service.dispatch(make_request("GET", "/broken"))
+        finally:
+            service.executor.shutdown(wait=True)
+
+    status, _, body = asyncio.run(run())
+    assert status == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert "boom" not in body.decode()
+
+
+@pytest.mark.parametrize("length", ("-1", "abc"))
+def test_invalid_content_length_is_rejected(length):
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(f"POST /payment HTTP/1.1\r\nContent-Length: {length}\r\n\r\n{{}}".encode())
+        reader.feed_eof()
+        return await read_request(reader)
+
+    with pytest.raises(HttpError) as error:
+        asyncio.run(read())
+    assert error.value.status == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize("encoding, status", (("chunked", HTTPStatus.LENGTH_REQUIRED),
+                                              ("gzip, chunked", HTTPStatus.NOT_IMPLEMENTED)))
+def test_transfer_encoding_is_rejected(encoding, status):
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(f"POST /batch HTTP/1.1\r\nTransfer-Encoding: {encoding}\r\n\r\n2\r\n{{}}\r\n0\r\n\r\n"
+                         .encode())
+        reader.feed_eof()
+        return await read_request(reader)
+
+    with pytest.raises(HttpError) as error:
+        asyncio.run(read())
+    assert error.value.status == status
+
+
+async def exchange(raw_request):
+    """Sends raw bytes to a live service on a free port and returns everything it answers before closing."""
+    service = CalculationService(threads=1)
+    server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+    try:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(raw_request)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout=10)
+        writer.close()
+        return response
+    finally:
+        server.close()
+        await server.wait_closed()
+        service.executor.shutdown(wait=True)
+
+
+def test_chunked_batch_gets_a_status_line_and_the_connection_closes():
+    body = b'{"loan_amount": 1000, "annual_interest_rate": 5, "number_of_years": 1}\n'
+    raw = (b"POST /batch HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: chunked\r\n\r\n"
+           + b"%x\r\n%s\r\n0\r\n\r\n" % (len(body), body))
+    response = asyncio.run(exchange(raw))
+    head, _, payload = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 411 Length Required")
+    assert b"Connection: close" in head
+    assert "Content-Length" in json.loads(payload)["error"]
+
+
+def test_batch_body_is_parsed_on_the_executor(monkeypatch):
+    threads = []
+
+    def recording_batch_rows(body):
+        threads.append(threading.current_thread().name)
+        return batch_rows(body)
+
+    batch_rows = service_module._batch_rows
+    monkeypatch.setattr(service_module, "_batch_rows", recording_batch_rows)
+    body = b'{"loan_amount": 1000, "annual_interest_rate": 5, "number_of_years": 1}\n{"loan_amount": -1}\n'
+    raw = b"POST /batch HTTP/1.1\r\nContent-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(body), body)
+    response = asyncio.run(exchange(raw))
+    assert response.startswith(b"HTTP/1.1 200 OK")
+    assert threads and threads[0].startswith("calculation")
+    assert b'"line": 2' in response
+    assert b"1000" in response
@@ -0,0 +1,110 @@
+"""
+Tests for scenario sweeps: the closed-form, in-process and process-pool paths against amortize_portfolio.
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+import sweep
+from amortization import MONTHS_IN_YEAR
+from portfolio import amortize_portfolio
+
+RATES = (0.0, 2.5, 5.25, 7.125, 18.0)
+TERMS = (1, 5, 15, 30)
+AMOUNTS = (1_000.0, 99_999.99, 250_000.0)
+
+
+def expected_totals(full_schedules):
+    """Returns (fields x rates x terms x amounts) totals computed loan by loan with amortize_portfolio."""
+    expected = np.empty((len(sweep.SWEEP_FIELDS), len(RATES), len(TERMS), len(AMOUNTS)))
+    for index in np.ndindex(len(RATES), len(TERMS), len(AMOUNTS)):
+        rate, years, amount = RATES[index[0]], TERMS[index[1]], AMOUNTS[index[2]]
+        result = amortize_portfolio(amount, rate, years)
+        monthly_payment = result["monthly_payment"][0]
+        if full_schedules:
+            total_interest = result["interest"].sum()
+            total_payment = total_interest + result["principal"].sum()
+        else:
+            total_payment = monthly_payment * years * MONTHS_IN_YEAR
+            total_interest = total_payment - amount
+        expected[(slice(None),) + index] = monthly_payment, total_payment, total_interest
+    return expected
+
+
+def assert_matches(sweep_result, expected):
+    """Checks the axes and every field of a sweep result against the expected totals."""
+    assert np.array_equal(sweep_result["annual_interest_rate"], RATES)
+    assert np.array_equal(sweep_result["number_of_years"], TERMS)
+    assert np.array_equal(sweep_result["loan_amount"], AMOUNTS)
+    for field, values in zip(sweep.SWEEP_FIELDS, expected):
+        assert sweep_result[field].shape == (len(RATES), len(TERMS), len(AMOUNTS))
+        np.testing.assert_allclose(sweep_result[field], values, rtol=1e-12, atol=1e-9, err_msg=field)
+
+
+@pytest.fixture
+def created_buffers(monkeypatch):
+    """Records the names of the shared-memory buffers a sweep creates."""
+    names = []
+
+    class RecordingSharedMemory(shared_memory.SharedMemory):
+        def __init__(self, name=None, create=False, size=0):
+            super().__init__(name=name, create=create, size=size)
+            if create:
+                names.append(self.name)
+
+    monkeypatch.setattr(sweep.shared_memory, "SharedMemory", RecordingSharedMemory)
+    return names
+
+
+def assert_unlinked(names):
+    """Checks that every recorded shared-memory buffer has been released."""
+    assert names
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def test_closed_form_sweep_matches_portfolio_payments():
+    assert_matches(sweep.sweep(RATES, TERMS, AMOUNTS), expected_totals(full_schedules=False))
+
+
+@pytest.mark.parametrize("shard_size", (1, 7, 60, sweep.SHARD_SIZE))
+def test_in_process_schedule_sweep_matches_portfolio_across_shards(monkeypatch, shard_size):
+    monkeypatch.setattr(sweep, "SHARD_SIZE", shard_size)
+    result = sweep.sweep(RATES, TERMS, AMOUNTS, full_schedules=True, workers=1)
+    assert_matches(result, expected_totals(full_schedules=True))
+
+
+@pytest.mark.parametrize("shard_size", (7, 16))
+def test_process_pool_sweep_matches_portfolio_and_releases_shared_memory(monkeypatch, created_buffers, shard_size):
+    # 60 scenarios in shards that do not divide them evenly, on two processes
+    monkeypatch.setattr(sweep, "PARALLEL_MIN_SCENARIOS", 1)
+    monkeypatch.setattr(sweep, "SHARD_SIZE", shard_size)
+    result = sweep.sweep(RATES, TERMS, AMOUNTS, full_schedules=True, workers=2)
+    assert_matches(result, expected_totals(full_schedules=True))
+    assert_unlinked(created_buffers)
+
+
+def test_failing_shard_still_releases_shared_memory(monkeypatch, created_buffers):
+    monkeypatch.setattr(sweep, "PARALLEL_MIN_SCENARIOS", 1)
+    monkeypatch.setattr(sweep, "SHARD_SIZE", 4)
+    with pytest.raises(ValueError):
+        sweep.sweep(RATES, (30, 0), AMOUNTS, full_schedules=True, workers=2)
+    assert_unlinked(created_buffers)
+
+
+def test_schedule_totals_include_the_final_payment_adjustment():
+    closed_form = sweep.sweep(5.25, 30, 250_000.0)
+    scheduled = sweep.sweep(5.25, 30, 250_000.0, full_schedules=True, workers=1)
+    assert closed_form["monthly_payment"][0, 0, 0] == scheduled["monthly_payment"][0, 0, 0]
+    assert scheduled["total_payment"][0, 0, 0] == pytest.approx(250_000.0 + scheduled["total_interest"][0, 0, 0])
+    assert scheduled["total_payment"][0, 0, 0] != closed_form["total_payment"][0, 0, 0]
+
+
+def test_to_frame_has_one_row_per_scenario():
+    frame = sweep.to_frame(sweep.sweep(RATES, TERMS, AMOUNTS))
+    assert len(frame) == len(RATES) * len(TERMS) * len(AMOUNTS)
+    first = frame.iloc[0]
+    assert (first["Interest Rate (%)"], first["Loan Term (Years)"], first["Loan Amount"]) == (0.0, 1, 1_000.0)
+    assert list(frame.columns[3:]) == ["Monthly Payment", "Total Payment", "Total Interest"]
@@ -0,0 +1,89 @@
+"""
+Background calculation workers for the loan calculator GUI.
+Runs tasks on a QThreadPool with cooperative cancellation and progress reported through Qt signals.
+"""
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class CalculationCancelled(Exception):
+    """Raised inside a task when its cancellation token has been triggered."""
+    pass
+
+
+class CancellationToken:
+    """Thread-safe flag a task polls to stop early once its result is no longer wanted."""
+
+    def __init__(self):
+        """Initializes a token that has not been cancelled."""
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Requests cancellation of the task holding this token."""
+        self._event.set()
+
+    @property
+    def is_cancelled(self):
+        """Returns True once cancellation has been requested."""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        """Raises CalculationCancelled if cancellation has been requested."""
+        if self._event.is_set():
+            raise CalculationCancelled()
+
+
+class WorkerSignals(QObject):
+    """
+    Signals emitted by a CalculationWorker.
+    Each carries the worker itself so receivers can ignore results from superseded workers.
+    """
+    progress = pyqtSignal(object, int)
+    finished = pyqtSignal(object, object)
+    failed = pyqtSignal(object, str)
+    cancelled = pyqtSignal(object)
+
+
+class CalculationWorker(QRunnable):
+    """
+    Runs task(token, report_progress, *args, **kwargs) on a thread pool.
+    The task reports percentages through report_progress and should call
+    token.raise_if_cancelled() between steps; its return value is emitted by finished.
+    """
+
+    def __init__(self, task, *args, **kwargs):
+        """Initializes the worker for the given task and arguments."""
+        super().__init__()
+        self.setAutoDelete(False)  # Lifetime is managed from Python so cancel() stays safe after run()
+        self.task = task
+        self.args = args
+        self.kwargs = kwargs
+        self.token = CancellationToken()
+        self.signals = WorkerSignals()
+
+    def cancel(self):
+        """Cancels the task cooperatively; no further progress or result is emitted."""
+        self.token.cancel()
+
+    def _report_progress(self, percent):
+        """Emits progress unless the worker has been cancelled."""
+        self.token.raise_if_cancelled()
+        self.signals.progress.emit(self, int(percent))
+
+    def run(self):
+        """Executes the task and emits exactly one of finished, failed or cancelled."""
+        try:
+            result = self.task(self.token, self._report_progress, *self.args, **self.kwargs)
+            self.token.raise_if_cancelled()
+        except CalculationCancelled:
+            self.signals.cancelled.emit(self)
+        except Exception as e:
+            self.signals.failed.emit(self, str(e))
+        else:
+            self.signals.finished.emit(self, result)
+
+    def start(self, thread_pool=None):
+        """Queues the worker on the given thread pool, or the global one."""
+        (thread_pool or QThreadPool.globalInstance()).start(self)
+        return self